@@ -1,59 +1,52 @@
 # agent/backend_agent.py
 
 import json
+from itertools import islice
 from pathlib import Path
+from typing import Iterator, Optional
 
+from . import llm_client, schema_inference, snapshot
+from .capture_store import PAGES, CaptureStore, endpoint_summary
 from .config import settings
-
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # ok when USE_LLM = false
+from .snapshot import NETWORK_LOG_KEYS, iter_items, snapshot_path
 
 
 ROOT = Path(__file__).resolve().parents[1]
-AGENT_OUTPUT = Path(__file__).with_name("output")
 BACKEND_DIR = ROOT / "backend"
 
 
-def load_network_logs(page_name: str) -> list[dict]:
+def iter_network_logs(page_name: str, directory: Optional[Path] = None) -> Iterator[dict]:
+    """
+    Stream networkLogs from the snapshot of playwright_scraper.ts (see snapshot_path),
+    one entry at a time, without loading the html and computedStyles sections.
+    """
+    return iter_items(snapshot_path(page_name, directory), *NETWORK_LOG_KEYS)
+
+
+def load_network_logs(page_name: str, limit: Optional[int] = None) -> list[dict]:
     """
     Load networkLogs from agent/output/<page>.json produced by playwright_scraper.ts.
+    With `limit`, stop reading the file after that many entries.
     """
-    p = AGENT_OUTPUT / f"{page_name}.json"
-    if not p.exists():
-        raise FileNotFoundError(
-            f"{p} not found. Run the scraper first:\n"
-            "  npx ts-node agent/playwright_scraper.ts"
-        )
-    with p.open(encoding="utf-8") as f:
-        data = json.load(f)
-
-    # depending on how you named it in TS
-    logs = (
-        data.get("networkLogs")
-        or data.get("network_logs")
-        or data.get("network", [])
-    )
-    if not isinstance(logs, list):
-        logs = []
-    return logs
+    return list(islice(iter_network_logs(page_name), limit))
 
 
-# ---------------- LLM path (for reviewers with a key) ---------------- #
+def index_network_logs(pages=PAGES, directory: Optional[Path] = None) -> CaptureStore:
+    """An in-memory CaptureStore of the given pages' network logs."""
+    store = CaptureStore()
+    for page in pages:
+        store.add_page(page, iter_network_logs(page, directory))
+    return store
 
 
-def generate_backend_with_llm() -> None:
-    if not settings.openai_api_key or OpenAI is None:
-        raise RuntimeError(
-            "USE_LLM=true but OPENAI_API_KEY is missing or openai lib not installed."
-        )
+# ---------------- LLM path (for reviewers with a key) ---------------- #
 
-    client = OpenAI(api_key=settings.openai_api_key)
 
-    home_logs = load_network_logs("home")
-    projects_logs = load_network_logs("projects")
-    tasks_logs = load_network_logs("tasks")
+def backend_request(pages=PAGES, directory: Optional[Path] = None) -> dict:
+    """The arguments of the `responses.create` call that asks for api.yml and schema.sql."""
+    # the distinct API endpoints of each page, not the raw logs: most
+    # captured requests are static assets and telemetry
+    store = index_network_logs(pages, directory)
 
     prompt = f"""
 You are an expert backend engineer.
@@ -63,7 +56,7 @@ You are given network logs captured from Asana's web app for three main pages:
 - Projects
 - Tasks
 
-Each log contains: request URL, HTTP method, status code, headers, and parsed JSON body where possible.
+The requests are grouped into endpoints: method, host, path template ({{id}} marks ids), call count, query parameter names, and the shape of the JSON response (keys and value types). Static assets and telemetry are already filtered out.
 
 Your job:
 
@@ -96,13 +89,10 @@ Your job:
 <schema.sql here>
     """.strip()
 
-    combined_logs = {
-        "home": home_logs[:100],
-        "projects": projects_logs[:100],
-        "tasks": tasks_logs[:100],
-    }
+    combined_logs = {page: endpoint_summary(store, page) for page in pages}
+    store.close()
 
-    resp = client.responses.create(
+    return dict(
         model="gpt-4o-mini",
         input=[
             {
@@ -111,24 +101,37 @@ Your job:
             },
             {
                 "role": "user",
-                "content": f"{prompt}\n\nSample network logs (truncated JSON):\n{json.dumps(combined_logs)[:14000]}",
+                "content": f"{prompt}\n\nCaptured endpoints (truncated JSON):\n{json.dumps(combined_logs)[:14000]}",
             },
         ],
     )
 
-    text = resp.output[0].content[0].text
+
+def write_llm_spec(text: str, out_dir: Optional[Path] = None) -> list[Path]:
+    """Split the LLM answer at its markers into api.yml and schema.sql."""
+    out_dir = out_dir or BACKEND_DIR
     if "---OPENAPI---" not in text or "---SCHEMA_SQL---" not in text:
         raise RuntimeError("Unexpected LLM output format; missing markers.")
 
     _, after_openapi = text.split("---OPENAPI---", 1)
     openapi_part, schema_part = after_openapi.split("---SCHEMA_SQL---", 1)
 
-    BACKEND_DIR.mkdir(exist_ok=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    (out_dir / "api.yml").write_text(openapi_part.strip() + "\n", encoding="utf-8")
+    (out_dir / "schema.sql").write_text(schema_part.strip() + "\n", encoding="utf-8")
+    return [out_dir / "api.yml", out_dir / "schema.sql"]
 
-    (BACKEND_DIR / "api.yml").write_text(openapi_part.strip() + "\n", encoding="utf-8")
-    (BACKEND_DIR / "schema.sql").write_text(schema_part.strip() + "\n", encoding="utf-8")
+
+def generate_backend_with_llm() -> None:
+    client = llm_client.make_client()
+    request = backend_request(PAGES)
+    text = llm_client.create(client, request)
+    write_llm_spec(text)
+    llm_client.accept(client, request, text)
 
     print("[backend_agent] Wrote api.yml and schema.sql from LLM analysis.")
+    llm_client.report(client, "backend_agent")
 
 
 # ---------------- Mock path (no LLM, free mode) ---------------- #
@@ -388,10 +391,31 @@ CREATE INDEX idx_tasks_status ON tasks(status);
     print("[backend_agent] USE_LLM=false → wrote mock api.yml and schema.sql")
 
 
+# ---------------- Inference path (offline, from the captures) ---------------- #
+
+
+def generate_backend_inferred() -> None:
+    """
+    Offline mode that still follows the captures: infer api.yml and schema.sql
+    from the recorded response bodies (see agent.schema_inference).
+    """
+    inference = schema_inference.infer(PAGES, load=iter_network_logs)
+    if not inference.logs:
+        raise FileNotFoundError(
+            f"No captures in {snapshot.OUTPUT_DIR}. Run the scraper first:\n"
+            "  npx ts-node agent/playwright_scraper.ts"
+        )
+    schema_inference.write_backend_spec(inference, BACKEND_DIR)
+    print(f"[backend_agent] INFER_SPEC=true → inferred {len(inference.endpoints)} endpoints "
+          f"from {inference.logs} requests into api.yml and schema.sql")
+
+
 def main() -> None:
     if settings.use_llm:
         print("[backend_agent] USE_LLM=true → using LLM-based analysis")
         generate_backend_with_llm()
+    elif settings.infer_spec:
+        generate_backend_inferred()
     else:
         print("[backend_agent] USE_LLM=false → skipping OpenAI, using mock backend spec")
         generate_backend_mock()
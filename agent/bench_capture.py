@@ -0,0 +1,98 @@
+# agent/bench_capture.py
+"""
+Size and read-time comparison of a JSON snapshot and its .cap forms.
+
+For each snapshot it reports the file sizes (the JSON as the scraper
+writes it, the same JSON gzipped for reference, and .cap with every
+available codec). It also reports the best-of-N time to read everything
+and to read only the network logs, with json.load, the streaming JSON
+reader and the .cap reader.
+
+    python -m agent.bench_capture agent/output/home.json
+    python -m agent.bench_capture --synthetic-mb 256 --repeat 1
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from . import capture, snapshot
+from .bench_snapshot import SOURCE, write_capture as write_synthetic
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def drain(items) -> None:
+    for _ in items:
+        pass
+
+
+def compare(path: Path, tmp: str, repeat: int) -> None:
+    json_size = path.stat().st_size
+    gz = os.path.join(tmp, "snapshot.json.gz")
+    with open(path, "rb") as src, gzip.open(gz, "wb") as dst:
+        while chunk := src.read(1 << 20):
+            dst.write(chunk)
+    print(f"{path}")
+    print(f"  {'format':<14} {'bytes':>14} {'ratio':>7} {'write s':>8} {'read all s':>11} {'read logs s':>12}")
+
+    def load_all():
+        with open(path, encoding="utf-8") as f:
+            json.load(f)
+
+    def load_logs():
+        with open(path, encoding="utf-8") as f:
+            json.load(f)["networkLogs"]
+
+    print(f"  {'json.load':<14} {json_size:>14,} {1:>7.1f} {'':>8} "
+          f"{best_of(repeat, load_all):>11.3f} {best_of(repeat, load_logs):>12.3f}")
+    print(f"  {'json stream':<14} {json_size:>14,} {1:>7.1f} {'':>8} "
+          f"{best_of(repeat, lambda: snapshot.read_sections(path)):>11.3f} "
+          f"{best_of(repeat, lambda: drain(snapshot.iter_items(path, 'networkLogs'))):>12.3f}")
+    gz_size = os.path.getsize(gz)
+    print(f"  {'json.gz':<14} {gz_size:>14,} {json_size / gz_size:>7.1f}")
+    codecs = ["zlib"] + (["zstd"] if capture.zstandard is not None else [])
+    for codec in codecs:
+        out = os.path.join(tmp, f"snapshot-{codec}.cap")
+        started = time.perf_counter()
+        capture.convert(path, out, codec=codec)
+        written = time.perf_counter() - started
+        size = os.path.getsize(out)
+        print(f"  {'cap ' + codec:<14} {size:>14,} {json_size / size:>7.1f} {written:>8.2f} "
+              f"{best_of(repeat, lambda: capture.read_sections(out)):>11.3f} "
+              f"{best_of(repeat, lambda: drain(capture.iter_items(out, 'networkLogs'))):>12.3f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="JSON snapshots (default: agent/output/home.json)")
+    parser.add_argument("--synthetic-mb", type=int, help="also compare a synthetic capture of this size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or [SOURCE]
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic_mb:
+            synthetic = Path(tmp) / "synthetic.json"
+            write_synthetic(str(synthetic), args.synthetic_mb)
+            paths.append(synthetic)
+        for path in paths:
+            compare(path, tmp, args.repeat)
+    if capture.zstandard is None:
+        print("(zstandard is not installed; only zlib captures were measured)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
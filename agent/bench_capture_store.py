@@ -0,0 +1,75 @@
+# agent/bench_capture_store.py
+"""
+Timing of agent.capture_store on a large capture.
+
+The synthetic logs cycle through home.json's network logs with fresh ids
+in every numeric path segment, so they template back to home.json's
+endpoints. Reported: indexing throughput, the endpoint listing, and
+single-request lookups.
+
+    python -m agent.bench_capture_store --entries 100000
+    python -m agent.bench_capture_store --entries 100000 --db /tmp/captures.db
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from itertools import cycle, islice
+
+from .bench_snapshot import SOURCE
+from .capture_store import CaptureStore
+from .snapshot import iter_items
+
+_NUMBER = re.compile(r"(?<=/)\d+(?=/|\?|$)")
+
+
+def synthetic_logs(entries: int, seed: int = 1):
+    rng = random.Random(seed)
+    logs = list(iter_items(SOURCE, "networkLogs"))
+    for log in islice(cycle(logs), entries):
+        yield dict(log, url=_NUMBER.sub(lambda _: str(rng.randrange(10**15, 10**16)), log["url"]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--db", help="SQLite file (default: a temporary file)")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.db
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "captures.db")
+    try:
+        logs = list(synthetic_logs(args.entries))
+        store = CaptureStore(path)
+        started = time.perf_counter()
+        store.add_page("synthetic", logs)
+        elapsed = time.perf_counter() - started
+        print(f"indexed {len(logs):,} entries in {elapsed:.2f}s ({len(logs) / elapsed:,.0f} entries/s)")
+        print(f"  {store.stats()}  {os.path.getsize(path) / 2**20:.1f} MB")
+
+        started = time.perf_counter()
+        endpoints = store.endpoints(page="synthetic")
+        print(f"endpoints(page=...) -> {len(endpoints)} in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        rng = random.Random(2)
+        requests = [(log["method"], log["url"]) for log in rng.sample(logs, min(args.lookups, len(logs)))]
+        started = time.perf_counter()
+        found = sum(1 for method, url in requests if store.lookup(method, url))
+        elapsed = time.perf_counter() - started
+        print(f"lookup x{len(requests):,}: {elapsed / len(requests) * 1e6:.0f} µs each, {found:,} matched")
+        store.close()
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# agent/bench_prompt_packer.py
+"""
+Benchmark of prompt size against coverage: the frontend agent's previous
+html[:15000] + computedStyles[:50] against agent.prompt_packer at several
+budgets, on one snapshot.
+
+Coverage is measured on the prompt text, the same way for every prompt:
+- words: distinct words (3+ letters) of the page's visible text;
+- labels: aria-label and data-testid values of visible elements;
+- colors: distinct text and background colors of visible elements;
+- endpoints: API endpoint paths the page called (noise excluded).
+
+    python -m agent.bench_prompt_packer
+    python -m agent.bench_prompt_packer agent/output/home.json --budgets 500,1000,2000,4000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from .capture_store import CaptureStore, endpoint_summary
+from .prompt_packer import count_tokens, pack_snapshot, parse_html, short_colors, style_groups, tokenizer_name
+from .snapshot import NETWORK_LOG_KEYS, iter_items, read_section
+
+SOURCE = Path(__file__).with_name("output") / "home.json"
+BUDGETS = (500, 1000, 2000, 3000, 4000)
+
+_WORD = re.compile(r"[A-Za-z]{3,}")
+_LABEL = re.compile(r'(?:aria-label|data-testid)="([^"]+)"')
+
+
+def _words(text: str) -> set:
+    return {w.lower() for w in _WORD.findall(text)}
+
+
+def page_facts(path: Path) -> dict:
+    """What a prompt about the page could cover."""
+    root = parse_html(read_section(path, "html", default=""))
+    texts, labels, stack = [], set(), [root]
+    while stack:
+        node = stack.pop()
+        labels.update(_LABEL.findall(node.open))
+        for part in node.parts:
+            if isinstance(part, str):
+                texts.append(part)
+            else:
+                stack.append(part)
+    colors = set()
+    for _, values, _ in style_groups(iter_items(path, "computedStyles")):
+        for key in ("color", "backgroundColor"):
+            color = short_colors(str(values.get(key, "")))
+            if color.startswith("#"):
+                colors.add(color)
+    store = CaptureStore()
+    store.add_page("page", iter_items(path, *NETWORK_LOG_KEYS))
+    endpoints = {e["path"] for e in endpoint_summary(store, "page")}
+    store.close()
+    return {"words": _words(" ".join(texts)), "labels": labels, "colors": colors, "endpoints": endpoints}
+
+
+def coverage(prompt: str, facts: dict) -> dict:
+    words = _words(prompt)
+    colors = short_colors(prompt)
+
+    def share(found: int, of: set) -> float:
+        return found / len(of) if of else 1.0
+
+    return {
+        "words": share(len(facts["words"] & words), facts["words"]),
+        "labels": share(sum(f'"{label}"' in prompt for label in facts["labels"]), facts["labels"]),
+        "colors": share(sum(c in colors for c in facts["colors"]), facts["colors"]),
+        "endpoints": share(sum(p in prompt for p in facts["endpoints"]), facts["endpoints"]),
+    }
+
+
+def baseline_prompt(path: Path) -> str:
+    """The snapshot part of the frontend prompt before the packer."""
+    html = read_section(path, "html", default="")
+    styles = list(iter_items(path, "computedStyles"))[:50]
+    return f"{html[:15000]}\n\n{styles[:50]}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", default=str(SOURCE))
+    parser.add_argument("--budgets", default=",".join(map(str, BUDGETS)))
+    parser.add_argument("--repeat", type=int, default=3, help="packing runs per budget (best time is shown)")
+    args = parser.parse_args()
+    path = Path(args.path)
+
+    facts = page_facts(path)
+    print(f"{path.name}: {len(facts['words'])} words, {len(facts['labels'])} labels, "
+          f"{len(facts['colors'])} colors, {len(facts['endpoints'])} endpoints; tokens by {tokenizer_name()}")
+    print(f"{'prompt':<14} {'tokens':>7} {'chars':>7} {'words':>6} {'labels':>7} {'colors':>7} "
+          f"{'endpoints':>10} {'ms':>6}")
+
+    def row(name: str, prompt: str, ms: float) -> None:
+        c = coverage(prompt, facts)
+        print(f"{name:<14} {count_tokens(prompt):>7,} {len(prompt):>7,} {c['words']:>6.0%} {c['labels']:>7.0%} "
+              f"{c['colors']:>7.0%} {c['endpoints']:>10.0%} {ms:>6.0f}")
+
+    started = time.perf_counter()
+    prompt = baseline_prompt(path)
+    row("html[:15000]", prompt, (time.perf_counter() - started) * 1000)
+    for budget in (int(b) for b in args.budgets.split(",") if b):
+        best = None
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            packed = pack_snapshot(path, budget)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        row(f"packed {budget}", "\n\n".join((packed.html, packed.styles, packed.api)), best)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# agent/bench_snapshot.py
+"""
+Benchmark of reading one section of a large snapshot: `json.load` of the
+whole file (the previous loaders) against the streaming reader in
+agent.snapshot.
+
+The synthetic capture has the scraper's shape and formatting (indent=2):
+home.json's html and computedStyles, then its networkLogs repeated with
+distinct URLs until the file reaches --size-mb. Every measurement runs in
+a fresh process and reports its wall time and peak RSS.
+
+    python -m agent.bench_snapshot --size-mb 1024
+    python -m agent.bench_snapshot --size-mb 256 --keep /tmp/capture.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+from .snapshot import iter_items, read_section
+
+SOURCE = Path(__file__).with_name("output") / "home.json"
+SECTIONS = ("networkLogs", "html", "computedStyles")
+
+
+def write_capture(path: str, size_mb: int, source: Path = SOURCE) -> int:
+    """Write a synthetic snapshot of about `size_mb` MB; returns the number of network logs."""
+    with source.open(encoding="utf-8") as f:
+        base = json.load(f)
+    logs = base["networkLogs"]
+    target = size_mb * 1024 * 1024
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        head = json.dumps({"html": base["html"], "computedStyles": base["computedStyles"]}, indent=2)
+        f.write(head[:-2] + ',\n  "networkLogs": [')
+        written = len(head)
+        for log in cycle(logs):
+            entry = dict(log, url=f"{log['url']}#{count}")
+            text = json.dumps(entry, indent=2).replace("\n", "\n    ")
+            f.write(("," if count else "") + "\n    " + text)
+            written += len(text) + 6
+            count += 1
+            if written >= target:
+                break
+        f.write("\n  ]\n}")
+    return count
+
+
+def _consume(mode: str, section: str, path: str) -> int:
+    """Read `section` and touch every element; returns how many there were."""
+    if mode == "load":
+        with open(path, encoding="utf-8") as f:
+            value = json.load(f)[section]
+        return len(value) if isinstance(value, list) else 1
+    if section == "html":
+        read_section(path, section)
+        return 1
+    count = 0
+    for _ in iter_items(path, section):
+        count += 1
+    return count
+
+
+def measure(mode: str, section: str, path: str) -> dict:
+    started = time.perf_counter()
+    items = _consume(mode, section, path)
+    return {
+        "seconds": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "items": items,
+    }
+
+
+def run(mode: str, section: str, path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "agent.bench_snapshot", "--measure", mode, section, path],
+        capture_output=True, text=True, cwd=Path(__file__).resolve().parents[1],
+    )
+    if out.returncode != 0:
+        # e.g. killed for running out of memory
+        return {"error": (out.stderr.strip().splitlines() or [f"exit status {out.returncode}"])[-1]}
+    return json.loads(out.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--sections", default=",".join(SECTIONS))
+    parser.add_argument("--skip-load", action="store_true", help="only measure the streaming reader")
+    parser.add_argument("--keep", help="write the capture here and keep it (reused if it exists)")
+    parser.add_argument("--measure", nargs=3, metavar=("MODE", "SECTION", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return 0
+
+    tmp = None
+    path = args.keep
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        tmp.close()
+        path = tmp.name
+    try:
+        if not (args.keep and os.path.exists(path)):
+            started = time.perf_counter()
+            count = write_capture(path, args.size_mb)
+            print(f"wrote {os.path.getsize(path) / 2**20:,.0f} MB with {count:,} network logs "
+                  f"in {time.perf_counter() - started:.1f}s")
+        print(f"{'section':<16} {'reader':<8} {'seconds':>8} {'peak RSS MB':>12} {'items':>10}")
+        modes = ["stream"] if args.skip_load else ["load", "stream"]
+        for section in args.sections.split(","):
+            for mode in modes:
+                r = run(mode, section, path)
+                if "error" in r:
+                    print(f"{section:<16} {mode:<8} failed: {r['error']}")
+                else:
+                    print(f"{section:<16} {mode:<8} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12,.1f} {r['items']:>10,}")
+    finally:
+        if tmp is not None:
+            os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
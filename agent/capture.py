@@ -0,0 +1,348 @@
+# agent/capture.py
+"""
+Compact binary form of the scraper snapshots (agent/output/<page>.cap).
+
+The JSON snapshots repeat the request headers of every log entry and the
+full response body of every request, pretty-printed. A capture file stores
+the same data once:
+
+    b"ACAP" | version (1 byte) | codec (1 byte) | compressed record stream
+
+The stream is zstd (when the `zstandard` package is installed) or zlib.
+Each record is a type byte, a 4-byte little-endian length and a payload:
+
+    S  section start: JSON ["name", is_list]
+    V  the value of a non-list section (JSON)
+    I  one element of a list section (JSON)
+    H  a distinct headers object, numbered in order of appearance
+    B  a distinct response body (compact JSON), numbered likewise; bodies
+       are deduplicated by their SHA-256
+    L  a network log entry: the entry as JSON with "headers" and "body"
+       replaced by the numbers of their H and B records (body null stays null)
+    E  end of the capture
+
+H and B records always precede the first L record that uses them, so a
+reader never looks back. Reading decompresses sequentially and holds only
+the dictionaries and one record. Records of other sections are skipped
+without being decoded.
+
+    python -m agent.capture agent/output/*.json       # writes the .cap files next to them
+
+agent.snapshot reads both formats, so the agents take whichever exists.
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zlib is always available
+
+MAGIC = b"ACAP"
+VERSION = 1
+ZLIB, ZSTD = 0, 1
+CODEC_NAMES = {"zlib": ZLIB, "zstd": ZSTD}
+
+_RECORD = struct.Struct("<BI")
+_READ_SIZE = 1 << 20
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class CaptureError(ValueError):
+    pass
+
+
+def is_capture(path: Union[str, Path]) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+# ---------------- writing ---------------- #
+
+
+class _Compressor:
+    def __init__(self, f, codec: int, level: Optional[int]):
+        self.f = f
+        if codec == ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstd captures need the zstandard package")
+            self._obj = zstandard.ZstdCompressor(level=level or 10).compressobj()
+        else:
+            self._obj = zlib.compressobj(level if level is not None else 9)
+
+    def write(self, data: bytes) -> None:
+        self.f.write(self._obj.compress(data))
+
+    def close(self) -> None:
+        self.f.write(self._obj.flush())
+
+
+class CaptureWriter:
+    def __init__(self, f, codec: Optional[str] = None, level: Optional[int] = None):
+        codec_id = CODEC_NAMES[codec or default_codec()]
+        f.write(MAGIC + bytes([VERSION, codec_id]))
+        self._out = _Compressor(f, codec_id, level)
+        self._headers: Dict[bytes, int] = {}
+        self._bodies: Dict[bytes, int] = {}
+        self._logs = False  # inside the network log section
+
+    def _record(self, kind: bytes, payload: bytes) -> None:
+        self._out.write(_RECORD.pack(kind[0], len(payload)) + payload)
+
+    def _ref(self, table: Dict[bytes, int], kind: bytes, payload: bytes, key: bytes) -> int:
+        ref = table.get(key)
+        if ref is None:
+            ref = table[key] = len(table)
+            self._record(kind, payload)
+        return ref
+
+    def begin_section(self, name: str, is_list: bool) -> None:
+        from .snapshot import NETWORK_LOG_KEYS
+
+        self._logs = name in NETWORK_LOG_KEYS
+        self._record(b"S", _dumps([name, is_list]).encode())
+
+    def value(self, value: Any) -> None:
+        self._record(b"V", _dumps(value).encode())
+
+    def item(self, item: Any) -> None:
+        if self._logs and isinstance(item, dict):
+            self.log(item)
+        else:
+            self._record(b"I", _dumps(item).encode())
+
+    def section(self, name: str, value: Any) -> None:
+        is_list = isinstance(value, list)
+        self.begin_section(name, is_list)
+        if not is_list:
+            self.value(value)
+            return
+        for item in value:
+            self.item(item)
+
+    def log(self, entry: dict) -> None:
+        entry = dict(entry)
+        if "headers" in entry:
+            payload = _dumps(entry["headers"]).encode()
+            entry["headers"] = self._ref(self._headers, b"H", payload, payload)
+        if entry.get("body") is not None:
+            payload = _dumps(entry["body"]).encode()
+            entry["body"] = self._ref(self._bodies, b"B", payload, hashlib.sha256(payload).digest())
+        self._record(b"L", _dumps(entry).encode())
+
+    def close(self) -> None:
+        self._record(b"E", b"")
+        self._out.close()
+
+
+def write_capture(path: Union[str, Path], snapshot: dict, codec: Optional[str] = None,
+                  level: Optional[int] = None) -> None:
+    with open(path, "wb") as f:
+        writer = CaptureWriter(f, codec, level)
+        for name, value in snapshot.items():
+            writer.section(name, value)
+        writer.close()
+
+
+def convert(json_path: Union[str, Path], out_path: Union[str, Path, None] = None,
+            codec: Optional[str] = None, level: Optional[int] = None) -> Path:
+    """Write the .cap form of a JSON snapshot, streaming it section by section."""
+    from .snapshot import iter_sections
+
+    json_path = Path(json_path)
+    out_path = Path(out_path) if out_path else json_path.with_suffix(".cap")
+    with open(out_path, "wb") as f:
+        writer = CaptureWriter(f, codec, level)
+        for name, is_list, value in iter_sections(json_path):
+            writer.begin_section(name, is_list)
+            if is_list:
+                for item in value:
+                    writer.item(item)
+            else:
+                writer.value(value)
+        writer.close()
+    return out_path
+
+
+# ---------------- reading ---------------- #
+
+
+class _Decompressor:
+    def __init__(self, f, codec: int):
+        if codec == ZSTD:
+            if zstandard is None:
+                raise RuntimeError("this capture is zstd-compressed; install the zstandard package")
+            self._reader = zstandard.ZstdDecompressor().stream_reader(f)
+            self._obj = None
+        elif codec == ZLIB:
+            self._reader = f
+            self._obj = zlib.decompressobj()
+        else:
+            raise CaptureError(f"Unknown capture codec {codec}")
+        self._buf = b""
+        self._pos = 0
+
+    def _chunk(self) -> bytes:
+        if self._obj is None:
+            return self._reader.read(_READ_SIZE)
+        while True:
+            # bound the output too: a repetitive capture inflates a lot
+            src = self._obj.unconsumed_tail or self._reader.read(_READ_SIZE)
+            if not src:
+                return self._obj.flush()
+            data = self._obj.decompress(src, _READ_SIZE)
+            if data:
+                return data
+
+    def read(self, n: int) -> bytes:
+        end = self._pos + n
+        if end <= len(self._buf):
+            self._pos = end
+            return self._buf[end - n:end]
+        parts = [self._buf[self._pos:]]
+        have = len(parts[0])
+        while have < n:
+            data = self._chunk()
+            if not data:
+                raise CaptureError("Truncated capture")
+            parts.append(data)
+            have += len(data)
+        self._buf = b"".join(parts)
+        self._pos = n
+        return self._buf[:n]
+
+
+def _records(f) -> Iterator[Tuple[int, bytes]]:
+    head = f.read(len(MAGIC) + 2)
+    if head[:len(MAGIC)] != MAGIC:
+        raise CaptureError("Not a capture file")
+    if head[len(MAGIC)] != VERSION:
+        raise CaptureError(f"Unsupported capture version {head[len(MAGIC)]}")
+    stream = _Decompressor(f, head[len(MAGIC) + 1])
+    while True:
+        kind, length = _RECORD.unpack(stream.read(_RECORD.size))
+        if kind == ord("E"):
+            return
+        yield kind, stream.read(length)
+
+
+class _Sections:
+    """Walks the records, resolving log entries against the header and body dictionaries."""
+
+    def __init__(self, f):
+        self._records = _records(f)
+        self._headers: List[bytes] = []
+        self._bodies: List[bytes] = []
+        self._pending: Optional[Tuple[int, bytes]] = None
+
+    def _next(self) -> Optional[Tuple[int, bytes]]:
+        if self._pending is not None:
+            record, self._pending = self._pending, None
+            return record
+        for kind, payload in self._records:
+            if kind == ord("H"):
+                self._headers.append(payload)
+            elif kind == ord("B"):
+                self._bodies.append(payload)
+            else:
+                return kind, payload
+        return None
+
+    def _log(self, payload: bytes) -> dict:
+        entry = json.loads(payload)
+        if "headers" in entry:
+            entry["headers"] = json.loads(self._headers[entry["headers"]])
+        if entry.get("body") is not None:
+            entry["body"] = json.loads(self._bodies[entry["body"]])
+        return entry
+
+    def __iter__(self) -> Iterator[Tuple[str, bool]]:
+        """(name, is_list) per section; the caller may read its value with `items`/`value`."""
+        while True:
+            record = self._next()
+            if record is None:
+                return
+            kind, payload = record
+            if kind != ord("S"):
+                continue  # the rest of a section the caller did not read
+            name, is_list = json.loads(payload)
+            yield name, is_list
+
+    def items(self) -> Iterator[Any]:
+        while True:
+            record = self._next()
+            if record is None:
+                return
+            kind, payload = record
+            if kind == ord("L"):
+                yield self._log(payload)
+            elif kind == ord("I"):
+                yield json.loads(payload)
+            else:
+                self._pending = record
+                return
+
+    def value(self) -> Any:
+        record = self._next()
+        if record is None or record[0] != ord("V"):
+            raise CaptureError("Malformed capture: section without a value")
+        return json.loads(record[1])
+
+
+def iter_items(path: Union[str, Path], *keys: str) -> Iterator[Any]:
+    """Elements of the first list section named by any of `keys`; nothing if there is none."""
+    with open(path, "rb") as f:
+        sections = _Sections(f)
+        for name, is_list in sections:
+            if name in keys:
+                if is_list:
+                    yield from sections.items()
+                return
+
+
+def read_section(path: Union[str, Path], *keys: str, default: Any = None) -> Any:
+    with open(path, "rb") as f:
+        sections = _Sections(f)
+        for name, is_list in sections:
+            if name in keys:
+                return list(sections.items()) if is_list else sections.value()
+    return default
+
+
+def read_sections(path: Union[str, Path], *keys: str) -> dict:
+    """The given sections, or every section when no keys are given."""
+    found = {}
+    with open(path, "rb") as f:
+        sections = _Sections(f)
+        for name, is_list in sections:
+            if keys and name not in keys:
+                continue
+            found[name] = list(sections.items()) if is_list else sections.value()
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convert JSON snapshots to capture files.")
+    parser.add_argument("paths", nargs="+", help="agent/output/<page>.json files")
+    parser.add_argument("--codec", choices=sorted(CODEC_NAMES), default=default_codec())
+    parser.add_argument("--level", type=int, help="compression level")
+    args = parser.parse_args()
+    for path in args.paths:
+        out = convert(path, codec=args.codec, level=args.level)
+        before, after = Path(path).stat().st_size, out.stat().st_size
+        print(f"{path}: {before:,} -> {after:,} bytes ({before / after:.1f}x) in {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+# agent/capture_store.py
+"""
+Queryable index of the captured network logs.
+
+Most of a page's capture is noise for the backend agent: static assets,
+analytics beacons, consent banners. The API calls it needs are a few
+dozen requests, repeated with different ids. Indexing loads the logs into
+SQLite and does four things to every entry:
+- It normalizes the URL to host + path template. Numeric, UUID, long hex
+  and opaque token segments become {id}, so /-/task/1211954463668463
+  becomes /-/task/{id}. It records the sorted query parameter names.
+- It classifies noise: a response without a JSON body, a static asset, a
+  known telemetry host, or another service's client library.
+- It reduces the JSON body to its shape: keys and value types, without
+  values.
+- It groups entries into endpoints by method + host + template + body
+  shape. Each endpoint counts its calls and keeps one sample body.
+
+    python -m agent.capture_store build                  # home, projects, tasks -> agent/output/captures.db
+    python -m agent.capture_store endpoints --page home
+    python -m agent.capture_store lookup GET https://app.asana.com/-/task/123
+
+The agents can also index in memory: CaptureStore().add_page(page, logs).
+"""
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .snapshot import NETWORK_LOG_KEYS, OUTPUT_DIR, iter_items, snapshot_path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # json is fast enough for page-sized captures
+
+DEFAULT_DB = OUTPUT_DIR / "captures.db"
+PAGES = ("home", "projects", "tasks")
+
+ID = "{id}"
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16,}"
+    r"|(?=[A-Za-z_-]*\d)(?=[\d_-]*[A-Za-z])[A-Za-z0-9_-]{20,}",
+    re.IGNORECASE,
+)
+STATIC_EXTENSIONS = (
+    ".js", ".mjs", ".css", ".map", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp",
+    ".woff", ".woff2", ".ttf", ".otf", ".html", ".txt",
+)
+TELEMETRY_HOSTS = (
+    "google-analytics.com", "analytics.google.com", "doubleclick.net", "googletagmanager.com",
+    "facebook.com", "facebook.net", "cookielaw.org", "onetrust.com", "recaptcha.net",
+)
+# client libraries of other services the page loads (Google sign-in, fonts)
+THIRD_PARTY_HOSTS = ("googleapis.com", "google.com", "gstatic.com")
+# how deep and how many list elements a body shape looks at
+SHAPE_DEPTH = 6
+SHAPE_ITEMS = 20
+SHAPE_KEYS = 64
+SHAPE_CACHE_SIZE = 10_000
+BATCH_ROWS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    hash        TEXT PRIMARY KEY,
+    body        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS endpoints (
+    id          INTEGER PRIMARY KEY,
+    method      TEXT NOT NULL,
+    host        TEXT NOT NULL,
+    template    TEXT NOT NULL,
+    shape_hash  TEXT NOT NULL,
+    shape       TEXT,
+    noise       TEXT,
+    calls       INTEGER NOT NULL DEFAULT 0,
+    query_keys  TEXT,
+    pages       TEXT,
+    sample_hash TEXT REFERENCES bodies(hash),
+    UNIQUE (method, host, template, shape_hash)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id          INTEGER PRIMARY KEY,
+    page        TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    endpoint_id INTEGER NOT NULL REFERENCES endpoints(id),
+    url         TEXT NOT NULL,
+    query_keys  TEXT NOT NULL,
+    status      INTEGER,
+    body_hash   TEXT REFERENCES bodies(hash)
+);
+CREATE INDEX IF NOT EXISTS ix_endpoints_template ON endpoints (template, method);
+CREATE INDEX IF NOT EXISTS ix_entries_endpoint ON entries (endpoint_id);
+CREATE INDEX IF NOT EXISTS ix_entries_page ON entries (page, seq);
+"""
+
+
+class Endpoint(NamedTuple):
+    id: int
+    method: str
+    host: str
+    template: str
+    calls: int
+    noise: Optional[str]
+    query_keys: List[str]
+    pages: List[str]
+    shape: Any
+
+
+def is_id(text: str) -> bool:
+    """Whether a path segment or object key is an identifier rather than a name."""
+    return _ID_SEGMENT.fullmatch(text) is not None
+
+
+def url_template(url: str) -> Tuple[str, str, List[str]]:
+    """(host, path template, sorted query parameter names) of `url`."""
+    if url.startswith("blob:"):
+        url = url[len("blob:"):]
+    parts = urlsplit(url)
+    segments = [ID if is_id(s) else s for s in parts.path.split("/")]
+    keys = sorted({k for k, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    return parts.netloc.lower(), "/".join(segments) or "/", keys
+
+
+def _on_host(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def noise_reason(host: str, template: str, body: Any) -> Optional[str]:
+    """Why an entry is not an API call worth modelling, or None."""
+    if _on_host(host, TELEMETRY_HOSTS):
+        return "telemetry"
+    if _on_host(host, THIRD_PARTY_HOSTS):
+        return "third-party"
+    if template.lower().endswith(STATIC_EXTENSIONS):
+        return "static"
+    if not isinstance(body, (dict, list)):
+        return "no-json"
+    return None
+
+
+def canonical_json(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode()
+        except TypeError:
+            pass  # e.g. an integer beyond 64 bits, which json encodes the same way otherwise
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def body_shape(value: Any, depth: int = 0) -> Any:
+    """
+    The structure of a JSON value without its data: objects keep their keys,
+    lists the distinct shapes of their first elements, scalars become type
+    names. Keys that are ids collapse into one "{id}" key, and objects with
+    more than SHAPE_KEYS keys are taken for maps and become {"{key}": ...}.
+    """
+    if isinstance(value, dict):
+        if depth >= SHAPE_DEPTH:
+            return "object"
+        if len(value) > SHAPE_KEYS:
+            # a map keyed by data (names, ids), not a record
+            return {"{key}": body_shape(next(iter(value.values())), depth + 1)}
+        shape = {}
+        for key, item in value.items():
+            key = ID if is_id(key) else key
+            if key not in shape:
+                shape[key] = body_shape(item, depth + 1)
+        return {key: shape[key] for key in sorted(shape)}
+    if isinstance(value, list):
+        if depth >= SHAPE_DEPTH:
+            return ["..."] if value else []
+        shapes = {}
+        for item in value[:SHAPE_ITEMS]:
+            shape = body_shape(item, depth + 1)
+            shapes.setdefault(canonical_json(shape), shape)
+        return [shapes[key] for key in sorted(shapes)]
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+class CaptureStore:
+    def __init__(self, path: str = ":memory:"):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(SCHEMA)
+        self._endpoints: Dict[tuple, int] = {
+            (method, host, template, shape_hash): id
+            for id, method, host, template, shape_hash in self.conn.execute(
+                "SELECT id, method, host, template, shape_hash FROM endpoints"
+            )
+        }
+        # body hash -> (shape hash, shape), so a repeated body is shaped once
+        self._shapes: Dict[str, tuple] = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _endpoint(self, method: str, host: str, template: str, shape_hash: str, shape: Any,
+                  noise: Optional[str], body_hash: Optional[str]) -> int:
+        key = (method, host, template, shape_hash)
+        endpoint_id = self._endpoints.get(key)
+        if endpoint_id is None:
+            endpoint_id = self.conn.execute(
+                "INSERT INTO endpoints (method, host, template, shape_hash, shape, noise, sample_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (method, host, template, shape_hash, None if shape is None else canonical_json(shape), noise, body_hash),
+            ).lastrowid
+            self._endpoints[key] = endpoint_id
+        return endpoint_id
+
+    def add_page(self, page: str, logs: Iterable[dict]) -> int:
+        """Index one page's network logs, replacing what was indexed for it before."""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE page = ?", (page,))
+            rows, bodies, count = [], {}, 0
+            for seq, log in enumerate(logs):
+                method = str(log.get("method") or "GET").upper()
+                host, template, query_keys = url_template(str(log.get("url") or ""))
+                body = log.get("body")
+                noise = noise_reason(host, template, body)
+                body_hash = shape_hash = shape = None
+                if noise is None:
+                    text = canonical_json(body)
+                    body_hash = hashlib.sha1(text.encode()).hexdigest()
+                    if body_hash not in self._shapes:
+                        if len(self._shapes) >= SHAPE_CACHE_SIZE:
+                            self._shapes.clear()
+                        shape = body_shape(body)
+                        self._shapes[body_hash] = (hashlib.sha1(canonical_json(shape).encode()).hexdigest(), shape)
+                    shape_hash, shape = self._shapes[body_hash]
+                    bodies.setdefault(body_hash, text)
+                endpoint_id = self._endpoint(method, host, template, shape_hash or "", shape, noise, body_hash)
+                rows.append((page, seq, endpoint_id, log.get("url") or "", ",".join(query_keys),
+                             log.get("status"), body_hash))
+                count += 1
+                if len(rows) >= BATCH_ROWS:
+                    self._flush(rows, bodies)
+            self._flush(rows, bodies)
+            # aggregates kept on the endpoint, so queries never scan entries
+            self.conn.execute(
+                "UPDATE endpoints SET (calls, query_keys, pages) = (SELECT count(*), "
+                "group_concat(DISTINCT nullif(query_keys, '')), group_concat(DISTINCT page) "
+                "FROM entries WHERE endpoint_id = endpoints.id)"
+            )
+            self.conn.execute("DELETE FROM endpoints WHERE calls = 0")
+            live = {id for id, in self.conn.execute("SELECT id FROM endpoints")}
+            self._endpoints = {key: id for key, id in self._endpoints.items() if id in live}
+        return count
+
+    def _flush(self, rows: list, bodies: dict) -> None:
+        self.conn.executemany("INSERT OR IGNORE INTO bodies (hash, body) VALUES (?, ?)", bodies.items())
+        self.conn.executemany(
+            "INSERT INTO entries (page, seq, endpoint_id, url, query_keys, status, body_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        rows.clear()
+        bodies.clear()
+
+    def _rows_to_endpoints(self, rows) -> List[Endpoint]:
+        return [
+            Endpoint(id, method, host, template, calls, noise,
+                     sorted({k for k in (query_keys or "").split(",") if k}),
+                     sorted((pages or "").split(",")),
+                     None if shape is None else json.loads(shape))
+            for id, method, host, template, calls, noise, query_keys, pages, shape in rows
+        ]
+
+    _ENDPOINT_SQL = (
+        "SELECT e.id, e.method, e.host, e.template, e.calls, e.noise, e.query_keys, e.pages, e.shape "
+        "FROM endpoints e"
+    )
+
+    def endpoints(self, page: Optional[str] = None, include_noise: bool = False,
+                  host: Optional[str] = None) -> List[Endpoint]:
+        """Endpoints, the most called first; API calls only unless `include_noise`."""
+        where, params = [], []
+        if not include_noise:
+            where.append("e.noise IS NULL")
+        if host is not None:
+            where.append("e.host = ?")
+            params.append(host)
+        if page is not None:
+            where.append("',' || e.pages || ',' LIKE ?")
+            params.append(f"%,{page},%")
+        sql = self._ENDPOINT_SQL
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.calls DESC, e.host, e.template, e.method"
+        return self._rows_to_endpoints(self.conn.execute(sql, params))
+
+    def lookup(self, method: str, url: str) -> List[Endpoint]:
+        """The endpoints (one per body shape) a request to `url` falls under."""
+        host, template, _ = url_template(url)
+        sql = self._ENDPOINT_SQL + (" WHERE e.template = ? AND e.method = ? AND (? = '' OR e.host = ?) ORDER BY e.calls DESC")
+        return self._rows_to_endpoints(self.conn.execute(sql, (template, method.upper(), host, host)))
+
+    def sample(self, endpoint_id: int) -> Any:
+        """One recorded response body of the endpoint."""
+        row = self.conn.execute(
+            "SELECT b.body FROM endpoints e JOIN bodies b ON b.hash = e.sample_hash WHERE e.id = ?",
+            (endpoint_id,),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def stats(self) -> Dict[str, int]:
+        entries, api = self.conn.execute(
+            "SELECT count(*), sum(e.noise IS NULL) FROM entries JOIN endpoints e ON e.id = endpoint_id"
+        ).fetchone()
+        endpoints, api_endpoints = self.conn.execute(
+            "SELECT count(*), sum(noise IS NULL) FROM endpoints"
+        ).fetchone()
+        return {"entries": entries, "api_entries": api or 0,
+                "endpoints": endpoints, "api_endpoints": api_endpoints or 0}
+
+
+def endpoint_summary(store: CaptureStore, page: Optional[str] = None, samples: bool = False) -> List[dict]:
+    """
+    JSON-ready API endpoints, the most called first, each with the shape of
+    its response and, with `samples`, one recorded response body.
+    """
+    summary = []
+    for e in store.endpoints(page=page):
+        item = {"method": e.method, "host": e.host, "path": e.template, "calls": e.calls,
+                "query": e.query_keys, "response_shape": e.shape}
+        if samples:
+            item["sample_body"] = store.sample(e.id)
+        summary.append(item)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index the snapshots of the given pages")
+    build.add_argument("pages", nargs="*", default=list(PAGES))
+    listing = commands.add_parser("endpoints", help="list the indexed endpoints")
+    listing.add_argument("--page")
+    listing.add_argument("--all", action="store_true", help="include noise")
+    find = commands.add_parser("lookup", help="endpoints a request falls under")
+    find.add_argument("method")
+    find.add_argument("url")
+    args = parser.parse_args()
+
+    store = CaptureStore(args.db)
+    try:
+        if args.command == "build":
+            for page in args.pages:
+                try:
+                    path = snapshot_path(page)
+                except FileNotFoundError as e:
+                    print(f"skipping {page}: {e}", file=sys.stderr)
+                    continue
+                started = time.perf_counter()
+                count = store.add_page(page, iter_items(path, *NETWORK_LOG_KEYS))
+                print(f"{page}: indexed {count:,} entries in {time.perf_counter() - started:.2f}s")
+            print(store.stats())
+        else:
+            if args.command == "endpoints":
+                found = store.endpoints(page=args.page, include_noise=args.all)
+            else:
+                found = store.lookup(args.method, args.url)
+            for e in found:
+                query = f"?{'&'.join(e.query_keys)}" if e.query_keys else ""
+                print(f"{e.calls:>6}  {e.method:<6} {e.host}{e.template}{query}"
+                      f"{'  [' + e.noise + ']' if e.noise else ''}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,16 @@ class Settings(BaseSettings):
     frontend_port: int = 3000
     backend_port: int = 8000
     use_llm: bool = False  # toggle
+    infer_spec: bool = False  # offline: infer the spec from the captures instead of the mock
+    llm_cache: bool = True  # reuse LLM responses for unchanged prompts (agent/llm_cache.py)
+    llm_cache_dir: str | None = None  # default agent/output/llm_cache
+    llm_cache_max_mb: int = 256
+    llm_stub: bool = False  # answer LLM calls locally (agent/llm_client.py), e.g. to time the pipeline
+    llm_stub_latency: float = 1.0  # seconds per stub call
+    llm_concurrency: int = 4  # LLM requests in flight at once (agent/pipeline.py)
+    llm_retries: int = 3
+    llm_backoff: float = 1.0  # seconds before the first retry, doubling after
+    prompt_token_budget: int = 3000  # snapshot part of the frontend prompt (agent/prompt_packer.py)
 
     model_config = SettingsConfigDict(
         env_file=".env",
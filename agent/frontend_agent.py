@@ -1,61 +1,67 @@
 # D:\Scaler-Agent-Replicator\agent\frontend_agent.py
-import json
 from pathlib import Path
+from typing import Optional
+from . import llm_client
 from .config import settings
-
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # in case lib isn't installed when use_llm=False
+from .prompt_packer import pack_snapshot
+from .snapshot import read_sections, snapshot_path
 
 ROOT = Path(__file__).resolve().parents[1]
-OUTPUT_DIR = Path(__file__).with_name("output")
 FRONTEND_APP = ROOT / "frontend" / "app"
+# the route file each scraped page becomes, relative to frontend/app
+PAGE_FILES = {"home": "page.tsx", "projects": "projects/page.tsx", "tasks": "tasks/page.tsx"}
 
-def load_page_snapshot(name: str):
-    p = OUTPUT_DIR / f"{name}.json"
-    if not p.exists():
-        raise FileNotFoundError(
-            f"{p} not found. Run the scraper first: "
-            f"`npx ts-node agent/playwright_scraper.ts`"
-        )
-    with p.open(encoding="utf-8") as f:
-        return json.load(f)
-
-def generate_home_page_llm():
-    if not settings.openai_api_key or OpenAI is None:
-        raise RuntimeError("LLM disabled or openai not installed")
+def load_page_snapshot(name: str, *sections: str) -> dict:
+    """The whole snapshot, or only the given sections (streamed, the rest is skipped)."""
+    return read_sections(snapshot_path(name), *sections)
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    snapshot = load_page_snapshot("home")
-    html = snapshot["html"]
-    styles = snapshot["computedStyles"]
+def page_request(name: str, directory: Optional[Path] = None) -> dict:
+    """The arguments of the `responses.create` call that generates the page's component."""
+    # the visible DOM, style groups and API calls that fit the token budget
+    packed = pack_snapshot(snapshot_path(name, directory), settings.prompt_token_budget)
 
     prompt = f"""
 You are a senior front-end engineer.
 
-Given the following HTML snapshot and partial computed styles from Asana's Home page, generate a React Server Component for Next.js (app router) using Tailwind CSS.
+Given the following HTML snapshot, computed styles and API calls from Asana's {name.capitalize()} page, generate a React Server Component for Next.js (app router) using Tailwind CSS.
 
 Constraints:
 - Mimic layout, spacing, and typography as closely as possible.
 - Use Asana-like brand colors: #3be8b0, #1aafd0, #6a67ce, #ffb900, #fc636b.
-- Do not hard-code dynamic counts; read them from GET /home API at NEXT_PUBLIC_BACKEND_URL + "/home".
-- Component file: app/page.tsx.
+- Do not hard-code dynamic counts; read them from GET /{name} API at NEXT_PUBLIC_BACKEND_URL + "/{name}".
+- Component file: app/{PAGE_FILES[name]}.
+
+HTML of the visible page (scripts, styles and icon paths removed; … marks left-out elements):
+{packed.html}
 
-HTML (truncated):
-{html[:15000]}
+Computed styles, grouped (count× example elements: values that differ from the base line):
+{packed.styles}
 
-Sample computed styles:
-{styles[:50]}
+API calls the page makes (method, path, calls, query keys → response outline):
+{packed.api}
 """
 
-    resp = client.responses.create(
+    return dict(
         model="gpt-4o-mini",
         input=prompt,
     )
 
-    code = resp.output[0].content[0].text
-    (FRONTEND_APP / "page.tsx").write_text(code, encoding="utf-8")
+def write_page(name: str, code: str, app_dir: Optional[Path] = None) -> Path:
+    path = (app_dir or FRONTEND_APP) / PAGE_FILES[name]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code, encoding="utf-8")
+    return path
+
+def generate_page_llm(name: str):
+    client = llm_client.make_client()
+    request = page_request(name)
+    code = llm_client.create(client, request)
+    write_page(name, code)
+    llm_client.accept(client, request, code)
+    llm_client.report(client, "frontend_agent")
+
+def generate_home_page_llm():
+    generate_page_llm("home")
 
 def generate_home_page_mock():
     # Just write the static Next.js Home file we designed earlier.
@@ -93,7 +99,7 @@ export default function HomePage() {
   const [data, setData] = useState<HomeResponse | null>(null);
 
   useEffect(() => {
-    fetch(`${BACKEND_URL}/home`)
+    fetch(`${BACKEND_URL}/home`, { cache: "no-cache" })
       .then((r) => r.json())
       .then(setData)
       .catch(() => {});
@@ -0,0 +1,226 @@
+# agent/llm_cache.py
+"""
+Content-addressed on-disk cache of LLM responses.
+
+The agents send the same prompt on every USE_LLM=true run while the
+snapshots are unchanged. The prompt is built from the snapshot, so a
+change in the snapshot changes the prompt. The cache key is the SHA-256
+of every argument of the call (model, input, and anything else), which
+makes a hit exactly "this request was already answered".
+
+    client = cached(OpenAI(api_key=...))
+    request = dict(model="gpt-4o-mini", input=prompt)
+    text = client.responses.create(**request).output[0].content[0].text
+    write(text)                               # parse it; raises on a bad answer
+    client.accept(request, text)              # only now is it cached
+    print(client.cache.report())              # LLM cache: 0 hits, 1 miss, ...
+
+An answer is stored only once the caller accepts it, so one that fails
+to parse (missing markers, say) is asked again next run instead of being
+replayed forever.
+
+Each entry is one file, <dir>/<2 hex>/<64 hex>.json, holding the request
+arguments and the response text. It is written to a temp file and renamed,
+so a crashed run never leaves a partial entry. A hit bumps the file's
+mtime. When the entries together exceed max_bytes, the least recently
+used ones are deleted.
+
+    python -m agent.llm_cache             # entries and size
+    python -m agent.llm_cache --clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from .config import settings
+
+CACHE_DIR = Path(__file__).with_name("output") / "llm_cache"
+# bump when the entry layout changes: old entries then simply miss
+# (2: entries written before answers had to be accepted may not parse)
+KEY_VERSION = 2
+
+
+def cache_key(request: dict) -> str:
+    payload = json.dumps([KEY_VERSION, request], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, directory: Union[str, Path] = CACHE_DIR, max_bytes: int = 256 << 20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # total bytes on disk, counted on first write
+        self._lock = threading.Lock()  # agent.pipeline calls from several threads
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every entry, oldest first."""
+        entries = []
+        for path in self.directory.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by a concurrent run
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def get(self, request: dict) -> Optional[str]:
+        path = self._path(cache_key(request))
+        try:
+            with path.open(encoding="utf-8") as f:
+                text = json.load(f)["text"]
+        except (FileNotFoundError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted meanwhile; the text is still good
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def contains(self, request: dict) -> bool:
+        return self._path(cache_key(request)).exists()
+
+    def put(self, request: dict, text: str) -> None:
+        path = self._path(cache_key(request))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"request": request, "text": text, "created": time.time()}, ensure_ascii=False)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        with self._lock:
+            replaced = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += path.stat().st_size - replaced
+            if self._size > self.max_bytes:
+                self._evict(self.max_bytes)
+
+    def evict(self, max_bytes: int) -> int:
+        """Delete least recently used entries until at most `max_bytes` remain; returns how many."""
+        with self._lock:
+            return self._evict(max_bytes)
+
+    def _evict(self, max_bytes: int) -> int:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "hits": self.hits, "misses": self.misses}
+
+    def report(self) -> str:
+        s = self.stats()
+        return (f"LLM cache: {s['hits']} hit{'s' * (s['hits'] != 1)}, "
+                f"{s['misses']} miss{'es' * (s['misses'] != 1)}, "
+                f"{s['entries']} entries / {s['bytes'] / 1024:,.1f} KB in {self.directory}")
+
+
+# ---------------- client wrapper ---------------- #
+
+
+class _Content:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Output:
+    def __init__(self, text: str):
+        self.content = [_Content(text)]
+
+
+class TextResponse:
+    """The part of an OpenAI Responses result the agents read; cache hits and the stub client return it."""
+
+    def __init__(self, text: str):
+        self.output = [_Output(text)]
+        self.output_text = text
+
+
+class _Responses:
+    def __init__(self, responses, cache: LLMCache):
+        self._responses = responses
+        self._cache = cache
+
+    def create(self, **request: Any):
+        text = self._cache.get(request)
+        if text is not None:
+            return TextResponse(text)
+        return self._responses.create(**request)
+
+
+class CachedClient:
+    """
+    Wraps a client; `responses.create` reads through the cache, anything
+    else goes straight through. Answers are stored by `accept`.
+    """
+
+    def __init__(self, client, cache: LLMCache):
+        self._client = client
+        self.cache = cache
+        self.responses = _Responses(client.responses, cache)
+
+    def accept(self, request: dict, text: str) -> None:
+        """Cache `text` as the answer to `request`; call it once the answer was parsed and written."""
+        if not self.cache.contains(request):
+            self.cache.put(request, text)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def default_cache() -> LLMCache:
+    return LLMCache(settings.llm_cache_dir or CACHE_DIR, settings.llm_cache_max_mb << 20)
+
+
+def cached(client, cache: Optional[LLMCache] = None):
+    """`client` with its responses cached, or unchanged when LLM_CACHE=false."""
+    if cache is None:
+        if not settings.llm_cache:
+            return client
+        cache = default_cache()
+    return CachedClient(client, cache)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspect or clear the LLM response cache.")
+    parser.add_argument("--clear", action="store_true", help="delete every entry")
+    args = parser.parse_args()
+    cache = default_cache()
+    if args.clear:
+        print(f"removed {cache.evict(0)} entries from {cache.directory}")
+        return 0
+    s = cache.stats()
+    print(f"{s['entries']} entries, {s['bytes'] / 1024:,.1f} KB of {cache.max_bytes >> 20} MB in {cache.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
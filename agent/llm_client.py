@@ -0,0 +1,118 @@
+# agent/llm_client.py
+"""
+The LLM client the agents share: the OpenAI client behind agent.llm_cache,
+or with LLM_STUB=true a local stub that answers after a fixed latency.
+
+The stub answers in the format each agent parses (the ---OPENAPI--- /
+---SCHEMA_SQL--- markers, or a page component), so a whole USE_LLM=true
+run works offline. agent.pipeline uses it to measure concurrency.
+
+Calls are retried on transient errors (rate limits, timeouts, dropped
+connections, 5xx) with exponential backoff and jitter.
+"""
+import random
+import threading
+import time
+from typing import Optional
+
+from . import llm_cache
+from .config import settings
+
+try:
+    import openai
+    from openai import OpenAI
+except ImportError:
+    openai = OpenAI = None  # ok when USE_LLM = false
+
+RETRYABLE = (ConnectionError, TimeoutError)
+if openai is not None:
+    RETRYABLE += (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError,
+                  openai.InternalServerError)
+
+
+class StubError(ConnectionError):
+    """The stub's stand-in for a transient API failure."""
+
+
+class _StubResponses:
+    def __init__(self, stub: "StubClient"):
+        self._stub = stub
+
+    def create(self, **request):
+        return self._stub.answer(request)
+
+
+class StubClient:
+    """
+    Offline stand-in for openai.OpenAI. Every call sleeps `latency` seconds.
+    The first `failures` calls raise StubError to exercise the retries.
+    """
+
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+        self.requests: list = []
+        self._lock = threading.Lock()
+        self.responses = _StubResponses(self)
+
+    def answer(self, request: dict) -> llm_cache.TextResponse:
+        with self._lock:
+            self.calls += 1
+            self.requests.append(request)
+            fail = self.calls <= self.failures
+        time.sleep(self.latency)
+        if fail:
+            raise StubError("stub: simulated transient failure")
+        prompt = str(request.get("input"))
+        if "---OPENAPI---" in prompt:
+            return llm_cache.TextResponse(
+                "---OPENAPI---\nopenapi: 3.0.0\ninfo:\n  title: Stub API\n  version: 0.0.0\npaths: {}\n"
+                "---SCHEMA_SQL---\n-- stub schema\n"
+            )
+        return llm_cache.TextResponse(
+            "// generated by the stub LLM client\n"
+            "export default function Page() {\n  return <main />;\n}\n"
+        )
+
+
+def make_client(stub: Optional[bool] = None):
+    """The stub when LLM_STUB=true (never cached), else the cached OpenAI client."""
+    if settings.llm_stub if stub is None else stub:
+        return StubClient(latency=settings.llm_stub_latency)
+    if not settings.openai_api_key or OpenAI is None:
+        raise RuntimeError(
+            "USE_LLM=true but OPENAI_API_KEY is missing or openai lib not installed."
+        )
+    return llm_cache.cached(OpenAI(api_key=settings.openai_api_key))
+
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """base, 2*base, 4*base, ... each scaled by a random factor in [0.5, 1)."""
+    return base * 2 ** attempt * (0.5 + random.random() / 2)
+
+
+def create(client, request: dict, retries: Optional[int] = None, backoff: Optional[float] = None) -> str:
+    """`client.responses.create(**request)`'s text, retrying transient errors."""
+    retries = settings.llm_retries if retries is None else retries
+    backoff = settings.llm_backoff if backoff is None else backoff
+    for attempt in range(retries + 1):
+        try:
+            return client.responses.create(**request).output[0].content[0].text
+        except RETRYABLE:
+            if attempt == retries:
+                raise
+        time.sleep(backoff_delay(attempt, backoff))
+
+
+def accept(client, request: dict, text: str) -> None:
+    """Let a cached client store `text`, once the caller has parsed and written it."""
+    if isinstance(client, llm_cache.CachedClient):
+        client.accept(request, text)
+
+
+def report(client, agent: str) -> None:
+    if isinstance(client, llm_cache.CachedClient):
+        print(f"[{agent}] {client.cache.report()}")
+    elif isinstance(client, StubClient):
+        print(f"[{agent}] LLM_STUB=true → {client.calls} stub call(s), nothing sent")
@@ -0,0 +1,223 @@
+# agent/pipeline.py
+"""
+Generates every LLM artifact of the agents concurrently: the backend spec
+(api.yml + schema.sql) and one frontend page per scraped page (home,
+projects, tasks).
+
+A run has three stages, each timed by wall clock:
+- prompts: each job's request is built from its snapshot;
+- llm: the requests go out as asyncio tasks. At most `concurrency` of them
+  are in flight at a time, and each is retried on transient errors with
+  exponential backoff. The sleeps of the retries do not hold a slot;
+- write: the answers are written to backend/ and frontend/app/. Only an
+  answer that was written is accepted into the LLM cache.
+
+A page without a capture is skipped.
+
+    python -m agent.pipeline                                  # the USE_LLM client (cached)
+    python -m agent.pipeline --stub --latency 2 --compare     # offline: sequential vs concurrent
+
+With --stub the answers come from llm_client.StubClient and go to a
+temporary directory unless --out-dir is given. So that all pages can be
+measured, a page without a capture reuses another page's capture.
+"""
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from . import backend_agent, frontend_agent, llm_client, snapshot
+from .capture_store import PAGES
+from .config import settings
+
+
+class Job(NamedTuple):
+    name: str
+    request: dict
+    write: Callable[[str], List[Path]]
+
+
+class Report:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.stages: Dict[str, float] = {}
+        self.calls: Dict[str, tuple] = {}  # job -> (attempts, seconds)
+        self.written: List[Path] = []
+        self.skipped: Dict[str, str] = {}
+        self.errors: Dict[str, BaseException] = {}
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def lines(self) -> List[str]:
+        lines = [f"skipped {name}: {reason}" for name, reason in self.skipped.items()]
+        for name, (attempts, seconds) in self.calls.items():
+            retried = f", {attempts - 1} retr{'ies' if attempts > 2 else 'y'}" if attempts > 1 else ""
+            lines.append(f"  {name:<16} {seconds:>7.2f}s{retried}")
+        for name, error in self.errors.items():
+            lines.append(f"  {name:<16} failed: {error!r}")
+        for stage, seconds in self.stages.items():
+            lines.append(f"{stage:<18} {seconds:>7.2f}s")
+        lines.append(f"{'total':<18} {self.total:>7.2f}s "
+                     f"({len(self.calls)} calls, concurrency {self.concurrency})")
+        return lines
+
+
+def build_jobs(pages: Sequence[str], snapshot_dir: Optional[Path] = None, backend_dir: Optional[Path] = None,
+               app_dir: Optional[Path] = None, report: Optional[Report] = None) -> List[Job]:
+    jobs = []
+    captured = []
+    for page in pages:
+        try:
+            snapshot.snapshot_path(page, snapshot_dir)
+        except FileNotFoundError as e:
+            if report is not None:
+                report.skipped[page] = str(e).splitlines()[0]
+            continue
+        captured.append(page)
+    if captured:
+        jobs.append(Job("backend", backend_agent.backend_request(captured, snapshot_dir),
+                        partial(backend_agent.write_llm_spec, out_dir=backend_dir)))
+    for page in captured:
+        jobs.append(Job(f"page:{page}", frontend_agent.page_request(page, snapshot_dir),
+                        lambda text, page=page: [frontend_agent.write_page(page, text, app_dir)]))
+    return jobs
+
+
+async def _call(job: Job, client, slots: asyncio.Semaphore, executor: ThreadPoolExecutor,
+                retries: int, backoff: float, report: Report) -> str:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    for attempt in range(retries + 1):
+        async with slots:
+            try:
+                # the clients are blocking; each call gets a thread of its own
+                resp = await loop.run_in_executor(executor, partial(client.responses.create, **job.request))
+                report.calls[job.name] = (attempt + 1, time.perf_counter() - started)
+                return resp.output[0].content[0].text
+            except llm_client.RETRYABLE:
+                if attempt == retries:
+                    raise
+        await asyncio.sleep(llm_client.backoff_delay(attempt, backoff))
+
+
+async def _call_all(jobs: List[Job], client, concurrency: int, retries: int, backoff: float,
+                    report: Report) -> list:
+    slots = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(
+            *(_call(job, client, slots, executor, retries, backoff, report) for job in jobs),
+            return_exceptions=True,
+        )
+
+
+def run(pages: Sequence[str] = PAGES, client=None, concurrency: Optional[int] = None,
+        retries: Optional[int] = None, backoff: Optional[float] = None, snapshot_dir: Optional[Path] = None,
+        backend_dir: Optional[Path] = None, app_dir: Optional[Path] = None) -> Report:
+    """Generate every artifact of `pages`; failed jobs are in `report.errors`, the rest is written."""
+    concurrency = max(1, concurrency or settings.llm_concurrency)
+    retries = settings.llm_retries if retries is None else retries
+    backoff = settings.llm_backoff if backoff is None else backoff
+    client = client if client is not None else llm_client.make_client()
+    report = Report(concurrency)
+
+    started = time.perf_counter()
+    jobs = build_jobs(pages, snapshot_dir, backend_dir, app_dir, report)
+    report.stages["prompts"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    answers = asyncio.run(_call_all(jobs, client, concurrency, retries, backoff, report))
+    report.stages["llm"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for job, answer in zip(jobs, answers):
+        if isinstance(answer, BaseException):
+            report.errors[job.name] = answer
+            continue
+        try:
+            report.written.extend(job.write(answer))
+        except RuntimeError as e:  # e.g. the spec markers are missing
+            report.errors[job.name] = e
+            continue
+        llm_client.accept(client, job.request, answer)
+    report.stages["write"] = time.perf_counter() - started
+    return report
+
+
+def _stub_snapshots(pages: Sequence[str], workdir: Path) -> Path:
+    """A snapshot directory where every page has a capture, copying one for the pages that have none."""
+    snapshots = workdir / "snapshots"
+    snapshots.mkdir()
+    found = {}
+    for page in pages:
+        try:
+            found[page] = snapshot.snapshot_path(page)
+        except FileNotFoundError:
+            pass
+    if not found:
+        raise FileNotFoundError(f"No captures in {snapshot.OUTPUT_DIR}; run the scraper first.")
+    fallback = next(iter(found.values()))
+    for page in pages:
+        source = found.get(page, fallback)
+        if page not in found:
+            print(f"[pipeline] {page}: no capture, the stub run uses {source.name}")
+        (snapshots / f"{page}{source.suffix}").symlink_to(source.resolve())
+    return snapshots
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate the agents' LLM artifacts concurrently.")
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--concurrency", type=int, default=settings.llm_concurrency)
+    parser.add_argument("--retries", type=int, default=settings.llm_retries)
+    parser.add_argument("--stub", action="store_true", default=settings.llm_stub, help="use the local stub client")
+    parser.add_argument("--latency", type=float, default=settings.llm_stub_latency, help="seconds per stub call")
+    parser.add_argument("--failures", type=int, default=0, help="stub calls that fail before the rest succeed")
+    parser.add_argument("--compare", action="store_true", help="also run with concurrency 1 and report the speedup")
+    parser.add_argument("--out-dir", help="write backend/ and frontend/app/ under this directory")
+    args = parser.parse_args()
+    pages = [p for p in args.pages.split(",") if p]
+
+    workdir = Path(tempfile.mkdtemp(prefix="agent-pipeline-")) if args.stub else None
+    try:
+        out = Path(args.out_dir) if args.out_dir else workdir
+        dirs = {}
+        if out is not None:
+            dirs = {"backend_dir": out / "backend", "app_dir": out / "frontend" / "app"}
+        if args.stub:
+            dirs["snapshot_dir"] = _stub_snapshots(pages, workdir)
+
+        def once(concurrency: int) -> Report:
+            client = (llm_client.StubClient(args.latency, args.failures) if args.stub
+                      else llm_client.make_client(stub=False))
+            report = run(pages, client, concurrency, args.retries, **dirs)
+            print(f"[pipeline] concurrency {concurrency}:")
+            for line in report.lines():
+                print(f"[pipeline]   {line}")
+            llm_client.report(client, "pipeline")
+            return report
+
+        reports = []
+        if args.compare:
+            reports.append(once(1))
+        reports.append(once(args.concurrency))
+        if args.compare:
+            print(f"[pipeline] llm stage speedup: {reports[0].stages['llm'] / reports[1].stages['llm']:.1f}x, "
+                  f"total: {reports[0].total / reports[1].total:.1f}x")
+        if out is not None and args.out_dir:
+            print(f"[pipeline] wrote {len(reports[-1].written)} files under {out}")
+        return 1 if reports[-1].errors else 0
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+# agent/prompt_packer.py
+"""
+Packs a page snapshot into a prompt of at most a given number of tokens.
+
+The frontend agent used to send html[:15000] and computedStyles[:50].
+On a real capture that prefix is almost all <head> scripts and inline
+CSS, and the first fifty styles are <html>, <head> and <meta> elements.
+The packer selects by content instead, in three sections:
+
+- html: the <body> as a tree. Scripts, styles and SVG paths are dropped,
+  class lists are cut to their base names, and only attributes that
+  identify an element are kept (id, role, aria-label, data-testid, ...).
+  Subtrees are then added best first, ranked by the visible text, headings,
+  controls and labels they hold per token, for as long as the budget
+  allows. Elided children show as "…".
+- styles: the computed styles of visible elements, grouped by identical
+  values, the most common first. Each group lists only where it differs
+  from the most common value of each property, with colors as hex.
+- api: the API endpoints the page called (agent.capture_store), the most
+  called first, with an outline of the response.
+
+styles and api get a fixed share of the budget; html gets the rest,
+including what they leave unused.
+
+Tokens are counted with tiktoken when it is installed and its encoding can
+be loaded, else estimated: words in pieces of up to six letters, numbers
+in groups of three, punctuation in pairs. The estimate errs slightly high.
+
+    packed = pack_snapshot("agent/output/home.json", budget=3000)
+    packed.html, packed.styles, packed.api, packed.tokens
+
+    python -m agent.prompt_packer agent/output/home.json --budget 2000
+"""
+import argparse
+import heapq
+import json
+import re
+import sys
+from collections import Counter
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .capture_store import CaptureStore, endpoint_summary
+from .snapshot import NETWORK_LOG_KEYS, iter_items, read_section
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # the estimator is close enough for budgeting
+
+DEFAULT_BUDGET = 3000
+# fractions of the budget for the styles and api sections; html gets the rest
+SHARES = {"styles": 0.15, "api": 0.2}
+ENCODING = "o200k_base"
+
+# elements without visible content, dropped with everything inside them
+HIDDEN_TAGS = {"head", "script", "style", "noscript", "template", "link", "meta", "iframe", "title", "base"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+KEEP_ATTRS = ("id", "role", "aria-label", "data-testid", "href", "type", "placeholder", "alt", "name")
+MAX_CLASSES = 2
+MAX_ATTR_CHARS = 60
+MAX_TEXT_CHARS = 160
+STYLE_EXAMPLES = 2
+# how much an element is worth besides its text
+TAG_VALUES = {"h1": 8, "h2": 6, "h3": 5, "h4": 3, "nav": 6, "main": 6, "header": 4, "aside": 4, "button": 3,
+              "a": 2, "input": 3, "select": 3, "textarea": 3, "img": 1, "svg": 1, "li": 1, "table": 3}
+ROLE_VALUE = 2
+LABEL_VALUE = 2
+
+_PIECES = re.compile(r"[A-Za-z]{1,6}|[0-9]{1,3}|[^\sA-Za-z0-9]{1,2}")
+_SPACE = re.compile(r"\s+")
+_RGB = re.compile(r"rgba?\((\d+),\s*(\d+),\s*(\d+)(?:,\s*([\d.]+))?\)")
+
+
+# ---------------- token counting ---------------- #
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokenizer-free token count; within a few percent above BPE counts on markup."""
+    return len(_PIECES.findall(text))
+
+
+@lru_cache(maxsize=None)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING)
+    except Exception:  # the encoding is downloaded on first use, which can fail offline
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    return len(enc.encode(text, disallowed_special=())) if enc is not None else estimate_tokens(text)
+
+
+def tokenizer_name() -> str:
+    return ENCODING if _encoding() is not None else "estimate"
+
+
+# ---------------- html ---------------- #
+
+
+class _Node:
+    __slots__ = ("tag", "open", "close", "parts", "cost", "value", "sub_cost", "sub_value", "order")
+
+    def __init__(self, tag: str, open_tag: str, close_tag: str, order: int):
+        self.tag = tag
+        self.open = open_tag
+        self.close = close_tag
+        self.parts: List[Union["_Node", str]] = []
+        self.cost = self.value = self.sub_cost = self.sub_value = 0
+        self.order = order
+
+
+def _attrs(attrs: List[Tuple[str, Optional[str]]]) -> Tuple[str, int]:
+    """The kept attributes as markup, and what they add to the element's value."""
+    out = []
+    value = 0
+    for key, val in attrs:
+        if val is None:
+            continue
+        if key == "class":
+            classes = [c for c in val.split() if "--" not in c][:MAX_CLASSES]
+            if classes:
+                out.append(f'class="{" ".join(classes)}"')
+        elif key in KEEP_ATTRS:
+            out.append(f'{key}="{val[:MAX_ATTR_CHARS].replace(chr(34), chr(39))}"')
+            value += LABEL_VALUE if key in ("aria-label", "data-testid", "alt", "placeholder") else 0
+            value += ROLE_VALUE if key == "role" else 0
+    return "".join(" " + a for a in out), value
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", "", "", 0)
+        self.body: Optional[_Node] = None
+        self.nodes = [self.root]
+        self._stack = [self.root]
+        self._hidden = 0  # depth inside a hidden element or an <svg>
+
+    def handle_starttag(self, tag, attrs):
+        if self._hidden:
+            if tag not in VOID_TAGS:
+                self._hidden += 1
+            return
+        if tag in HIDDEN_TAGS:
+            if tag not in VOID_TAGS:
+                self._hidden = 1
+            return
+        markup, value = _attrs(attrs)
+        void = tag in VOID_TAGS or tag == "svg"
+        node = _Node(tag, f"<{tag}{markup}{'/' if tag == 'svg' else ''}>", "" if void else f"</{tag}>",
+                     len(self.nodes))
+        node.value = TAG_VALUES.get(tag, 0) + value
+        self.nodes.append(node)
+        self._stack[-1].parts.append(node)
+        if tag == "body" and self.body is None:
+            self.body = node
+        if tag == "svg":
+            self._hidden = 1  # keep the icon's element and label, not its paths
+        elif not void:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and tag != "svg" and not self._hidden and self._stack[-1].tag == tag:
+            self._stack.pop()
+        elif self._hidden and tag not in VOID_TAGS:
+            self._hidden -= 1
+
+    def handle_endtag(self, tag):
+        if self._hidden:
+            self._hidden -= 1
+            return
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self._hidden:
+            return
+        text = _SPACE.sub(" ", data).strip()
+        if text:
+            if len(text) > MAX_TEXT_CHARS:
+                text = text[:MAX_TEXT_CHARS] + "…"
+            self._stack[-1].parts.append(text)
+
+
+def parse_html(html: str) -> _Node:
+    """The visible tree of a document: its <body>, or everything if there is none."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    root = builder.body or builder.root
+    # totals bottom-up; nodes are in document order, so children come after parents
+    for node in reversed(builder.nodes):
+        node.cost = count_tokens(node.open + node.close) + 1  # + 1 for a possible "…"
+        node.sub_cost = node.cost
+        node.sub_value = node.value
+        for part in node.parts:
+            if isinstance(part, str):
+                tokens = count_tokens(part)
+                node.cost += tokens
+                node.sub_cost += tokens
+                node.sub_value += tokens
+            else:
+                node.sub_cost += part.sub_cost
+                node.sub_value += part.sub_value
+    return root
+
+
+def _render(root: _Node, included: set) -> str:
+    out = []
+    stack: List[Any] = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+        out.append(item.open)
+        children = []
+        elided = False
+        for part in item.parts:
+            if isinstance(part, str) or part in included:
+                children.append(part)
+                elided = False
+            elif not elided and part.sub_value:
+                children.append("…")  # one mark per run of left-out elements
+                elided = True
+        stack.append(item.close)
+        stack.extend(reversed(children))
+    return "".join(out)
+
+
+def pack_html(html: str, budget: int) -> str:
+    """
+    The most informative subtrees of the visible tree that fit in `budget`
+    tokens. The selection works on estimated costs, so it is shrunk until
+    the rendered text counts within budget; "" when even the root does not.
+    """
+    root = parse_html(html)
+    target = budget
+    while True:
+        included = _shown(root) if root.sub_cost <= target else _select(root, target)
+        if not included:
+            return ""
+        text = _render(root, included)
+        tokens = count_tokens(text)
+        if tokens <= budget:
+            return text
+        # strictly smaller every round, so the loop ends at "" at the latest
+        target = min(target - 1, int(target * budget / tokens))
+
+
+def _shown(root: _Node) -> set:
+    """Every node with something to show under it."""
+    found, stack = {root}, [root]
+    while stack:
+        node = stack.pop()
+        for part in node.parts:
+            if not isinstance(part, str) and part.sub_value:
+                found.add(part)
+                stack.append(part)
+    return found
+
+
+def _select(root: _Node, budget: int) -> set:
+    """Greedy best-first: a node can join once its parent has, in order of value per token."""
+    if root.cost > budget:
+        return set()
+    included = {root}
+    used = root.cost
+    frontier: list = []
+
+    def offer(node: _Node) -> None:
+        for part in node.parts:
+            if not isinstance(part, str) and part.sub_value:
+                heapq.heappush(frontier, (-part.sub_value / part.sub_cost, part.order, part))
+
+    offer(root)
+    while frontier:
+        _, _, node = heapq.heappop(frontier)
+        if used + node.cost > budget:
+            continue
+        included.add(node)
+        used += node.cost
+        offer(node)
+    return included
+
+
+# ---------------- styles ---------------- #
+
+
+def _hex(match: "re.Match") -> str:
+    r, g, b, a = match.groups()
+    if a is not None and float(a) == 0:
+        return "transparent"
+    color = "#{:02x}{:02x}{:02x}".format(int(r), int(g), int(b))
+    return color if a is None or float(a) == 1 else f"{color}/{float(a):g}"
+
+
+def short_colors(text: str) -> str:
+    """rgb(59, 232, 176) -> #3be8b0, rgba(0, 0, 0, 0) -> transparent."""
+    return _RGB.sub(_hex, text)
+
+
+def style_groups(styles: Iterable[dict]) -> List[Tuple[int, dict, List[str]]]:
+    """(count, styles, example elements) per distinct style of the visible elements, the most common first."""
+    groups: Dict[str, list] = {}
+    for entry in styles:
+        tag = str(entry.get("tag") or "").lower()
+        if tag in HIDDEN_TAGS or tag in ("html", "path", "stop", "defs", "lineargradient"):
+            continue
+        values = entry.get("styles") or {}
+        key = json.dumps(values, sort_keys=True)
+        group = groups.setdefault(key, [0, values, []])
+        group[0] += 1
+        name = entry.get("className")
+        name = next((c for c in name.split() if "--" not in c), "") if isinstance(name, str) else ""
+        example = f"{tag}.{name}" if name else tag
+        if example not in group[2] and len(group[2]) < STYLE_EXAMPLES:
+            group[2].append(example)
+    return sorted((tuple(g) for g in groups.values()), key=lambda g: -g[0])
+
+
+def _props(values: dict) -> str:
+    return "; ".join(f"{k} {short_colors(str(v))}" for k, v in values.items())
+
+
+def pack_styles(styles: Iterable[dict], budget: int) -> str:
+    """A base line with each property's most common value, then per group only what differs from it."""
+    groups = style_groups(styles)
+    votes: Dict[str, Counter] = {}
+    for count, values, _ in groups:
+        for k, v in values.items():
+            votes.setdefault(k, Counter())[str(v)] += count
+    base = {k: c.most_common(1)[0][0] for k, c in votes.items()}
+    lines = []
+    used = 0
+    if groups:
+        lines.append(f"base: {_props(base)}")
+        used = count_tokens(lines[0]) + 1
+        if used > budget:
+            return ""
+    for count, values, examples in groups:
+        diff = {k: v for k, v in values.items() if str(v) != base.get(k)}
+        line = f"{count}× {', '.join(examples)}: {_props(diff) if diff else 'base'}"
+        tokens = count_tokens(line) + 1
+        if used + tokens > budget:
+            continue  # a rarer group may still fit
+        lines.append(line)
+        used += tokens
+    return "\n".join(lines)
+
+
+# ---------------- api ---------------- #
+
+
+def _outline(shape: Any, depth: int) -> str:
+    """A response shape cut to `depth` levels of keys."""
+    if isinstance(shape, dict):
+        if depth <= 0:
+            return "{…}"
+        return "{" + ", ".join(f"{k}: {_outline(v, depth - 1)}" for k, v in shape.items()) + "}"
+    if isinstance(shape, list):
+        return "[" + ", ".join(_outline(s, depth) for s in shape[:1]) + "]"
+    return str(shape)
+
+
+def pack_api(logs: Iterable[dict], budget: int) -> str:
+    store = CaptureStore()
+    try:
+        store.add_page("page", logs)
+        endpoints = endpoint_summary(store, "page")
+    finally:
+        store.close()
+    # shape variants of one endpoint make one line, with the shape seen most
+    merged: Dict[Tuple[str, str], dict] = {}
+    for e in endpoints:
+        m = merged.get((e["method"], e["path"]))
+        if m is None:
+            merged[e["method"], e["path"]] = dict(e)
+        else:
+            m["calls"] += e["calls"]
+            m["query"] = sorted(set(m["query"]) | set(e["query"]))
+    lines = []
+    used = 0
+    for e in sorted(merged.values(), key=lambda e: -e["calls"]):
+        head = f"{e['method']} {e['path']} ×{e['calls']}"
+        if e["query"]:
+            head += " ?" + "&".join(e["query"])
+        # the deepest outline that fits, down to no outline at all
+        for depth in (3, 2, 1, None):
+            line = head if depth is None else f"{head} → {_outline(e['response_shape'], depth)}"
+            tokens = count_tokens(line) + 1
+            if used + tokens <= budget and (depth is None or tokens <= budget // 4):
+                break
+        if used + tokens > budget:
+            continue
+        lines.append(line)
+        used += tokens
+    return "\n".join(lines)
+
+
+# ---------------- snapshot ---------------- #
+
+
+class PackedSnapshot(NamedTuple):
+    html: str
+    styles: str
+    api: str
+    tokens: Dict[str, int]
+
+
+def pack_snapshot(path: Union[str, Path], budget: int = DEFAULT_BUDGET,
+                  shares: Optional[Dict[str, float]] = None) -> PackedSnapshot:
+    """The html, styles and api sections of a snapshot, together within `budget` tokens."""
+    shares = SHARES if shares is None else shares
+    styles = pack_styles(iter_items(path, "computedStyles"), int(budget * shares.get("styles", 0)))
+    api = pack_api(iter_items(path, *NETWORK_LOG_KEYS), int(budget * shares.get("api", 0)))
+    tokens = {"styles": count_tokens(styles), "api": count_tokens(api)}
+    html = pack_html(read_section(path, "html", default=""), budget - tokens["styles"] - tokens["api"])
+    tokens["html"] = count_tokens(html)
+    tokens["total"] = tokens["html"] + tokens["styles"] + tokens["api"]
+    return PackedSnapshot(html, styles, api, tokens)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Print the packed sections of a snapshot.")
+    parser.add_argument("path", help="agent/output/<page>.json or .cap")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET)
+    args = parser.parse_args()
+    packed = pack_snapshot(args.path, args.budget)
+    for name in ("html", "styles", "api"):
+        print(f"===== {name} ({packed.tokens[name]} tokens) =====")
+        print(getattr(packed, name))
+    print(f"===== {packed.tokens['total']} of {args.budget} tokens ({tokenizer_name()}) =====")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,564 @@
+# agent/schema_inference.py
+"""
+Offline inference of backend/api.yml and backend/schema.sql from the
+captured network logs, with no LLM call.
+
+One pass over the logs feeds every API response body (noise is dropped as
+in agent.capture_store) into a TypeInfo per endpoint. Each TypeInfo
+unifies everything observed at one location of the JSON:
+- kinds, including null, and integer widening to number;
+- object properties, with how often each was present, so fields missing
+  from some responses become optional;
+- maps keyed by ids or data, detected as for body shapes;
+- array items;
+- string enums (a few code-like values such as "in_progress", each seen
+  repeatedly) and formats (date-time, date, uuid, uri).
+
+The spec has one path per method + template, with path and query
+parameters and a component schema for the response. The same template
+called on several hosts is one operation: its observations are merged and
+its `servers` lists those hosts. The SQL schema gets
+a table per resource, meaning any object carrying an "id"/"gid". It is
+named after its "resource_type"/"type" value or the key it appears under.
+Scalar fields become columns. A nested resource becomes a foreign key, and
+an array of resources a foreign key back from the child table. Anything
+else is kept as JSON text.
+
+    python -m agent.schema_inference                     # home, projects, tasks -> backend/
+    python -m agent.schema_inference home --out-dir /tmp/spec
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .capture_store import ID, PAGES, SHAPE_KEYS, canonical_json, is_id, noise_reason, url_template
+
+try:
+    import yaml
+except ImportError:
+    yaml = None  # JSON is valid YAML too
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+
+# a string field is an enum when it shows at most ENUM_MAX distinct values
+# over at least ENUM_MIN_SEEN observations
+ENUM_MAX = 8
+ENUM_MIN_SEEN = 4
+RECENT_BODIES = 16
+ID_KEYS = ("gid", "id")
+TYPE_KEYS = ("resource_type", "type")
+
+_FORMATS = [
+    ("date-time", re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?")),
+    ("date", re.compile(r"\d{4}-\d{2}-\d{2}")),
+    ("uuid", re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)),
+    ("uri", re.compile(r"https?://\S+")),
+]
+_ENUM_VALUE = re.compile(r"[a-z][a-z0-9]*([_-][a-z0-9]+)*|[A-Z][A-Z0-9]*(_[A-Z0-9]+)*")
+_SQL_TYPES = {"integer": "INTEGER", "number": "REAL", "boolean": "BOOLEAN", "string": "TEXT"}
+_SQL_FORMATS = {"date-time": "DATETIME", "date": "DATE"}
+
+
+def string_format(value: str) -> Optional[str]:
+    for name, pattern in _FORMATS:
+        if pattern.fullmatch(value):
+            return name
+    return None
+
+
+_KINDS = {type(None): "null", bool: "boolean", int: "integer", float: "number", str: "string",
+          list: "array", dict: "object"}
+
+
+def json_kind(value: Any) -> str:
+    return _KINDS.get(type(value)) or "object"
+
+
+class TypeInfo:
+    """Everything observed at one location of a JSON document."""
+
+    __slots__ = ("seen", "kinds", "objects", "props", "map_values", "items", "values", "formats")
+
+    def __init__(self):
+        self.seen = 0
+        self.kinds: Counter = Counter()
+        self.objects = 0
+        self.props: Dict[str, "TypeInfo"] = {}
+        self.map_values: Optional["TypeInfo"] = None
+        self.items: Optional["TypeInfo"] = None
+        self.values: Optional[Counter] = Counter()  # None once past ENUM_MAX
+        self.formats: Counter = Counter()
+
+    def add(self, value: Any, count: int = 1) -> None:
+        """Observe `value`, `count` times over."""
+        self.seen += count
+        kind = json_kind(value)
+        self.kinds[kind] += count
+        if kind == "object":
+            self.objects += count
+            if len(value) > SHAPE_KEYS or (value and all(is_id(k) for k in value)):
+                if self.map_values is None:
+                    self.map_values = TypeInfo()
+                for item in value.values():
+                    self.map_values.add(item, count)
+            else:
+                for key, item in value.items():
+                    prop = self.props.get(key)
+                    if prop is None:
+                        prop = self.props[key] = TypeInfo()
+                    prop.add(item, count)
+        elif kind == "array":
+            if self.items is None:
+                self.items = TypeInfo()
+            for item in value:
+                self.items.add(item, count)
+        elif kind == "string":
+            self.formats[string_format(value)] += count
+            if self.values is not None:
+                self.values[value] += count
+                if len(self.values) > ENUM_MAX:
+                    self.values = None
+
+    # -- reading the observations back --
+
+    @property
+    def nullable(self) -> bool:
+        return self.kinds["null"] > 0
+
+    def main_kind(self) -> Optional[str]:
+        kinds = {k for k in self.kinds if k != "null"}
+        if kinds == {"integer", "number"}:
+            return "number"
+        return kinds.pop() if len(kinds) == 1 else None
+
+    def required(self) -> List[str]:
+        """Properties present in every object observed here."""
+        return [key for key, prop in self.props.items() if prop.seen == self.objects]
+
+    def string_format(self) -> Optional[str]:
+        if len(self.formats) == 1:
+            return next(iter(self.formats))
+        return None
+
+    def enum(self) -> Optional[List[str]]:
+        strings = self.kinds["string"]
+        if self.values is None or strings < ENUM_MIN_SEEN or len(self.values) == strings:
+            return None
+        if self.string_format() is not None:
+            return None
+        # codes like "in_progress" or "DONE", not names or ids that happen to repeat
+        if not all(_ENUM_VALUE.fullmatch(v) and not is_id(v) for v in self.values):
+            return None
+        return sorted(self.values)
+
+    def single_value(self) -> Optional[str]:
+        if self.values is not None and len(self.values) == 1 and self.main_kind() == "string":
+            return next(iter(self.values))
+        return None
+
+    def id_key(self) -> Optional[str]:
+        """The id property when this is a resource (an object that always carries one)."""
+        if self.main_kind() != "object":
+            return None
+        for key in ID_KEYS:
+            prop = self.props.get(key)
+            if prop is not None and prop.seen == self.objects and prop.main_kind() in ("string", "integer"):
+                return key
+        return None
+
+
+def openapi_schema(info: TypeInfo) -> dict:
+    kind = info.main_kind()
+    schema: Dict[str, Any] = {}
+    if kind is None:
+        kinds = sorted(k for k in info.kinds if k != "null")
+        if kinds:
+            schema["oneOf"] = [{"type": k} for k in kinds]
+    elif kind == "object":
+        schema["type"] = "object"
+        if info.props:
+            schema["properties"] = {key: openapi_schema(prop) for key, prop in info.props.items()}
+            required = info.required()
+            if required:
+                schema["required"] = required
+        if info.map_values is not None:
+            schema["additionalProperties"] = openapi_schema(info.map_values)
+    elif kind == "array":
+        schema["type"] = "array"
+        schema["items"] = openapi_schema(info.items) if info.items is not None and info.items.seen else {}
+    else:
+        schema["type"] = kind
+        if kind == "string":
+            fmt = info.string_format()
+            if fmt is not None:
+                schema["format"] = fmt
+            enum = info.enum()
+            if enum is not None:
+                schema["enum"] = enum
+    if info.nullable:
+        schema["nullable"] = True
+    return schema
+
+
+class EndpointInfo:
+    def __init__(self, method: str, template: str):
+        self.method = method
+        self.template = template
+        self.calls = 0
+        self.hosts: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.query: Dict[str, Counter] = {}
+        self.pages: set = set()
+        self.body = TypeInfo()
+        # the last few distinct bodies with how often each came back, walked
+        # once on eviction: polled endpoints return the same body many times
+        self._recent: "OrderedDict[str, list]" = OrderedDict()
+
+    def add(self, page: str, host: str, status: Any, query: List[Tuple[str, str]], body: Any) -> None:
+        self.calls += 1
+        self.hosts[host] += 1
+        self.pages.add(page)
+        self.statuses[status] += 1
+        for key, value in query:
+            self.query.setdefault(key, Counter())[json_kind(_scalar(value))] += 1
+        if not isinstance(body, (dict, list)):
+            self.body.add(body)
+            return
+        key = canonical_json(body)
+        recent = self._recent.get(key)
+        if recent is not None:
+            recent[1] += 1
+            self._recent.move_to_end(key)
+            return
+        self._recent[key] = [body, 1]
+        if len(self._recent) > RECENT_BODIES:
+            self.body.add(*self._recent.popitem(last=False)[1])
+
+    def flush(self) -> None:
+        while self._recent:
+            self.body.add(*self._recent.popitem(last=False)[1])
+
+
+def _scalar(text: str) -> Any:
+    """A query string value as the JSON scalar it spells, if any."""
+    if re.fullmatch(r"-?\d+", text):
+        return int(text)
+    if text in ("true", "false"):
+        return text == "true"
+    return text
+
+
+class SchemaInference:
+    """Single-pass accumulator: feed it logs with `add`, then emit."""
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, str], EndpointInfo] = {}
+        self.logs = 0
+
+    def add(self, page: str, log: dict) -> None:
+        self.logs += 1
+        url = str(log.get("url") or "")
+        host, template, _ = url_template(url)
+        body = log.get("body")
+        if noise_reason(host, template, body) is not None:
+            return
+        method = str(log.get("method") or "GET").upper()
+        key = (method, template)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = EndpointInfo(method, template)
+        endpoint.add(page, host, log.get("status"), parse_qsl(urlsplit(url).query, keep_blank_values=True), body)
+
+    def add_all(self, page: str, logs: Iterable[dict]) -> None:
+        for log in logs:
+            self.add(page, log)
+
+    def _sorted_endpoints(self) -> List[EndpointInfo]:
+        for e in self.endpoints.values():
+            e.flush()
+        return sorted(self.endpoints.values(), key=lambda e: (e.template, e.method))
+
+    # -- OpenAPI --
+
+    def openapi(self, title: str = "Inferred API") -> dict:
+        hosts = Counter()
+        for e in self.endpoints.values():
+            hosts.update(e.hosts)
+        main_host = hosts.most_common(1)[0][0] if hosts else None
+        paths: Dict[str, dict] = {}
+        schemas: Dict[str, dict] = {}
+        for e in self._sorted_endpoints():
+            path, params = _named_path(e.template)
+            name = _unique(schemas, _schema_name(e.method, e.template))
+            schemas[name] = openapi_schema(e.body)
+            parameters = [
+                {"in": "path", "name": p, "required": True, "schema": {"type": "string"}} for p in params
+            ]
+            for key, kinds in sorted(e.query.items()):
+                kind = kinds.most_common(1)[0][0] if len(kinds) == 1 else "string"
+                parameters.append({
+                    "in": "query", "name": key, "required": sum(kinds.values()) >= e.calls,
+                    "schema": {"type": kind},
+                })
+            status = str(e.statuses.most_common(1)[0][0] or 200)
+            host = e.hosts.most_common(1)[0][0]
+            operation = {
+                "summary": f"{e.method} {host}{e.template}",
+                "description": f"Observed {e.calls} call(s) on {', '.join(sorted(e.pages))}.",
+                "operationId": _unique_operation(paths, e.method, e.template),
+            }
+            if list(e.hosts) != [main_host]:
+                operation["servers"] = [{"url": f"https://{h}"} for h, _ in e.hosts.most_common()]
+            if parameters:
+                operation["parameters"] = parameters
+            operation["responses"] = {
+                status: {
+                    "description": "Observed response",
+                    "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{name}"}}},
+                }
+            }
+            paths.setdefault(path, {})[e.method.lower()] = operation
+        spec = {
+            "openapi": "3.0.3",
+            "info": {"title": title, "version": "1.0.0",
+                     "description": f"Inferred offline from {self.logs} captured requests."},
+        }
+        if hosts:
+            spec["servers"] = [{"url": f"https://{host}"} for host, _ in hosts.most_common()]
+        spec["paths"] = paths
+        spec["components"] = {"schemas": schemas}
+        return spec
+
+    # -- SQL --
+
+    def tables(self) -> Dict[str, "Table"]:
+        tables: Dict[str, Table] = {}
+        for e in self._sorted_endpoints():
+            fallback = _snake(_last_name(e.template)) or "resource"
+            _collect_tables(e.body, fallback, None, tables)
+        return tables
+
+    def schema_sql(self) -> str:
+        tables = self.tables()
+        lines = [
+            "-- backend/schema.sql",
+            f"-- Inferred offline from {self.logs} captured requests by agent.schema_inference.",
+        ]
+        if not tables:
+            lines.append("-- No resources (objects with an id) were observed.")
+        for table in sorted(tables.values(), key=lambda t: t.name):
+            lines.append("")
+            lines.extend(table.create_sql())
+        return "\n".join(lines) + "\n"
+
+
+class Table:
+    def __init__(self, name: str, id_key: str):
+        self.name = name
+        self.id_key = id_key
+        self.id_type = "TEXT"
+        self.columns: Dict[str, List[Any]] = {}  # column -> [sql type, not null, json]
+        self.references: Dict[str, "Table"] = {}  # column -> referenced table
+
+    def add_column(self, column: str, sql_type: Optional[str], not_null: bool, is_json: bool = False) -> None:
+        """`sql_type` is None when only nulls were seen; another source may know better."""
+        current = self.columns.get(column)
+        if current is None:
+            self.columns[column] = [sql_type, not_null, is_json]
+            return
+        if current[0] is None:
+            current[0] = sql_type
+        elif sql_type is not None and current[0] != sql_type:
+            current[0] = "TEXT"
+        current[1] = current[1] and not_null
+        current[2] = current[2] or is_json
+
+    def create_sql(self) -> List[str]:
+        definitions = [(f"{_snake(self.id_key):<24} {self.id_type} PRIMARY KEY", "")]
+        for column in sorted(self.columns):
+            if column == _snake(self.id_key):
+                continue
+            sql_type, not_null, is_json = self.columns[column]
+            if sql_type is None and f"{column}_id" in self.references:
+                continue  # an always-null relation that other sources show as a foreign key
+            definition = f"{column:<24} {sql_type or 'TEXT'}{' NOT NULL' if not_null else ''}"
+            if column in self.references:
+                target = self.references[column]
+                definition += f" REFERENCES {target.name}({_snake(target.id_key)})"
+            definitions.append((definition, "  -- JSON" if is_json else ""))
+        lines = [f"CREATE TABLE {self.name} ("]
+        for i, (definition, comment) in enumerate(definitions):
+            comma = "," if i < len(definitions) - 1 else ""
+            lines.append(f"    {definition}{comma}{comment}")
+        lines.append(");")
+        for column in sorted(self.references):
+            lines.append(f"CREATE INDEX idx_{self.name}_{column} ON {self.name}({column});")
+        return lines
+
+
+def _collect_tables(info: TypeInfo, name: str, parent: Optional[Table], tables: Dict[str, Table]) -> Optional[Table]:
+    """Register the resources under `info`; returns the table `info` itself maps to, if any."""
+    kind = info.main_kind()
+    if kind == "array" and info.items is not None:
+        child = _collect_tables(info.items, name, None, tables)
+        if child is not None and parent is not None:
+            column = f"{_singular(parent.name)}_id"
+            child.add_column(column, parent.id_type, False)
+            child.references[column] = parent
+        return None
+    if kind != "object":
+        return None
+    if info.map_values is not None:
+        _collect_tables(info.map_values, name, parent, tables)
+    id_key = info.id_key()
+    table = None
+    if id_key is not None:
+        type_info = next((info.props[k] for k in TYPE_KEYS if k in info.props), None)
+        resource = type_info.single_value() if type_info is not None else None
+        table_name = _plural(_snake(resource or name))
+        table = tables.get(table_name)
+        if table is None:
+            table = tables[table_name] = Table(table_name, id_key)
+        if info.props[id_key].main_kind() == "integer":
+            table.id_type = "INTEGER"
+    for key, prop in info.props.items():
+        prop_kind = prop.main_kind()
+        if prop_kind == "object" and prop.id_key() is not None:
+            child = _collect_tables(prop, key, table, tables)
+            if table is not None and child is not None:
+                column = f"{_snake(key)}_id"
+                table.add_column(column, child.id_type, prop.seen == info.objects and not prop.nullable)
+                table.references[column] = child
+            continue
+        if prop_kind in ("object", "array"):
+            _collect_tables(prop, key, table, tables)
+        if table is None:
+            continue
+        column = _snake(key)
+        not_null = prop.seen == info.objects and not prop.nullable
+        if prop_kind in _SQL_TYPES:
+            sql_type = _SQL_FORMATS.get(prop.string_format() or "", _SQL_TYPES[prop_kind]) \
+                if prop_kind == "string" else _SQL_TYPES[prop_kind]
+            table.add_column(column, sql_type, not_null)
+        elif prop_kind is None and not prop.kinds.keys() - {"null"}:
+            table.add_column(column, None, False)
+        elif not (prop_kind == "array" and prop.items is not None and prop.items.id_key() is not None):
+            table.add_column(column, "TEXT", not_null, is_json=True)
+    return table
+
+
+# -- naming --
+
+
+def _snake(name: str) -> str:
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    name = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _plural(name: str) -> str:
+    if not name or name.endswith("s"):
+        return name
+    return name[:-1] + "ies" if name.endswith("y") and name[-2:-1] not in "aeiou" else name + "s"
+
+
+def _singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    return name[:-1] if name.endswith("s") and not name.endswith("ss") else name
+
+
+def _last_name(template: str) -> str:
+    names = [s for s in template.split("/") if s and s != ID and s != "-"]
+    return names[-1] if names else ""
+
+
+def _named_path(template: str) -> Tuple[str, List[str]]:
+    """The template with each {id} named after the segment before it: /projects/{project_id}."""
+    segments, params = template.split("/"), []
+    for i, segment in enumerate(segments):
+        if segment != ID:
+            continue
+        previous = next((s for s in reversed(segments[:i]) if s and s != ID and s != "-"), "")
+        base = f"{_singular(_snake(previous))}_id" if previous else "id"
+        name, n = base, 2
+        while name in params:
+            name, n = f"{base}{n}", n + 1
+        params.append(name)
+        segments[i] = "{" + name + "}"
+    return "/".join(segments), params
+
+
+def _schema_name(method: str, template: str) -> str:
+    words = [w for s in template.split("/") if s != ID for w in re.split(r"[^A-Za-z0-9]+", s) if w]
+    name = "".join(w[:1].upper() + w[1:] for w in words) or "Root"
+    return (name if method == "GET" else method.title() + name) + "Response"
+
+
+def _unique(existing: dict, name: str) -> str:
+    candidate, n = name, 2
+    while candidate in existing:
+        candidate, n = f"{name}{n}", n + 1
+    return candidate
+
+
+def _unique_operation(paths: Dict[str, dict], method: str, template: str) -> str:
+    used = {op["operationId"] for ops in paths.values() for op in ops.values()}
+    base = f"{method.lower()}_{_snake(template.replace(ID, 'by_id')) or 'root'}"
+    candidate, n = base, 2
+    while candidate in used:
+        candidate, n = f"{base}_{n}", n + 1
+    return candidate
+
+
+def dump_yaml(spec: dict) -> str:
+    if yaml is not None:
+        return yaml.safe_dump(spec, sort_keys=False, allow_unicode=True)
+    return json.dumps(spec, indent=2, ensure_ascii=False) + "\n"
+
+
+def infer(pages: Iterable[str] = PAGES, load=None) -> SchemaInference:
+    """Run the inference over the pages' captured logs (pages without a capture are skipped)."""
+    if load is None:
+        from .backend_agent import iter_network_logs as load
+    inference = SchemaInference()
+    for page in pages:
+        try:
+            logs = load(page)
+        except FileNotFoundError:
+            continue
+        inference.add_all(page, logs)
+    return inference
+
+
+def write_backend_spec(inference: SchemaInference, out_dir: Path = BACKEND_DIR) -> Tuple[Path, Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    api = out_dir / "api.yml"
+    schema = out_dir / "schema.sql"
+    api.write_text(dump_yaml(inference.openapi()), encoding="utf-8")
+    schema.write_text(inference.schema_sql(), encoding="utf-8")
+    return api, schema
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pages", nargs="*", default=list(PAGES))
+    parser.add_argument("--out-dir", default=str(BACKEND_DIR))
+    args = parser.parse_args()
+    started = time.perf_counter()
+    inference = infer(args.pages)
+    api, schema = write_backend_spec(inference, Path(args.out_dir))
+    print(f"[schema_inference] {inference.logs} requests -> {len(inference.endpoints)} endpoints, "
+          f"{len(inference.tables())} tables in {time.perf_counter() - started:.2f}s: wrote {api} and {schema}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
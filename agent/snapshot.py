@@ -0,0 +1,218 @@
+# agent/snapshot.py
+"""
+Streaming reader for the snapshot files playwright_scraper.ts writes to
+agent/output/<page>.json:
+
+    {"html": "...", "computedStyles": [...], "networkLogs": [...]}
+
+The agents only ever need one section at a time, and a capture of a busy
+page runs to hundreds of MB (every response body is kept). Instead of
+`json.load`-ing the whole file, the reader walks the top-level object
+and decodes just the requested section. It skips the other sections
+value by value. Array sections are yielded one element at a time, so
+peak memory stays around the size of the largest single element.
+
+    for log in iter_items(path, "networkLogs"):
+        ...
+    html = read_section(path, "html")
+
+Each value is decoded with the C decoder (`JSONDecoder.raw_decode`) from
+a text buffer that grows only while a value is incomplete.
+
+The same functions read the compact .cap files of agent.capture; the
+format is detected from the file itself. `snapshot_path` finds a page's
+snapshot, preferring the .cap form.
+"""
+import json
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple, Union
+
+from . import capture
+
+CHUNK_SIZE = 4 << 20
+OUTPUT_DIR = Path(__file__).with_name("output")
+# the names the network log section goes by
+NETWORK_LOG_KEYS = ("networkLogs", "network_logs", "network")
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def snapshot_path(page: str, directory: Optional[Path] = None) -> Path:
+    """<directory>/<page>.cap when it has been converted, else <page>.json (directory: agent/output)."""
+    directory = directory or OUTPUT_DIR
+    cap = directory / f"{page}.cap"
+    if cap.exists():
+        return cap
+    p = directory / f"{page}.json"
+    if not p.exists():
+        raise FileNotFoundError(
+            f"{p} not found. Run the scraper first:\n"
+            "  npx ts-node agent/playwright_scraper.ts"
+        )
+    return p
+
+
+class _Reader:
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it ("" at the end)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            found = repr(c) if c else "end of file"
+            raise SnapshotError(f"Expected one of {chars!r}, found {found}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        """Decode the next JSON value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # double the pending text, so a large value still costs linear time
+                if not self._fill(max(self.chunk_size, len(self.buf) - self.pos)):
+                    raise SnapshotError(f"Invalid or truncated snapshot: {e}") from None
+                continue
+            # a number could continue past the buffer
+            if end == len(self.buf) and self._fill(self.chunk_size):
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+    def skip(self) -> None:
+        if self.peek() == "[":
+            for _ in self.items():
+                pass
+        else:
+            self.value()
+
+    def keys(self) -> Iterator[str]:
+        """Top-level keys; the caller consumes each key's value before the next one."""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+
+def _open(path: Union[str, Path]):
+    return open(path, encoding="utf-8")
+
+
+def _find(reader: _Reader, keys) -> Optional[str]:
+    for key in reader.keys():
+        if key in keys:
+            return key
+        reader.skip()
+    return None
+
+
+def iter_sections(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, bool, Any]]:
+    """
+    (name, is_list, value) per top-level key, in one pass. A list value is an
+    iterator over its elements; whatever the caller leaves unread is skipped.
+    """
+    with _open(path) as f:
+        reader = _Reader(f, chunk_size)
+        for key in reader.keys():
+            if reader.peek() == "[":
+                items = reader.items()
+                yield key, True, items
+                for _ in items:
+                    pass
+            else:
+                yield key, False, reader.value()
+
+
+def iter_items(path: Union[str, Path], *keys: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of the first top-level array named by any of `keys`,
+    one at a time. Yields nothing if no such key exists or its value is not
+    an array.
+    """
+    if capture.is_capture(path):
+        yield from capture.iter_items(path, *keys)
+        return
+    with _open(path) as f:
+        reader = _Reader(f, chunk_size)
+        if _find(reader, keys) is None or reader.peek() != "[":
+            return
+        yield from reader.items()
+
+
+def read_section(path: Union[str, Path], *keys: str, default: Any = None,
+                 chunk_size: int = CHUNK_SIZE) -> Any:
+    """The value of the first top-level key among `keys` in the file, else `default`."""
+    if capture.is_capture(path):
+        return capture.read_section(path, *keys, default=default)
+    with _open(path) as f:
+        reader = _Reader(f, chunk_size)
+        if _find(reader, keys) is None:
+            return default
+        if reader.peek() == "[":
+            return list(reader.items())
+        return reader.value()
+
+
+def read_sections(path: Union[str, Path], *keys: str, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    The given top-level sections, or all of them when no keys are given, in
+    one pass; absent keys are left out.
+    """
+    if capture.is_capture(path):
+        return capture.read_sections(path, *keys)
+    found = {}
+    with _open(path) as f:
+        reader = _Reader(f, chunk_size)
+        for key in reader.keys():
+            if not keys or key in keys:
+                found[key] = list(reader.items()) if reader.peek() == "[" else reader.value()
+            else:
+                reader.skip()
+    return found
@@ -0,0 +1,59 @@
+# agent/tests/test_capture.py
+import json
+from pathlib import Path
+import pytest
+from agent import backend_agent, capture, frontend_agent, snapshot
+from agent.snapshot import iter_items, read_section, read_sections
+
+HOME = Path(__file__).resolve().parents[1] / "output" / "home.json"
+CODECS = ["zlib", pytest.param("zstd", marks=pytest.mark.skipif(capture.zstandard is None, reason="no zstandard"))]
+
+@pytest.fixture(scope="module")
+def home():
+    with open(HOME, encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip_of_recorded_snapshot(tmp_path, home, codec, monkeypatch):
+    # small reads put record boundaries everywhere
+    monkeypatch.setattr(capture, "_READ_SIZE", 1000)
+    out = capture.convert(HOME, tmp_path / "home.cap", codec=codec)
+    assert capture.is_capture(out) and not capture.is_capture(HOME)
+    assert out.stat().st_size < HOME.stat().st_size / 10
+    everything = read_sections(out)
+    assert json.dumps(everything) == json.dumps(home)
+    assert read_section(out, "html") == home["html"]
+    assert list(iter_items(out, "networkLogs")) == home["networkLogs"]
+    assert list(iter_items(out, "html")) == []
+    assert read_section(out, "nope", default=[]) == []
+
+def test_headers_and_bodies_are_stored_once(tmp_path):
+    body = {"data": [{"gid": "1", "name": "x" * 1000}]}
+    headers = {"accept": "application/json"}
+    logs = [{"url": f"/api/{i}", "method": "GET", "status": 200, "headers": headers, "body": body}
+            for i in range(50)]
+    logs.append({"url": "/empty", "method": "POST", "status": 204, "headers": {}, "body": None})
+    out = tmp_path / "dup.cap"
+    capture.write_capture(out, {"html": "", "networkLogs": logs})
+    with open(out, "rb") as f:
+        kinds = [chr(kind) for kind, _ in capture._records(f)]
+    assert kinds.count("B") == 1 and kinds.count("H") == 2 and kinds.count("L") == 51
+    read = list(iter_items(out, "networkLogs"))
+    assert read == logs
+    read[0]["body"]["data"].clear()
+    assert read[1]["body"] == body
+
+def test_truncated_capture(tmp_path):
+    out = tmp_path / "t.cap"
+    capture.write_capture(out, {"networkLogs": [{"url": "/a", "body": {"n": 1}}] * 100}, codec="zlib")
+    out.write_bytes(out.read_bytes()[:-8])
+    with pytest.raises(capture.CaptureError, match="Truncated"):
+        list(iter_items(out, "networkLogs"))
+
+def test_agents_prefer_the_capture(tmp_path, monkeypatch, home):
+    capture.convert(HOME, tmp_path / "home.cap")
+    monkeypatch.setattr(snapshot, "OUTPUT_DIR", tmp_path)
+    assert backend_agent.load_network_logs("home", limit=5) == home["networkLogs"][:5]
+    assert frontend_agent.load_page_snapshot("home", "html") == {"html": home["html"]}
+    with pytest.raises(FileNotFoundError):
+        backend_agent.load_network_logs("projects")
@@ -0,0 +1,97 @@
+# agent/tests/test_capture_store.py
+from pathlib import Path
+import pytest
+from agent import backend_agent, snapshot
+from agent.capture_store import CaptureStore, body_shape, canonical_json, endpoint_summary, noise_reason, url_template
+from agent.prompt_packer import pack_api
+from agent.schema_inference import SchemaInference
+from agent.snapshot import iter_items
+
+HOME = Path(__file__).resolve().parents[1] / "output" / "home.json"
+
+@pytest.fixture
+def store():
+    store = CaptureStore()
+    yield store
+    store.close()
+
+def test_url_template():
+    assert url_template("https://app.asana.com/-/llm_get_knowledge_base_filter/1211954463668463?db_id=1&a=") == (
+        "app.asana.com", "/-/llm_get_knowledge_base_filter/{id}", ["a", "db_id"])
+    assert url_template("https://cdn.example.com/consent/6d3cfbb6-bd53-462f-aac5-4fafed745589/en.json")[1] == \
+        "/consent/{id}/en.json"
+    assert url_template("https://cdp.example.com/v1/projects/0L3wyNgRX9DyxJxrAMErLXGEHKFUbnWe/settings")[1] == \
+        "/v1/projects/{id}/settings"
+    assert url_template("https://app.asana.com/0/home")[1] == "/{id}/home"
+    assert url_template("https://app.asana.com/app/asana/-/start_session")[1] == "/app/asana/-/start_session"
+    assert url_template("blob:https://app.asana.com/79ef62e0-6151-48d8-9b1f-6683a2d857e9")[:2] == ("app.asana.com", "/{id}")
+
+def test_noise_reason():
+    assert noise_reason("www.google-analytics.com", "/collect", {"a": 1}) == "telemetry"
+    assert noise_reason("cdn.example.com", "/bundle.js", None) == "static"
+    assert noise_reason("app.asana.com", "/-/page_load_cookies", None) == "no-json"
+    assert noise_reason("app.asana.com", "/api/tasks", []) is None
+
+def test_body_shape():
+    body = {"data": [{"gid": "1", "done": False, "n": 2}, {"gid": "2", "done": True, "n": 2.5}],
+            "by_id": {"1211954463668463": {"name": "a"}, "1211954463668464": {"name": "b"}},
+            "flags": {f"flag_{i}": True for i in range(100)}, "next": None}
+    assert body_shape(body) == {
+        "by_id": {"{id}": {"name": "string"}},
+        "data": [{"done": "boolean", "gid": "string", "n": "number"}],
+        "flags": {"{key}": "boolean"},
+        "next": "null",
+    }
+
+def test_integers_beyond_64_bits(store):
+    logs = [{"url": "https://a.com/api/x", "body": {"n": 12345678901234567890123}}]
+    assert canonical_json(logs[0]["body"]) == '{"n":12345678901234567890123}'
+    assert store.add_page("x", logs) == 1
+    inference = SchemaInference()
+    inference.add_all("x", logs)
+    assert "/api/x" in inference.openapi()["paths"]
+    assert "/api/x" in pack_api(logs, 500)
+
+def test_recorded_home_capture(store):
+    assert store.add_page("home", iter_items(HOME, "networkLogs")) == 341
+    api = store.endpoints(page="home")
+    paths = {e.template for e in api}
+    assert "/-/llm_get_knowledge_base_filter/{id}" in paths and "/app/asana/-/experiments" in paths
+    assert all(e.noise is None and e.pages == ["home"] for e in api)
+    # everything else is assets, telemetry or non-JSON
+    stats = store.stats()
+    assert stats["entries"] == 341 and stats["api_entries"] == sum(e.calls for e in api) < 30
+    assert len(store.endpoints(include_noise=True)) == stats["endpoints"]
+
+    found = store.lookup("GET", "https://app.asana.com/-/llm_get_knowledge_base_filter/42")
+    assert [e.template for e in found] == ["/-/llm_get_knowledge_base_filter/{id}"]
+    assert "db_id" in found[0].query_keys
+    assert store.sample(found[0].id) is not None
+    assert store.lookup("DELETE", "https://app.asana.com/-/llm_get_knowledge_base_filter/42") == []
+
+    # indexing the page again replaces it
+    store.add_page("home", iter_items(HOME, "networkLogs"))
+    assert store.stats() == stats
+    summary = endpoint_summary(store, "home")
+    assert [s["path"] for s in summary] == [e.template for e in api]
+    assert "sample_body" not in summary[0] and "sample_body" in endpoint_summary(store, "home", samples=True)[0]
+
+def test_dedup_by_method_template_and_shape(store):
+    def log(url, body, method="GET"):
+        return {"url": url, "method": method, "status": 200, "headers": {}, "body": body}
+    store.add_page("p", [
+        log("https://api.test/tasks/1", {"gid": "1", "name": "a"}),
+        log("https://api.test/tasks/2", {"gid": "2", "name": "b"}),
+        log("https://api.test/tasks/3", {"errors": [{"message": "x"}]}),
+        log("https://api.test/tasks/3", {"gid": "3", "name": "c"}, method="PUT"),
+    ])
+    store.add_page("q", [log("https://api.test/tasks/9", {"gid": "9", "name": "z"})])
+    calls = sorted((e.method, e.calls, tuple(e.pages)) for e in store.endpoints())
+    assert calls == [("GET", 1, ("p",)), ("GET", 3, ("p", "q")), ("PUT", 1, ("p",))]
+    assert [e.calls for e in store.endpoints(page="q")] == [3]
+
+def test_backend_agent_indexes_available_pages(tmp_path, monkeypatch):
+    (tmp_path / "home.json").write_bytes(HOME.read_bytes())
+    monkeypatch.setattr(snapshot, "OUTPUT_DIR", tmp_path)
+    store = backend_agent.index_network_logs(["home"])
+    assert store.stats()["api_endpoints"] == len(store.endpoints(page="home"))
@@ -0,0 +1,111 @@
+# agent/tests/test_llm_cache.py
+import os
+from agent import backend_agent, frontend_agent, llm_cache, llm_client
+from agent.llm_cache import CachedClient, LLMCache, cached
+
+class StubResponses:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def create(self, **request):
+        self.calls.append(request)
+        return llm_cache.TextResponse(self.reply(request))
+
+class StubClient:
+    """Stands in for openai.OpenAI: counts calls and answers from `reply`."""
+
+    def __init__(self, reply=lambda request: f"reply to {request['input']}", api_key=None):
+        self.responses = StubResponses(reply)
+        self.models = "passthrough"
+
+def ask(client, **request):
+    text = client.responses.create(**request).output[0].content[0].text
+    client.accept(request, text)
+    return text
+
+def test_hits_after_first_call(tmp_path):
+    stub = StubClient()
+    client = cached(stub, LLMCache(tmp_path))
+    texts = [ask(client, model="m", input=p) for p in ["a", "b", "a", "a"]]
+    assert texts == ["reply to a", "reply to b", "reply to a", "reply to a"]
+    assert len(stub.responses.calls) == 2
+    assert (client.cache.hits, client.cache.misses) == (2, 2)
+    assert client.models == "passthrough"
+    # a new process sees the same entries
+    again = cached(StubClient(), LLMCache(tmp_path))
+    again.responses.create(model="m", input="b")
+    assert again.cache.hits == 1 and again.cache.stats()["entries"] == 2
+    assert "1 hit, 0 misses, 2 entries" in again.cache.report()
+
+def test_key_covers_every_argument(tmp_path):
+    stub = StubClient()
+    client = cached(stub, LLMCache(tmp_path))
+    ask(client, model="m", input="a")
+    ask(client, model="other", input="a")
+    ask(client, model="m", input="a", temperature=0)
+    ask(client, model="m", input=[{"role": "user", "content": "a"}])
+    assert len(stub.responses.calls) == 4
+    assert llm_cache.cache_key({"model": "m", "input": "a"}) == llm_cache.cache_key({"input": "a", "model": "m"})
+
+def test_only_accepted_answers_are_stored(tmp_path):
+    stub = StubClient()
+    client = cached(stub, LLMCache(tmp_path))
+    client.responses.create(model="m", input="a")  # e.g. failed to parse, never accepted
+    assert ask(client, model="m", input="a") == "reply to a"
+    ask(client, model="m", input="a")
+    assert len(stub.responses.calls) == 2
+    assert client.cache.stats()["entries"] == 1
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(tmp_path, max_bytes=10_000)
+    for n in range(3):
+        cache.put({"input": n}, "x" * 3000)
+        path = cache._path(llm_cache.cache_key({"input": n}))
+        os.utime(path, (1000 + n, 1000 + n))
+    assert cache.get({"input": 0}) is not None  # now the most recently used
+    cache.put({"input": 3}, "x" * 3000)
+    assert cache.get({"input": 1}) is None
+    assert all(cache.get({"input": n}) is not None for n in (0, 2, 3))
+    assert cache.stats()["bytes"] <= 10_000
+    assert cache.evict(0) == 3 and cache.stats()["entries"] == 0
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = LLMCache(tmp_path)
+    cache.put({"input": "a"}, "text")
+    cache._path(llm_cache.cache_key({"input": "a"})).write_text("{not json", encoding="utf-8")
+    assert cache.get({"input": "a"}) is None and cache.misses == 1
+
+def test_disabled_returns_the_client(monkeypatch):
+    monkeypatch.setattr(llm_cache.settings, "llm_cache", False)
+    stub = StubClient()
+    assert cached(stub) is stub
+
+def test_agents_reuse_responses(tmp_path, monkeypatch, capsys):
+    clients = []
+
+    def reply(request):
+        if isinstance(request["input"], list):
+            return "---OPENAPI---\nopenapi: 3.0.0\n---SCHEMA_SQL---\nCREATE TABLE t (id INTEGER);"
+        return "export default function Page() { return null; }"
+
+    def make_client(api_key):
+        clients.append(StubClient(reply))
+        return clients[-1]
+
+    (tmp_path / "app").mkdir()
+    monkeypatch.setattr(llm_cache.settings, "openai_api_key", "test")
+    monkeypatch.setattr(llm_cache.settings, "llm_cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(llm_client, "OpenAI", make_client)
+    monkeypatch.setattr(backend_agent, "PAGES", ("home",))  # the one capture in the repo
+    monkeypatch.setattr(backend_agent, "BACKEND_DIR", tmp_path / "backend")
+    monkeypatch.setattr(frontend_agent, "FRONTEND_APP", tmp_path / "app")
+
+    for _ in range(2):
+        backend_agent.generate_backend_with_llm()
+        frontend_agent.generate_home_page_llm()
+    assert [len(c.responses.calls) for c in clients] == [1, 1, 0, 0]
+    assert (tmp_path / "backend" / "schema.sql").read_text(encoding="utf-8") == "CREATE TABLE t (id INTEGER);\n"
+    assert "return null" in (tmp_path / "app" / "page.tsx").read_text(encoding="utf-8")
+    out = capsys.readouterr().out
+    assert out.count("LLM cache: 0 hits, 1 miss,") == 2 and out.count("LLM cache: 1 hit, 0 misses,") == 2
@@ -0,0 +1,101 @@
+# agent/tests/test_pipeline.py
+import threading
+from pathlib import Path
+import pytest
+from agent import llm_cache, llm_client, pipeline
+from agent.llm_client import StubClient, StubError
+
+HOME = Path(__file__).resolve().parents[1] / "output" / "home.json"
+
+@pytest.fixture()
+def snapshots(tmp_path):
+    directory = tmp_path / "snapshots"
+    directory.mkdir()
+    for page in ("home", "projects"):
+        (directory / f"{page}.json").symlink_to(HOME)
+    return directory
+
+def dirs(tmp_path, snapshots):
+    return {"snapshot_dir": snapshots, "backend_dir": tmp_path / "backend", "app_dir": tmp_path / "app"}
+
+class CountingStub(StubClient):
+    """Records how many calls were in flight at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def answer(self, request):
+        with self._count_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super().answer(request)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+
+def test_fans_out_pages_and_artifacts(tmp_path, snapshots):
+    stub = CountingStub(latency=0.3)
+    report = pipeline.run(["home", "projects", "tasks"], stub, concurrency=4, **dirs(tmp_path, snapshots))
+    assert report.skipped.keys() == {"tasks"} and not report.errors
+    assert set(report.calls) == {"backend", "page:home", "page:projects"}
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in report.written) == [
+        "app/page.tsx", "app/projects/page.tsx", "backend/api.yml", "backend/schema.sql",
+    ]
+    assert "export default function Page" in (tmp_path / "app" / "projects" / "page.tsx").read_text(encoding="utf-8")
+    # all three calls were in flight at once; timing is left to `python -m agent.pipeline --compare`
+    assert stub.peak == 3
+    assert set(report.stages) == {"prompts", "llm", "write"}
+    assert "total" in report.lines()[-1]
+
+def test_concurrency_is_bounded(tmp_path, snapshots):
+    stub = CountingStub(latency=0.2)
+    report = pipeline.run(["home", "projects"], stub, concurrency=1, **dirs(tmp_path, snapshots))
+    assert stub.peak == 1 and stub.calls == 3
+    # a lower bound only: three sequential sleeps can take longer, never less
+    assert report.stages["llm"] >= 0.6
+
+def test_transient_failures_are_retried(tmp_path, snapshots):
+    stub = StubClient(failures=2)
+    report = pipeline.run(["home"], stub, concurrency=1, retries=3, backoff=0.01, **dirs(tmp_path, snapshots))
+    assert not report.errors and stub.calls == 4
+    # a job backing off frees its slot, so which job hit the failures varies
+    assert sum(attempts for attempts, _ in report.calls.values()) == 4
+    assert "retr" in "\n".join(report.lines())
+
+def test_failed_job_does_not_stop_the_others(tmp_path, snapshots):
+    stub = StubClient(failures=1)
+    report = pipeline.run(["home"], stub, concurrency=1, retries=0, **dirs(tmp_path, snapshots))
+    assert isinstance(report.errors["backend"], StubError)
+    assert [p.name for p in report.written] == ["page.tsx"]
+
+def test_only_written_answers_are_cached(tmp_path, snapshots):
+    class NoMarkers(StubClient):
+        def answer(self, request):
+            super().answer(request)
+            return llm_cache.TextResponse("no markers here")
+
+    stub = NoMarkers()
+    client = llm_cache.cached(stub, llm_cache.LLMCache(tmp_path / "cache"))
+    for _ in range(2):
+        report = pipeline.run(["home"], client, **dirs(tmp_path, snapshots))
+        assert isinstance(report.errors["backend"], RuntimeError)
+    # the page is accepted and replayed, the unparsable spec is asked again
+    assert stub.calls == 3
+    assert client.cache.stats()["entries"] == 1
+
+def test_create_retries_with_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm_client.time, "sleep", delays.append)
+    stub = StubClient(failures=2)
+    assert "OPENAPI" in llm_client.create(stub, {"input": "---OPENAPI---"}, retries=2, backoff=1.0)
+    backoffs = [d for d in delays if d]  # the rest is the stub's zero latency
+    assert len(backoffs) == 2 and 0.5 <= backoffs[0] < 1.0 and 1.0 <= backoffs[1] < 2.0
+    with pytest.raises(StubError):
+        llm_client.create(StubClient(failures=5), {"input": "x"}, retries=1, backoff=0.0)
+
+def test_stub_setting_skips_openai_and_cache(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "llm_stub", True)
+    assert isinstance(llm_client.make_client(), StubClient)
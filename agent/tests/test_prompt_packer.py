@@ -0,0 +1,113 @@
+# agent/tests/test_prompt_packer.py
+from pathlib import Path
+import pytest
+from agent import bench_prompt_packer, frontend_agent, prompt_packer
+from agent.prompt_packer import (count_tokens, estimate_tokens, pack_api, pack_html, pack_snapshot, pack_styles,
+                                 short_colors)
+from agent.snapshot import iter_items
+
+HOME = Path(__file__).resolve().parents[1] / "output" / "home.json"
+FIXTURES = Path(__file__).with_name("fixtures")
+
+PAGE = """<!DOCTYPE html><html><head><title>T</title><script>var big = "x";</script>
+<style>.a{color:red}</style><link rel="stylesheet" href="a.css"><meta charset="utf-8"></head>
+<body class="Theme Theme--dark"><div class="ToastGroup" data-testid="Toasts"></div><div class="Empty"></div>
+<nav aria-label="Sidebar"><a href="/home" class="NavItem NavItem--active Highlight Extra">Home</a>
+<svg class="Icon" data-testid="HomeIcon"><path d="M0 0L10 10"/></svg></nav>
+<main><h1 id="title">My tasks</h1><p>Unclosed paragraph <p>another one<ul><li>First task</li><li>Second task</ul>
+<div role="button" aria-label="Add task" style="color: red" onclick="go()">Add task</div></main>
+<script>tracking()</script></body></html>"""
+
+def test_estimator():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("the quick brown fox") == 4
+    assert estimate_tokens('<div class="Foo">') == 6
+    text = HOME.read_text(encoding="utf-8")[:20000]
+    # about what BPE gives for markup: 3 to 4 characters per token
+    assert 2.5 < len(text) / estimate_tokens(text) < 4.5
+
+def test_count_tokens_falls_back(monkeypatch):
+    monkeypatch.setattr(prompt_packer, "tiktoken", None)
+    prompt_packer._encoding.cache_clear()
+    try:
+        assert count_tokens("hello world") == estimate_tokens("hello world")
+        assert prompt_packer.tokenizer_name() == "estimate"
+    finally:
+        prompt_packer._encoding.cache_clear()
+
+def test_html_keeps_the_visible_tree():
+    html = pack_html(PAGE, 10_000)
+    assert html.startswith('<body class="Theme">') and html.endswith("</body>")
+    for gone in ("script", "style", "tracking", "<head", "<path", "onclick", "a.css", "NavItem--active", "Extra"):
+        assert gone not in html
+    assert '<a href="/home" class="NavItem Highlight">Home</a>' in html
+    assert '<svg class="Icon" data-testid="HomeIcon"/>' in html
+    assert '<h1 id="title">My tasks</h1>' in html
+    assert '<div role="button" aria-label="Add task">Add task</div>' in html
+    assert "<li>Second task</li></ul>" in html and "another one" in html
+    # an element with nothing to show is dropped whole, not marked
+    assert "Empty" not in html and "…" not in html
+
+def test_html_fits_the_budget_best_first():
+    full = count_tokens(pack_html(PAGE, 10_000))
+    small = pack_html(PAGE, 50)
+    assert count_tokens(small) <= 50 < full
+    assert "My tasks" in small and "…" in small
+    assert pack_html(PAGE, 0) == ""
+
+def test_html_budget_is_a_hard_cap(monkeypatch):
+    # a tokenizer that puts anything but a short text just over budget, whatever the estimate says
+    strict = lambda text: 101 if estimate_tokens(text) > 20 else estimate_tokens(text)
+    monkeypatch.setattr(prompt_packer, "count_tokens", strict)
+    assert strict(pack_html(PAGE, 100)) <= 100
+
+def test_html_without_recursion_limits():
+    deep = "<div>" * 5000 + "deep text" + "</div>" * 5000
+    assert "deep text" in pack_html(deep, 100_000)
+    assert count_tokens(pack_html(deep, 500)) <= 500
+
+def test_styles_are_grouped_against_a_base():
+    styles = [{"tag": "HEAD", "styles": {"color": "rgb(1, 1, 1)"}}]
+    styles += [{"tag": "DIV", "className": f"Card Card--x{n}", "styles": {"color": "rgb(0, 0, 0)", "fontSize": "14px"}}
+               for n in range(5)]
+    styles += [{"tag": "H1", "className": {"baseVal": "svg"}, "styles": {"color": "rgb(59, 232, 176)", "fontSize": "20px"}}]
+    assert pack_styles(styles, 1000).splitlines() == [
+        "base: color #000000; fontSize 14px",
+        "5× div.Card: base",
+        "1× h1: color #3be8b0; fontSize 20px",
+    ]
+    assert pack_styles(styles, 5) == ""
+    assert short_colors("rgba(0, 0, 0, 0) rgba(255, 0, 0, 0.5)") == "transparent #ff0000/0.5"
+
+def test_api_lists_endpoints_most_called_first():
+    logs = list(iter_items(FIXTURES / "tasks.json", "networkLogs"))
+    lines = pack_api(logs, 1000).splitlines()
+    # variants of an endpoint with different response shapes share a line
+    assert [line.split(" →")[0] for line in lines] == [
+        "GET /api/1.0/tasks ×2 ?limit&offset&workspace", "GET /api/1.0/tasks/{id} ×2",
+        "GET /api/1.0/projects/{id}/tasks ×1 ?opt_pretty", "PUT /api/1.0/tasks/{id} ×1", "GET /api/1.0/users/me ×1",
+    ]
+    assert not any("google" in line or ".js" in line for line in lines)
+    assert len(pack_api(logs, 60).splitlines()) < len(lines)
+
+@pytest.mark.parametrize("budget", [300, 1000, 3000])
+def test_snapshot_within_budget(budget):
+    packed = pack_snapshot(HOME, budget)
+    assert packed.tokens["total"] <= budget
+    assert packed.tokens["total"] == count_tokens(packed.html) + count_tokens(packed.styles) + count_tokens(packed.api)
+    assert budget < 1000 or "Reporting" in packed.html  # the page's h1
+
+def test_packed_prompt_beats_the_character_prefix():
+    facts = bench_prompt_packer.page_facts(HOME)
+    baseline = bench_prompt_packer.baseline_prompt(HOME)
+    packed = pack_snapshot(HOME, 3000)
+    prompt = "\n\n".join((packed.html, packed.styles, packed.api))
+    old, new = bench_prompt_packer.coverage(baseline, facts), bench_prompt_packer.coverage(prompt, facts)
+    assert count_tokens(prompt) * 3 < count_tokens(baseline)
+    assert all(new[k] >= old[k] for k in new) and new["words"] > 2 * old["words"]
+
+def test_frontend_prompt_is_packed(monkeypatch):
+    monkeypatch.setattr(frontend_agent.settings, "prompt_token_budget", 1000)
+    prompt = frontend_agent.page_request("home")["input"]
+    assert "Reporting" in prompt and "page_load_now" not in prompt
+    assert count_tokens(prompt) < 1300
@@ -0,0 +1,122 @@
+# agent/tests/test_schema_inference.py
+import sqlite3
+from pathlib import Path
+import pytest
+import yaml
+from agent import backend_agent, schema_inference, snapshot
+from agent.schema_inference import SchemaInference, TypeInfo, infer, openapi_schema
+from agent.snapshot import iter_items
+
+OUTPUT = Path(__file__).resolve().parents[1] / "output"
+FIXTURES = Path(__file__).with_name("fixtures")
+
+def from_fixture(name):
+    return infer([name], load=lambda page: iter_items(FIXTURES / f"{page}.json", "networkLogs"))
+
+def test_type_unification():
+    info = TypeInfo()
+    for value in [{"a": 1, "s": "open", "d": "2025-01-02"}, {"a": 2.5, "s": "done", "d": None},
+                  {"a": 3, "s": "open", "d": "2025-01-03", "extra": [1, 2]}, {"a": 4, "s": "open"}]:
+        info.add(value)
+    assert openapi_schema(info) == {
+        "type": "object",
+        "properties": {
+            "a": {"type": "number"},
+            "s": {"type": "string", "enum": ["done", "open"]},
+            "d": {"type": "string", "format": "date", "nullable": True},
+            "extra": {"type": "array", "items": {"type": "integer"}},
+        },
+        "required": ["a", "s"],
+    }
+    mixed = TypeInfo()
+    for value in [1, "x", None]:
+        mixed.add(value)
+    assert openapi_schema(mixed) == {"oneOf": [{"type": "integer"}, {"type": "string"}], "nullable": True}
+
+def test_names_and_ids_are_not_enums():
+    info = TypeInfo()
+    for value in ["Website", "Ops", "Website", "Ops", "1200000000000101", "1200000000000101"]:
+        info.add(value)
+    assert "enum" not in openapi_schema(info)
+
+def test_recorded_api_fixture():
+    inference = from_fixture("tasks")
+    spec = inference.openapi()
+    assert list(spec["paths"]) == [
+        "/api/1.0/projects/{project_id}/tasks", "/api/1.0/tasks", "/api/1.0/tasks/{task_id}", "/api/1.0/users/me",
+    ]
+    assert set(spec["paths"]["/api/1.0/tasks/{task_id}"]) == {"get", "put"}
+    listing = spec["paths"]["/api/1.0/tasks"]["get"]
+    assert {p["name"]: (p["required"], p["schema"]["type"]) for p in listing["parameters"]} == {
+        "limit": (True, "integer"), "workspace": (True, "integer"), "offset": (False, "string"),
+    }
+    task = spec["components"]["schemas"]["Api10TasksResponse"]["properties"]["data"]["items"]
+    assert task["properties"]["status"]["enum"] == ["completed", "in_progress", "not_started"]
+    assert task["properties"]["due_on"] == {"type": "string", "format": "date", "nullable": True}
+    assert task["properties"]["assignee"]["nullable"] is True
+    assert "notes" in task["properties"] and "notes" not in task["required"]
+
+    sql = inference.schema_sql()
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(sql)
+    columns = {row[1]: (row[2], row[3]) for row in conn.execute("PRAGMA table_info(tasks)")}
+    assert columns["due_on"] == ("DATE", 0) and columns["created_at"] == ("DATETIME", 1)
+    assert columns["completed"] == ("BOOLEAN", 1) and "assignee" not in columns
+    assert [r[2:4] for r in conn.execute("PRAGMA foreign_key_list(tasks)")] == [("users", "assignee_id")]
+    assert {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")} == {
+        "tasks", "users", "projects", "workspaces",
+    }
+
+def test_recorded_home_snapshot_is_deterministic(tmp_path):
+    first = infer(["home"], load=lambda page: iter_items(OUTPUT / "home.json", "networkLogs"))
+    api, schema = schema_inference.write_backend_spec(first, tmp_path)
+    spec = yaml.safe_load(api.read_text(encoding="utf-8"))
+    assert "/app/asana/-/experiments" in spec["paths"]
+    # the experiments map is keyed by data, so it is a map, not hundreds of properties
+    experiments = spec["components"]["schemas"]["AppAsanaExperimentsResponse"]["properties"]["experiments_data"]
+    assert set(experiments) == {"type", "additionalProperties"}
+    sqlite3.connect(":memory:").executescript(schema.read_text(encoding="utf-8"))
+    again = infer(["home"], load=lambda page: iter_items(OUTPUT / "home.json", "networkLogs"))
+    assert schema_inference.dump_yaml(again.openapi()) == api.read_text(encoding="utf-8")
+    assert again.schema_sql() == schema.read_text(encoding="utf-8")
+
+def test_backend_agent_inference_mode(tmp_path, monkeypatch):
+    (tmp_path / "output").mkdir()
+    (tmp_path / "output" / "tasks.json").write_bytes((FIXTURES / "tasks.json").read_bytes())
+    monkeypatch.setattr(snapshot, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(backend_agent, "BACKEND_DIR", tmp_path / "backend")
+    monkeypatch.setattr(backend_agent.settings, "use_llm", False)
+    monkeypatch.setattr(backend_agent.settings, "infer_spec", True)
+    backend_agent.main()
+    assert "CREATE TABLE tasks (" in (tmp_path / "backend" / "schema.sql").read_text(encoding="utf-8")
+    assert "/api/1.0/tasks" in yaml.safe_load((tmp_path / "backend" / "api.yml").read_text(encoding="utf-8"))["paths"]
+    monkeypatch.setattr(snapshot, "OUTPUT_DIR", tmp_path / "empty")
+    with pytest.raises(FileNotFoundError):
+        backend_agent.generate_backend_inferred()
+
+def test_repeated_bodies_count_like_distinct_ones():
+    logs = [{"url": "https://app.example.com/api/items", "method": "GET", "status": 200,
+             "body": {"data": [{"id": 1, "state": "open"}], "next": None if n % 3 else "c"}} for n in range(50)]
+    folded = SchemaInference()
+    folded.add_all("p", logs)
+    walked = TypeInfo()
+    for log in logs:
+        walked.add(log["body"])
+    assert openapi_schema(folded.endpoints[("GET", "/api/items")].body) == {}
+    folded.openapi()
+    assert openapi_schema(folded.endpoints[("GET", "/api/items")].body) == openapi_schema(walked)
+
+def test_same_path_on_several_hosts_is_one_operation():
+    def log(host, body):
+        return {"url": f"https://{host}/api/items", "method": "GET", "status": 200, "body": body}
+    inference = SchemaInference()
+    inference.add_all("p", [log("app.example.com", {"id": 1, "name": "a"}), log("app.example.com", {"id": 2}),
+                            log("eu.example.com", {"id": 3, "region": "eu"})])
+    spec = inference.openapi()
+    operation = spec["paths"]["/api/items"]["get"]
+    assert [s["url"] for s in spec["servers"]] == ["https://app.example.com", "https://eu.example.com"]
+    assert operation["servers"] == spec["servers"]
+    schema = spec["components"]["schemas"][operation["responses"]["200"]["content"]["application/json"]["schema"]
+                                            ["$ref"].rsplit("/", 1)[1]]
+    assert set(schema["properties"]) == {"id", "name", "region"} and schema["required"] == ["id"]
+    assert "servers" not in from_fixture("tasks").openapi()["paths"]["/api/1.0/tasks"]["get"]
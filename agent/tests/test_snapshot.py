@@ -0,0 +1,51 @@
+# agent/tests/test_snapshot.py
+import json
+from itertools import islice
+from pathlib import Path
+import pytest
+from agent.backend_agent import load_network_logs
+from agent.snapshot import SnapshotError, iter_items, read_section, read_sections
+
+HOME = Path(__file__).resolve().parents[1] / "output" / "home.json"
+SNAPSHOT = {
+    "html": "<p class=\"x\">café \\  </p>",
+    "computedStyles": [],
+    "network_logs": [{"url": "/a", "body": {"n": 12345678901234567890, "f": -1.5e-3}}, 42, None, "s"],
+    "extra": {"nested": [[], {}]},
+}
+
+@pytest.fixture
+def snapshot(tmp_path):
+    p = tmp_path / "snapshot.json"
+    p.write_text(json.dumps(SNAPSHOT, indent=2, ensure_ascii=False), encoding="utf-8")
+    return p
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_sections_match_json_load_at_any_chunk_size(snapshot, chunk_size):
+    # tiny chunks split every token, escape and multi-byte character
+    assert read_sections(snapshot, *SNAPSHOT, chunk_size=chunk_size) == SNAPSHOT
+    assert read_section(snapshot, "html", chunk_size=chunk_size) == SNAPSHOT["html"]
+    assert list(iter_items(snapshot, "networkLogs", "network_logs", chunk_size=chunk_size)) == SNAPSHOT["network_logs"]
+
+def test_recorded_home_snapshot():
+    with open(HOME, encoding="utf-8") as f:
+        home = json.load(f)
+    assert read_sections(HOME, "html", "computedStyles", "networkLogs", chunk_size=4096) == home
+    assert load_network_logs("home") == home["networkLogs"]
+    assert load_network_logs("home", limit=3) == home["networkLogs"][:3]
+
+def test_missing_or_scalar_sections(snapshot):
+    assert read_section(snapshot, "networkLogs", default=[]) == []
+    assert list(iter_items(snapshot, "networkLogs")) == []
+    assert list(iter_items(snapshot, "html")) == []
+    assert read_sections(snapshot, "html", "nope") == {"html": SNAPSHOT["html"]}
+
+def test_iteration_stops_reading_early(tmp_path):
+    p = tmp_path / "truncated.json"
+    p.write_text('{"networkLogs": [{"url": "/a"}, {"url": "/b"}, {"url": "/c', encoding="utf-8")
+    assert list(islice(iter_items(p, "networkLogs", chunk_size=8), 2)) == [{"url": "/a"}, {"url": "/b"}]
+    with pytest.raises(SnapshotError, match="truncated"):
+        list(iter_items(p, "networkLogs", chunk_size=8))
+    p.write_text('["not", "a", "snapshot"]', encoding="utf-8")
+    with pytest.raises(SnapshotError, match="Expected"):
+        read_section(p, "html")
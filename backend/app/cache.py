@@ -0,0 +1,205 @@
+# backend/app/cache.py
+"""
+In-process LRU/TTL cache for the JSON read endpoints.
+
+GET /home, /projects, /projects/{id}, /tasks and /search responses are stored as
+finished bytes, keyed by path and normalized query string. Every entry
+is tagged with the tables it was built from. A write handler calls
+`response_cache.invalidate(<table>)` after it commits. That bumps the
+table's version and drops only the entries tagged with it. A read that
+started before the bump remembers the versions it saw, so it can never
+store a stale body afterwards.
+
+The same middleware answers conditional GETs. Each response carries an
+ETag derived from the table versions (see app.versions) and the current
+time bucket, and a request whose If-None-Match still matches gets a 304
+before any handler, query or serialization runs. The versions only see
+this process's writes, so the bucket caps how long a 304 can hide a
+write made elsewhere. With several workers the cache and the ETags are
+off unless RESPONSE_CACHE_ENABLED / ETAGS_ENABLED say otherwise.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from .config import settings
+from .versions import DataVersions, data_versions, etag_matches
+
+# path pattern -> (tables the response is built from, depends on the clock)
+CACHEABLE_ROUTES = [
+    # overdue / completed-this-week move with time, not only with writes
+    (re.compile(r"^/home$"), ("tasks", "projects"), True),
+    (re.compile(r"^/projects(/\d+)?$"), ("projects", "tasks"), False),
+    (re.compile(r"^/tasks$"), ("tasks",), False),
+    (re.compile(r"^/search$"), ("tasks", "projects"), False),
+]
+
+# granularity of the clock component in ETags: the longest a 304 can hide
+# a write made by another worker or a script
+ETAG_TIME_BUCKET_SECONDS = 60
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    status_code: int
+    headers: List[Tuple[str, str]]
+    tags: Tuple[str, ...]
+    versions: Tuple[int, ...]
+    expires_at: float
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, status_code=self.status_code, headers=dict(self.headers))
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float, enabled: bool = True,
+                 versions: Optional[DataVersions] = None, etags: bool = True):
+        self.enabled = enabled
+        self.etags = etags
+        self.versions = versions or DataVersions()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    @staticmethod
+    def key_for(path: str, query_items: Iterable[Tuple[str, str]]) -> str:
+        # re-encoded: "&" or "=" inside a decoded value must not read as a separator
+        query = urlencode(sorted(query_items))
+        return f"{path.rstrip('/') or '/'}?{query}"
+
+    def versions_for(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return self.versions.snapshot(tags)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, tags: Tuple[str, ...], versions: Tuple[int, ...],
+            body: bytes, status_code: int, headers: List[Tuple[str, str]]) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            # a write committed while this response was being built
+            if versions != self.versions.snapshot(tags):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = CachedResponse(
+                body, status_code, headers, tags, versions, time.monotonic() + self.ttl_seconds
+            )
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.versions.bump(*tags)
+            stale = [key for key, entry in self._entries.items() if set(entry.tags) & set(tags)]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "etags": self.etags,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    max_bytes=settings.response_cache_max_bytes,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+    enabled=settings.response_cache_enabled if settings.response_cache_enabled is not None else settings.single_worker,
+    versions=data_versions,
+    etags=settings.etags_enabled if settings.etags_enabled is not None else settings.single_worker,
+)
+
+
+def etag_time_bucket() -> int:
+    return int(time.time() // ETAG_TIME_BUCKET_SECONDS)
+
+
+def match_route(path: str) -> Optional[Tuple[Tuple[str, ...], bool]]:
+    path = path.rstrip("/")
+    for pattern, tags, time_dependent in CACHEABLE_ROUTES:
+        if pattern.match(path):
+            return tags, time_dependent
+    return None
+
+
+async def response_cache_middleware(request: Request, call_next):
+    route = match_route(request.url.path) if request.method == "GET" else None
+    if route is None:
+        return await call_next(request)
+    tags, time_dependent = route
+
+    key = response_cache.key_for(request.url.path, request.query_params.multi_items())
+    versions = response_cache.versions_for(tags)
+    validators = {}
+    if response_cache.etags:
+        validators = {
+            "ETag": response_cache.versions.etag(key, versions, etag_time_bucket(), weak=time_dependent),
+            # let browsers keep the body but revalidate it on every use
+            "Cache-Control": "no-cache",
+        }
+        if etag_matches(request.headers.get("if-none-match"), validators["ETag"]):
+            return Response(status_code=304, headers=validators)
+
+    cached = response_cache.get(key) if response_cache.enabled else None
+    if cached is not None:
+        response = cached.to_response()
+        response.headers.update(validators)
+        return response
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    if not response_cache.enabled:
+        response.headers.update(validators)
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = [(k, v) for k, v in response.headers.items() if k.lower() != "content-length"]
+    response_cache.put(key, tags, versions, body, response.status_code, headers)
+    return Response(content=body, status_code=response.status_code, headers={**dict(headers), **validators})
@@ -1,8 +1,49 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     database_url: str
     backend_port: int = 8000
+    # Serve routers from an AsyncSession (aiosqlite / asyncpg) instead of
+    # running blocking handlers on the threadpool
+    db_async: bool = False
+    # Optional read replica for GET handlers (e.g. a Postgres standby)
+    database_read_url: Optional[str] = None
+    read_pool_size: int = 10
+
+    # Production SQLite profile: the pragmas below run on every new
+    # connection, and GET handlers get their own read-only pool on the file
+    sqlite_tuning: bool = False
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+
+    # In-process response cache for GET /home, /projects, /tasks. It only
+    # sees this process's writes, so a write by another worker or a script
+    # is served stale for up to the TTL. Unset, it is on only for a single
+    # worker (see web_concurrency).
+    response_cache_enabled: Optional[bool] = None
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_ttl_seconds: float = 30.0
+    # ETag / 304 on the cached routes. The validators come from per-process
+    # table versions, so a write by another worker or a script (seed_db,
+    # rebuild_task_stats) goes unseen until the ETag's time bucket rolls
+    # over. Unset, they are on only for a single worker.
+    etags_enabled: Optional[bool] = None
+    # WEB_CONCURRENCY, as read by uvicorn and gunicorn
+    web_concurrency: int = 1
+
+    # Request timing middleware, Server-Timing headers and /metrics series
+    instrumentation_enabled: bool = False
+    # Sampling period of the on-demand profiler (/admin/profiler)
+    profiler_interval_ms: float = 5.0
+
+    @property
+    def single_worker(self) -> bool:
+        return self.web_concurrency <= 1
 
     # If .env is in project root (D:\Scaler-Agent-Replicator\.env)
     model_config = SettingsConfigDict(
@@ -1,19 +1,104 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
 
 database_url = settings.database_url
 
-# SQLite needs special connect_args
-if database_url.startswith("sqlite"):
-    engine = create_engine(
-        database_url,
-        future=True,
-        connect_args={"check_same_thread": False},
-    )
-else:
-    engine = create_engine(database_url, future=True)
+# Async driver for each sync dialect we support
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """`database_url` rewritten to the async driver of the same backend."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+def sqlite_pragmas(read_only: bool = False) -> list:
+    """PRAGMA statements of the SQLite performance profile."""
+    pragmas = [
+        f"journal_mode = {settings.sqlite_journal_mode}",
+        f"synchronous = {settings.sqlite_synchronous}",
+        f"mmap_size = {settings.sqlite_mmap_size}",
+        # negative cache_size is in KiB rather than pages
+        f"cache_size = -{settings.sqlite_cache_size_kib}",
+        f"busy_timeout = {settings.sqlite_busy_timeout_ms}",
+        "foreign_keys = ON",
+    ]
+    if read_only:
+        pragmas.append("query_only = ON")
+    return pragmas
+
+def tune_sqlite(sync_engine, read_only: bool = False) -> None:
+    """Run the profile's pragmas on every connection `sync_engine` opens."""
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+def create_db_engine(url: str, read_only: bool = False, **kwargs):
+    # SQLite needs special connect_args
+    if url.startswith("sqlite"):
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+    db_engine = create_engine(url, future=True, **kwargs)
+    if url.startswith("sqlite") and settings.sqlite_tuning:
+        tune_sqlite(db_engine, read_only)
+    return db_engine
+
+# GET handlers read through their own pool so they never queue behind
+# writers for a connection: a replica when one is configured, or a
+# query-only pool on the same SQLite file in WAL mode.
+read_database_url = settings.database_read_url
+if read_database_url is None and settings.sqlite_tuning and is_sqlite_file(database_url):
+    read_database_url = database_url
+
+engine = create_db_engine(database_url)
+read_engine = engine
+if read_database_url is not None:
+    read_engine = create_db_engine(read_database_url, read_only=True, pool_size=settings.read_pool_size)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, future=True)
+
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_database_url(database_url))
+    async_read_engine = async_engine
+    if read_database_url is not None:
+        async_read_engine = create_async_engine(
+            async_database_url(read_database_url), pool_size=settings.read_pool_size
+        )
+    if settings.sqlite_tuning:
+        for async_db_engine, read_only in ((async_engine, False), (async_read_engine, True)):
+            if async_db_engine.dialect.name == "sqlite":
+                tune_sqlite(async_db_engine.sync_engine, read_only)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False)
+
+def query_engines():
+    """Sync-level engines the routers execute statements on, for event hooks."""
+    if async_engine is not None:
+        engines = [async_engine.sync_engine, async_read_engine.sync_engine]
+    else:
+        engines = [engine, read_engine]
+    return list(dict.fromkeys(engines))
 
 Base = declarative_base()
@@ -1,7 +1,10 @@
 # backend/app/deps.py
-from .db import SessionLocal
+import functools
+import inspect
+from .config import settings
+from .db import ReadSessionLocal, SessionLocal
 from sqlalchemy.orm import Session
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -9,3 +12,64 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+def get_read_db() -> Session:
+    """Session on the read pool (replica or query-only SQLite), for GET handlers."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    from .db import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    from .db import AsyncReadSessionLocal
+
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+def require_instrumentation() -> None:
+    """/metrics and /admin/profiler exist only with INSTRUMENTATION_ENABLED=true."""
+    from .instrumentation import instrumentation
+
+    if not instrumentation.enabled:
+        raise HTTPException(404, "Not Found")
+
+# sync session dependency -> its async counterpart
+ASYNC_SESSIONS = {get_db: get_async_db, get_read_db: get_async_read_db}
+
+def async_db_endpoint(fn):
+    """
+    Turn a sync handler taking `db: Session = Depends(get_db)` (or
+    get_read_db) into an `async def` handler on the matching AsyncSession. The handler body runs unchanged
+    through AsyncSession.run_sync, so its I/O goes through the async driver
+    on the event loop instead of blocking a threadpool worker.
+    Handlers must return fully loaded data (schemas, not ORM objects), since
+    lazy loads cannot happen once run_sync returns.
+    """
+    signature = inspect.signature(fn)
+    parameters = [
+        param.replace(
+            default=Depends(ASYNC_SESSIONS.get(getattr(param.default, "dependency", None), get_async_db)),
+            annotation=inspect.Parameter.empty,
+        )
+        if param.name == "db" else param
+        for param in signature.parameters.values()
+    ]
+
+    @functools.wraps(fn)
+    async def endpoint(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: fn(db=session, **kwargs))
+
+    endpoint.__signature__ = signature.replace(parameters=parameters)
+    return endpoint
+
+def db_endpoint(fn):
+    """Register `fn` as-is, or through async_db_endpoint when DB_ASYNC is on."""
+    return async_db_endpoint(fn) if settings.db_async else fn
@@ -0,0 +1,293 @@
+# backend/app/instrumentation.py
+"""
+Opt-in request instrumentation (INSTRUMENTATION_ENABLED=true).
+
+When it is on, the middleware times every request. SQLAlchemy cursor
+events add the number of statements and the time spent in the database
+to that request. Each response gets a `Server-Timing` header, which the
+browser devtools show in the network panel:
+
+    Server-Timing: app;dur=12.41, db;dur=3.02;desc="4 queries"
+
+The same numbers are aggregated per route template and served at
+/metrics in the Prometheus text format. `dur` is measured until the
+response starts, so a streamed export reports its time to first byte.
+
+The sampling profiler works separately and is toggled at runtime through
+/admin/profiler. While a request for the chosen route is in flight, a
+background thread samples the stacks of every thread running code from
+this package. It writes them out as collapsed stacks
+(`frame;frame;frame count`), the input format of flamegraph.pl, inferno
+and speedscope. Concurrent requests to other routes that are busy in the
+app at the same moment show up in the samples too.
+"""
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from fastapi import Request
+from sqlalchemy import event
+from starlette.routing import Match
+from .config import settings
+
+# Prometheus' default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class RequestTimings:
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def install_sql_hooks(engines) -> None:
+    """Charge every statement run on `engines` to the request that issued it."""
+    for db_engine in engines:
+        event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started = conn.info.pop("query_started", None)
+    if timings is not None and started is not None:
+        timings.statements += 1
+        timings.db_seconds += time.perf_counter() - started
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, running = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            out.append((repr(float(bound)), running))
+        out.append(("+Inf", self.count))
+        return out
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: Counter = Counter()
+            self.latency: Dict[Tuple[str, str], Histogram] = {}
+            self.db_latency: Dict[Tuple[str, str], Histogram] = {}
+            self.statements: Counter = Counter()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timings: RequestTimings) -> None:
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, str(status))] += 1
+            self.latency.setdefault(key, Histogram()).observe(seconds)
+            self.db_latency.setdefault(key, Histogram()).observe(timings.db_seconds)
+            self.statements[key] += timings.statements
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests served, by route template and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+            for name, help_text, series in (
+                ("http_request_duration_seconds", "Time until the response starts.", self.latency),
+                ("http_request_db_duration_seconds", "Time spent executing SQL per request.", self.db_latency),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(series.items()):
+                    labels = _labels(method=method, route=route)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            lines += [
+                "# HELP http_request_db_statements_total SQL statements executed, by route template.",
+                "# TYPE http_request_db_statements_total counter",
+            ]
+            for (method, route), count in sorted(self.statements.items()):
+                lines.append(f"http_request_db_statements_total{{{_labels(method=method, route=route)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.route: Optional[str] = None
+        self.samples: Counter = Counter()
+        self._in_flight = 0
+        self._busy = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        return self.route is not None
+
+    def start(self, route: str, interval_seconds: Optional[float] = None) -> None:
+        """Start sampling requests to `route`, discarding any earlier profile."""
+        self.stop()
+        with self._lock:
+            self.samples = Counter()
+        if interval_seconds is not None:
+            self.interval_seconds = interval_seconds
+        self.route = route_key(route)
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.route = None
+        self._busy.set()  # wake the sampler so it sees the route is gone
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._busy.clear()
+
+    def enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._busy.set()
+
+    def exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._busy.clear()
+
+    def collapsed(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "route": self.route,
+                "interval_ms": self.interval_seconds * 1000,
+                "samples": sum(self.samples.values()),
+                "stacks": len(self.samples),
+            }
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while self.route is not None:
+            self._busy.wait()
+            if self.route is None:
+                break
+            stacks = [
+                _collapse(frame) for ident, frame in sys._current_frames().items() if ident != me
+            ]
+            with self._lock:
+                self.samples.update(stack for stack in stacks if stack)
+            time.sleep(self.interval_seconds)
+
+
+def _collapse(frame) -> Optional[str]:
+    """`frame`'s stack root first, or None when no frame belongs to this package."""
+    names, in_app = [], False
+    while frame is not None:
+        code = frame.f_code
+        in_app = in_app or code.co_filename.startswith(APP_DIR)
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names)) if in_app else None
+
+
+def route_key(path: str) -> str:
+    return path.rstrip("/") or "/"
+
+
+def route_template(request: Request) -> str:
+    """The path template of the route serving `request`, e.g. /projects/{project_id}."""
+    route = request.scope.get("route")
+    if route is None:
+        # answered before routing: a cache hit, a 304, or a trailing-slash redirect
+        path = request.url.path
+        for candidate_path in (path, path.rstrip("/") + "/"):
+            scope = {**request.scope, "path": candidate_path}
+            route = next((r for r in request.app.router.routes if r.matches(scope)[0] == Match.FULL), None)
+            if route is not None:
+                break
+    return route.path if route is not None else "unmatched"
+
+
+class Instrumentation:
+    def __init__(self, enabled: bool, profiler_interval_seconds: float):
+        self.enabled = enabled
+        self.metrics = Metrics()
+        self.profiler = SamplingProfiler(profiler_interval_seconds)
+
+
+instrumentation = Instrumentation(
+    enabled=settings.instrumentation_enabled,
+    profiler_interval_seconds=settings.profiler_interval_ms / 1000,
+)
+
+
+async def instrumentation_middleware(request: Request, call_next):
+    profiler = instrumentation.profiler
+    profiled = profiler.active and route_key(route_template(request)) == profiler.route
+    if not instrumentation.enabled and not profiled:
+        return await call_next(request)
+
+    timings = RequestTimings()
+    token = _current.set(timings)
+    if profiled:
+        profiler.enter()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiled:
+            profiler.exit()
+        _current.reset(token)
+    if instrumentation.enabled:
+        instrumentation.metrics.observe(
+            request.method, route_template(request), response.status_code, elapsed, timings
+        )
+        response.headers["Server-Timing"] = (
+            f"app;dur={elapsed * 1000:.2f}, "
+            f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.statements} queries"'
+        )
+    return response
@@ -1,15 +1,38 @@
 # backend/app/main.py
 from fastapi import FastAPI
-from .db import Base, engine
-from .routers import home, projects, tasks
+from .cache import response_cache_middleware
+from .db import Base, SessionLocal, engine, query_engines
+from .instrumentation import install_sql_hooks, instrumentation_middleware
+from .routers import admin, home, metrics, projects, search, tasks
+from .search import SEARCHABLE, ensure_search_index
+from .task_stats import ensure_task_stats
 
 Base.metadata.create_all(bind=engine)
+# create_all only builds indexes together with a new table; add any that an
+# existing database is missing.
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+with engine.begin() as conn:
+    for table in SEARCHABLE:
+        ensure_search_index(conn, table)
+# GET handlers may run on a read-only pool, so the /home counters are built here
+with SessionLocal() as db:
+    ensure_task_stats(db)
 
 app = FastAPI(
     title="Asana Replica API",
     version="0.1.0"
 )
 
+app.middleware("http")(response_cache_middleware)
+# registered last so it runs outermost and also times cache hits
+app.middleware("http")(instrumentation_middleware)
+install_sql_hooks(query_engines())
+
+app.include_router(admin.router)
 app.include_router(home.router)
+app.include_router(metrics.router)
 app.include_router(projects.router)
+app.include_router(search.router)
 app.include_router(tasks.router)
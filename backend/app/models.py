@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .db import Base
@@ -13,7 +13,12 @@ class Project(Base):
     color = Column(String(7), nullable=True)  # hex like #3be8b0
     archived = Column(Boolean, default=False)
 
-    tasks = relationship("Task", back_populates="project")
+    tasks = relationship("Task", back_populates="project", order_by="Task.id")
+
+    __table_args__ = (
+        # list_projects: archived filter, sorted by name
+        Index("ix_projects_archived_name", "archived", "name"),
+    )
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -29,3 +34,29 @@ class Task(Base):
     label = Column(String(255), nullable=True)
 
     project = relationship("Project", back_populates="tasks")
+
+    __table_args__ = (
+        # list_tasks by project (+ status), selectinload of Project.tasks, project delete
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        # completed-this-week boundary day, status filter in list_tasks
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        Index("ix_tasks_label", "label"),
+        # sort=due_date pages, my_tasks on /home, overdue boundary day
+        Index("ix_tasks_due_date", "due_date"),
+    )
+
+class TaskStats(Base):
+    """Single-row counters behind the /home widgets, kept in step by task writes."""
+    __tablename__ = "task_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+
+class TaskDueBucket(Base):
+    """Number of tasks due on a given day, split by complete / not complete."""
+    __tablename__ = "task_due_buckets"
+
+    due_day = Column(Date, primary_key=True)
+    complete = Column(Boolean, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,90 @@
+# backend/app/pagination.py
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by (sort column, id) ascending and each page carries an
+opaque cursor holding the last row's key. The next page resumes strictly
+after that key instead of using OFFSET, so rows inserted or deleted
+elsewhere never shift a page: nothing is repeated or skipped. Rows whose
+sort key is NULL come after all others, ordered by id.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps({"s": sort, "k": key, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, column=None) -> Tuple[Any, int]:
+    """Return (key, id) from a cursor produced by encode_cursor for the same sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort or not isinstance(data["i"], int):
+            raise ValueError
+        key = data["k"]
+        if key is not None and column is not None and column.type.python_type is datetime:
+            key = datetime.fromisoformat(key)
+        return key, data["i"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def keyset_page(
+    query: Query,
+    model,
+    sort: str,
+    limit: int,
+    after: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of `query` ordered by (model.<sort>, model.id).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    id_column = model.id
+    if sort == "id":
+        q = query
+        if after is not None:
+            _, last_id = decode_cursor(after, sort)
+            q = q.filter(id_column > last_id)
+        rows = q.order_by(id_column).limit(limit + 1).all()
+        return _finish(rows, sort, limit, lambda row: None)
+
+    column = getattr(model, sort)
+    key, last_id = decode_cursor(after, sort, column) if after is not None else (None, None)
+    in_null_tail = after is not None and key is None
+
+    rows = []
+    if not in_null_tail:
+        q = query.filter(column != None)
+        if after is not None:
+            # (column, id) > (key, last_id), phrased so an index on column is usable
+            q = q.filter(column >= key, or_(column > key, id_column > last_id))
+        rows = q.order_by(column, id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        q = query.filter(column == None)
+        if in_null_tail:
+            q = q.filter(id_column > last_id)
+        rows += q.order_by(id_column).limit(limit + 1 - len(rows)).all()
+    return _finish(rows, sort, limit, lambda row: getattr(row, sort))
+
+
+def _finish(rows, sort, limit, key_of):
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort, key_of(last), last.id)
@@ -0,0 +1,68 @@
+# backend/app/projection.py
+"""
+Sparse fieldsets: the `fields=` query parameter.
+
+`fields` is a comma-separated list of response fields. Each field named
+at the top level is kept whole. A dotted name such as `my_tasks.name`
+keeps only that field of each item in a nested list. Tasks and projects
+always keep `id`, which cursors and clients rely on. Leaving `fields`
+out returns every field, exactly as before.
+
+The selection narrows the SQL as well as the JSON. Handlers select the
+output fields first and any columns they need internally (sort key,
+grouping key) after them. Zipping a row with the output field names then
+drops those extras.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+
+# top-level field -> None (whole field) or the subfields kept in its items
+Selection = Dict[str, Optional[Tuple[str, ...]]]
+
+
+def item_fields(fields: Sequence[str], wanted: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """`wanted` (plus id) in schema order; every field when `wanted` is None."""
+    if wanted is None:
+        return tuple(fields)
+    wanted = set(wanted)
+    return tuple(field for field in fields if field in wanted or field == "id")
+
+
+def parse_fields(
+    raw: Optional[str],
+    fields: Sequence[str],
+    nested: Optional[Dict[str, Sequence[str]]] = None,
+) -> Optional[Selection]:
+    """
+    Parse `fields=` against a response's top-level `fields` and the item
+    fields of its `nested` lists. Returns None when every field is wanted.
+    """
+    nested = nested or {}
+    parts = [part.strip() for part in (raw or "").split(",") if part.strip()]
+    if not parts:
+        return None
+    whole, partial, unknown = set(), {}, []
+    for part in parts:
+        head, _, sub = part.partition(".")
+        if head not in fields or (sub and sub not in nested.get(head, ())):
+            unknown.append(part)
+        elif sub:
+            partial.setdefault(head, set()).add(sub)
+        else:
+            whole.add(head)
+    if unknown:
+        raise HTTPException(400, f"Unknown field: {', '.join(unknown)}")
+
+    selection: Selection = {}
+    for field in fields:
+        if field in whole:
+            selection[field] = None
+        elif field in partial:
+            selection[field] = item_fields(nested[field], partial[field])
+    return selection
+
+
+def select_columns(model, out_fields: Sequence[str], *extra: str) -> List:
+    """Columns of `model` for `out_fields`, followed by any `extra` ones not among them."""
+    names = list(out_fields) + [name for name in dict.fromkeys(extra) if name not in out_fields]
+    return [getattr(model, name) for name in names]
@@ -0,0 +1,37 @@
+# backend/app/routers/admin.py
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from ..cache import response_cache
+from ..deps import require_instrumentation
+from ..instrumentation import instrumentation
+
+# opt-in like the rest of the instrumentation: 404 unless INSTRUMENTATION_ENABLED
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_instrumentation)])
+
+@router.get("/cache")
+def cache_stats():
+    """Response cache size and hit / miss / eviction counters."""
+    return response_cache.stats()
+
+@router.post("/profiler")
+def start_profiler(
+    route: str = Query(..., description="Route template to profile, e.g. /tasks/ or /projects/{project_id}"),
+    interval_ms: Optional[float] = Query(None, gt=0, le=1000),
+):
+    """Start sampling requests to `route`; any earlier profile is discarded."""
+    profiler = instrumentation.profiler
+    profiler.start(route, None if interval_ms is None else interval_ms / 1000)
+    return profiler.stats()
+
+@router.get("/profiler", response_class=PlainTextResponse)
+def profiler_output():
+    """Samples so far as collapsed stacks, for flamegraph.pl, inferno or speedscope."""
+    return instrumentation.profiler.collapsed()
+
+@router.delete("/profiler")
+def stop_profiler():
+    """Stop sampling. The profile stays readable until the next start."""
+    profiler = instrumentation.profiler
+    profiler.stop()
+    return profiler.stats()
@@ -1,43 +1,58 @@
 # backend/app/routers/home.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
+from typing import Optional
 from .. import models, schemas
-from ..deps import get_db
+from ..deps import db_endpoint, get_read_db
+from ..projection import item_fields, parse_fields, select_columns
+from ..serialization import FastJSONResponse, rows_as_dicts
+from ..task_stats import read_widget_metrics
+from .projects import PROJECT_FIELDS
+from .tasks import TASK_FIELDS
 
 router = APIRouter(prefix="/home", tags=["home"])
 
+HOME_SECTIONS = tuple(schemas.HomeResponse.model_fields)
+WIDGET_FIELDS = tuple(schemas.HomeWidgetMetrics.model_fields)
+
 @router.get("/", response_model=schemas.HomeResponse)
-def get_home(db: Session = Depends(get_db)):
-    now = datetime.utcnow()
-    week_ago = now - timedelta(days=7)
+@db_endpoint
+def get_home(
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated sections to return, or <section>.<field> to narrow one: "
+                    f"{', '.join(HOME_SECTIONS)} (e.g. my_tasks.name,my_tasks.status)",
+    ),
+):
+    selection = parse_fields(
+        fields, HOME_SECTIONS,
+        {"widgets": WIDGET_FIELDS, "recent_projects": PROJECT_FIELDS, "my_tasks": TASK_FIELDS},
+    )
+    wanted = {section: None for section in HOME_SECTIONS} if selection is None else selection
+    home = {}
 
-    tasks_q = db.query(models.Task)
-    total_tasks = tasks_q.count()
-    completed_tasks = tasks_q.filter(models.Task.status == "complete").count()
-    overdue_tasks = tasks_q.filter(
-        models.Task.due_date < now,
-        models.Task.status != "complete",
-        models.Task.due_date != None
-    ).count()
-    this_week_completed = tasks_q.filter(
-        models.Task.status == "complete",
-        models.Task.due_date >= week_ago
-    ).count()
+    # sections a client leaves out cost no queries at all
+    if "widgets" in wanted:
+        widgets = read_widget_metrics(db).model_dump()
+        home["widgets"] = {name: widgets[name] for name in item_fields(WIDGET_FIELDS, wanted["widgets"])}
 
-    recent_projects = db.query(models.Project).order_by(models.Project.id.desc()).limit(5).all()
-    my_tasks = tasks_q.order_by(models.Task.due_date.asc()).limit(10).all()
+    if "recent_projects" in wanted:
+        project_fields = item_fields(PROJECT_FIELDS, wanted["recent_projects"])
+        recent_projects = (
+            db.query(*select_columns(models.Project, project_fields))
+            .order_by(models.Project.id.desc())
+            .limit(5)
+        )
+        home["recent_projects"] = rows_as_dicts(project_fields, recent_projects)
 
-    widgets = schemas.HomeWidgetMetrics(
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        overdue_tasks=overdue_tasks,
-        this_week_completed=this_week_completed,
-    )
+    if "my_tasks" in wanted:
+        task_fields = item_fields(TASK_FIELDS, wanted["my_tasks"])
+        my_tasks = (
+            db.query(*select_columns(models.Task, task_fields))
+            .order_by(models.Task.due_date.asc(), models.Task.id)
+            .limit(10)
+        )
+        home["my_tasks"] = rows_as_dicts(task_fields, my_tasks)
 
-    return schemas.HomeResponse(
-        widgets=widgets,
-        recent_projects=recent_projects,
-        my_tasks=my_tasks,
-    )
+    return FastJSONResponse(home)
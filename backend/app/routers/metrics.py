@@ -0,0 +1,12 @@
+# backend/app/routers/metrics.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from ..deps import require_instrumentation
+from ..instrumentation import instrumentation
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_instrumentation)])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Per-route request counts and latency histograms in the Prometheus text format (404 unless INSTRUMENTATION_ENABLED)."""
+    return PlainTextResponse(instrumentation.metrics.render(), media_type="text/plain; version=0.0.4")
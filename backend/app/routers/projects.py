@@ -1,38 +1,112 @@
 # backend/app/routers/projects.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import Literal, Optional
 from .. import models, schemas
-from ..deps import get_db
+from ..cache import response_cache
+from ..deps import db_endpoint, get_db, get_read_db
+from ..export import export_response
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, keyset_page
+from ..projection import item_fields, parse_fields, select_columns
+from ..search import project_match
+from ..serialization import FastJSONResponse, rows_as_dicts, schema_columns
+from ..task_stats import record_project_tasks_removed
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
-@router.get("/", response_model=List[schemas.Project])
+INCLUDABLE = {"tasks"}
+
+def parse_include(include: Optional[str]) -> set:
+    wanted = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = wanted - INCLUDABLE
+    if unknown:
+        raise HTTPException(400, f"Unknown include: {', '.join(sorted(unknown))}")
+    return wanted
+
+PROJECT_FIELDS, PROJECT_COLUMNS = schema_columns(schemas.ProjectSummary, models.Project)
+TASK_FIELDS, TASK_COLUMNS = schema_columns(schemas.Task, models.Task)
+
+@router.get("/", response_model=schemas.ProjectPage, response_model_exclude_unset=True)
+@db_endpoint
 def list_projects(
-    db: Session = Depends(get_db),
-    include_archived: bool = Query(False)
+    db: Session = Depends(get_read_db),
+    q: Optional[str] = Query(None, max_length=255, description="Only projects whose name or description contain every word"),
+    include_archived: bool = Query(False),
+    include: Optional[str] = Query(None, description="Comma-separated extras to embed: tasks"),
+    sort: Literal["id", "name"] = "id",
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated project fields to return (id is always included), or tasks.<field> to narrow "
+                    f"embedded tasks (implies include=tasks): {', '.join(PROJECT_FIELDS + ('tasks',))}",
+    ),
+):
+    selection = parse_fields(fields, PROJECT_FIELDS + ("tasks",), {"tasks": TASK_FIELDS})
+    include_tasks = "tasks" in parse_include(include) or (selection is not None and "tasks" in selection)
+    out_fields = item_fields(PROJECT_FIELDS, None if selection is None else set(selection) - {"tasks"})
+    task_fields = item_fields(TASK_FIELDS, None if selection is None else selection.get("tasks"))
+
+    query = db.query(*select_columns(models.Project, out_fields, "id", sort))
+    if not include_archived:
+        query = query.filter(models.Project.archived == False)
+    match = project_match(db, q) if q else None
+    if match is not None:
+        query = query.filter(match)
+    rows, next_cursor = keyset_page(query, models.Project, sort, limit, after)
+    projects = rows_as_dicts(out_fields, rows)
+    if include_tasks and projects:
+        # One extra SELECT ... WHERE project_id IN (...) for the whole page,
+        # in the same order as the Project.tasks relationship.
+        by_id = {project["id"]: project for project in projects}
+        for project in projects:
+            project["tasks"] = []
+        task_rows = (
+            db.query(*select_columns(models.Task, task_fields, "project_id"))
+            .filter(models.Task.project_id.in_(by_id))
+            .order_by(models.Task.id)
+        )
+        for row in task_rows:
+            by_id[row.project_id]["tasks"].append(dict(zip(task_fields, row)))
+    return FastJSONResponse({"projects": projects, "next_cursor": next_cursor})
+
+@router.get("/export")
+def export_projects(
+    include_archived: bool = Query(False),
+    format: Literal["ndjson", "csv"] = "ndjson",
 ):
-    q = db.query(models.Project)
+    """Every project, in id order, streamed as NDJSON or CSV."""
+    statement = select(*PROJECT_COLUMNS).order_by(models.Project.id)
     if not include_archived:
-        q = q.filter(models.Project.archived == False)
-    return q.all()
+        statement = statement.where(models.Project.archived == False)
+    return export_response(statement, format, "projects")
 
 @router.post("/", response_model=schemas.Project, status_code=201)
+@db_endpoint
 def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
     db_project = models.Project(**project.dict())
     db.add(db_project)
     db.commit()
+    response_cache.invalidate("projects")
     db.refresh(db_project)
-    return db_project
+    return schemas.Project.model_validate(db_project)
 
 @router.get("/{project_id}", response_model=schemas.Project)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+@db_endpoint
+def get_project(project_id: int, db: Session = Depends(get_read_db)):
+    project = (
+        db.query(models.Project)
+        .options(selectinload(models.Project.tasks))
+        .filter(models.Project.id == project_id)
+        .first()
+    )
     if not project:
         raise HTTPException(404, "Project not found")
-    return project
+    return schemas.Project.model_validate(project)
 
 @router.patch("/{project_id}", response_model=schemas.Project)
+@db_endpoint
 def update_project(project_id: int, update: schemas.ProjectUpdate, db: Session = Depends(get_db)):
     project = db.query(models.Project).filter(models.Project.id == project_id).first()
     if not project:
@@ -40,13 +114,20 @@ def update_project(project_id: int, update: schemas.ProjectUpdate, db: Session =
     for k, v in update.dict(exclude_unset=True).items():
         setattr(project, k, v)
     db.commit()
+    response_cache.invalidate("projects")
     db.refresh(project)
-    return project
+    return schemas.Project.model_validate(project)
 
 @router.delete("/{project_id}", status_code=204)
+@db_endpoint
 def delete_project(project_id: int, db: Session = Depends(get_db)):
     project = db.query(models.Project).filter(models.Project.id == project_id).first()
     if not project:
         raise HTTPException(404, "Project not found")
+    # Tasks require a project, so they go with it; bulk delete keeps this
+    # to one statement instead of loading every task into the session.
+    record_project_tasks_removed(db, project_id)
+    db.query(models.Task).filter(models.Task.project_id == project_id).delete(synchronize_session=False)
     db.delete(project)
     db.commit()
+    response_cache.invalidate("projects", "tasks")
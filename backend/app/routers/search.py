@@ -0,0 +1,22 @@
+# backend/app/routers/search.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from .. import schemas
+from ..deps import db_endpoint, get_read_db
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT
+from ..search import search as run_search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/", response_model=schemas.SearchPage)
+@db_endpoint
+def search(
+    db: Session = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=255),
+    type: Optional[Literal["task", "project"]] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    """Tasks and projects whose name, label or description contain every word of `q`, best match first."""
+    return run_search(db, q, type, limit, after)
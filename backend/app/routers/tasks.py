@@ -1,47 +1,184 @@
 # backend/app/routers/tasks.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Literal, Optional
 from .. import models, schemas
-from ..deps import get_db
+from ..cache import response_cache
+from ..deps import db_endpoint, get_db, get_read_db
+from ..export import export_response
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, keyset_page
+from ..projection import item_fields, parse_fields, select_columns
+from ..serialization import FastJSONResponse, rows_as_dicts, schema_columns
+from ..task_stats import TaskState, record_task_change, record_task_changes, task_state
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-@router.get("/", response_model=List[schemas.Task])
-def list_tasks(
-    db: Session = Depends(get_db),
-    project_id: Optional[int] = None,
-    label: Optional[str] = Query(None, max_length=255),
-    status: Optional[str] = None
-):
-    q = db.query(models.Task)
+TASK_FIELDS, TASK_COLUMNS = schema_columns(schemas.Task, models.Task)
+
+def task_filters(project_id: Optional[int], label: Optional[str], status: Optional[str]) -> list:
+    criteria = []
     if project_id is not None:
-        q = q.filter(models.Task.project_id == project_id)
+        criteria.append(models.Task.project_id == project_id)
     # Example “business nuance” for label:
     # - empty string => ignore label filter
     # - null (missing) => ignore
     # - very long string => trimmed at 255
     if label is not None and label.strip() != "":
         label_value = label[:255]
-        q = q.filter(models.Task.label == label_value)
+        criteria.append(models.Task.label == label_value)
     if status:
-        q = q.filter(models.Task.status == status)
-    return q.all()
+        criteria.append(models.Task.status == status)
+    return criteria
+
+@router.get("/", response_model=schemas.TaskPage)
+@db_endpoint
+def list_tasks(
+    db: Session = Depends(get_read_db),
+    project_id: Optional[int] = None,
+    label: Optional[str] = Query(None, max_length=255),
+    status: Optional[str] = None,
+    sort: Literal["id", "due_date"] = "id",
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated task fields to return (id is always included): {', '.join(TASK_FIELDS)}"),
+):
+    selection = parse_fields(fields, TASK_FIELDS)
+    out_fields = item_fields(TASK_FIELDS, selection)
+    q = db.query(*select_columns(models.Task, out_fields, "id", sort)).filter(*task_filters(project_id, label, status))
+    rows, next_cursor = keyset_page(q, models.Task, sort, limit, after)
+    return FastJSONResponse({"tasks": rows_as_dicts(out_fields, rows), "next_cursor": next_cursor})
+
+@router.get("/export")
+def export_tasks(
+    project_id: Optional[int] = None,
+    label: Optional[str] = Query(None, max_length=255),
+    status: Optional[str] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+):
+    """Every matching task, in id order, streamed as NDJSON or CSV."""
+    statement = select(*TASK_COLUMNS).where(*task_filters(project_id, label, status)).order_by(models.Task.id)
+    return export_response(statement, format, "tasks")
 
 @router.post("/", response_model=schemas.Task, status_code=201)
+@db_endpoint
 def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
     project = db.query(models.Project).filter(models.Project.id == task.project_id).first()
     if not project:
         raise HTTPException(400, "Invalid project_id")
     db_task = models.Task(**task.dict())
     db.add(db_task)
+    db.flush()
+    record_task_change(db, None, task_state(db_task))
     db.commit()
+    response_cache.invalidate("tasks")
     db.refresh(db_task)
-    return db_task
+    return schemas.Task.model_validate(db_task)
+
+def current_states(db: Session, ids) -> dict:
+    """
+    task id -> TaskState for the tasks among `ids` that exist, in one query.
+    The rows stay locked until commit, so the counter deltas are taken from
+    the same state the write replaces (a no-op on SQLite, which locks the
+    whole database for a write anyway).
+    """
+    rows = (db.query(models.Task.id, models.Task.status, models.Task.due_date)
+            .filter(models.Task.id.in_(ids)).with_for_update())
+    return {task_id: TaskState(status, due_date) for task_id, status, due_date in rows}
+
+# Bulk endpoints answer 200 with one result per item, carrying the status
+# the single-item endpoint would have returned. Valid items are written
+# together in one transaction even when others in the batch fail.
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+@db_endpoint
+def create_tasks_bulk(payload: schemas.TaskBulkCreate, db: Session = Depends(get_db)):
+    project_ids = {task.project_id for task in payload.tasks}
+    known = {pid for (pid,) in db.query(models.Project.id).filter(models.Project.id.in_(project_ids))}
+
+    results, rows = [], []
+    for index, task in enumerate(payload.tasks):
+        if task.project_id in known:
+            rows.append(task.model_dump())
+            results.append(schemas.BulkItemResult(index=index, status=201))
+        else:
+            results.append(schemas.BulkItemResult(index=index, status=400, error="Invalid project_id"))
+    if not rows:
+        return schemas.BulkResult(results=results)
+
+    # One multi-row INSERT per 1000 rows. RETURNING order is unspecified, but
+    # new ids are handed out in VALUES order, so sorted ids line up with
+    # `rows` (asking SQLAlchemy to sort_by_parameter_order falls back to
+    # row-by-row inserts on SQLite).
+    ids = sorted(db.scalars(insert(models.Task).returning(models.Task.id), rows))
+    record_task_changes(db, ((None, TaskState(row["status"], row["due_date"])) for row in rows))
+    db.commit()
+    response_cache.invalidate("tasks")
+    created = iter(ids)
+    for result in results:
+        if result.status == 201:
+            result.id = next(created)
+    return schemas.BulkResult(results=results)
+
+@router.patch("/bulk", response_model=schemas.BulkResult)
+@db_endpoint
+def update_tasks_bulk(payload: schemas.TaskBulkUpdate, db: Session = Depends(get_db)):
+    states = current_states(db, {task.id for task in payload.tasks})
+
+    # items repeating an id apply in order, as separate PATCHes would
+    results, changes, before = [], {}, {}
+    for index, task in enumerate(payload.tasks):
+        if task.id not in states:
+            results.append(schemas.BulkItemResult(index=index, status=404, id=task.id, error="Task not found"))
+            continue
+        data = task.model_dump(exclude_unset=True)
+        if "label" in data and data["label"] is not None:
+            data["label"] = data["label"][:255]
+        before.setdefault(task.id, states[task.id])
+        changes.setdefault(task.id, {}).update(data)
+        results.append(schemas.BulkItemResult(index=index, status=200, id=task.id))
+    if not changes:
+        return schemas.BulkResult(results=results)
+
+    rows = [data for data in changes.values() if len(data) > 1]
+    if rows:
+        # executemany, batched by the set of columns each item changes
+        db.execute(update(models.Task), rows)
+    record_task_changes(db, (
+        (state, state._replace(**{k: v for k, v in changes[task_id].items() if k in TaskState._fields}))
+        for task_id, state in before.items()
+    ))
+    db.commit()
+    response_cache.invalidate("tasks")
+    return schemas.BulkResult(results=results)
+
+@router.delete("/bulk", response_model=schemas.BulkResult)
+@db_endpoint
+def delete_tasks_bulk(payload: schemas.TaskBulkDelete, db: Session = Depends(get_db)):
+    states = current_states(db, set(payload.ids))
+
+    results, deleted = [], set()
+    for index, task_id in enumerate(payload.ids):
+        # a repeated id is already gone by the time its second delete runs
+        if task_id in states and task_id not in deleted:
+            deleted.add(task_id)
+            results.append(schemas.BulkItemResult(index=index, status=204, id=task_id))
+        else:
+            results.append(schemas.BulkItemResult(index=index, status=404, id=task_id, error="Task not found"))
+    if not deleted:
+        return schemas.BulkResult(results=results)
+
+    record_task_changes(db, ((states[task_id], None) for task_id in deleted))
+    db.query(models.Task).filter(models.Task.id.in_(deleted)).delete(synchronize_session=False)
+    db.commit()
+    response_cache.invalidate("tasks")
+    return schemas.BulkResult(results=results)
 
 @router.patch("/{task_id}", response_model=schemas.Task)
+@db_endpoint
 def update_task(task_id: int, update: schemas.TaskUpdate, db: Session = Depends(get_db)):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    # locked, so a concurrent PATCH cannot count the same transition twice
+    task = db.query(models.Task).filter(models.Task.id == task_id).with_for_update().first()
     if not task:
         raise HTTPException(404, "Task not found")
 
@@ -49,8 +186,11 @@ def update_task(task_id: int, update: schemas.TaskUpdate, db: Session = Depends(
     if "label" in data and data["label"] is not None:
         data["label"] = data["label"][:255]
 
+    before = task_state(task)
     for k, v in data.items():
         setattr(task, k, v)
+    record_task_change(db, before, task_state(task))
     db.commit()
+    response_cache.invalidate("tasks")
     db.refresh(task)
-    return task
+    return schemas.Task.model_validate(task)
@@ -1,7 +1,7 @@
 # backend/app/schemas.py
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Literal, Optional, List
 # from pydantic import BaseModel, ConfigDict
 
 class TaskBase(BaseModel):
@@ -32,6 +32,35 @@ class Task(TaskBase):
     # class Config:
     #     orm_mode = True
 
+class TaskPage(BaseModel):
+    tasks: List[Task]
+    next_cursor: Optional[str] = None
+
+MAX_BULK_ITEMS = 1000
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkItemResult(BaseModel):
+    # position of the item in the request, and the status it would have
+    # got from the single-item endpoint
+    index: int
+    status: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+
 class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -47,12 +76,28 @@ class ProjectUpdate(BaseModel):
     color: Optional[str] = None
     archived: Optional[bool] = None
 
-class Project(ProjectBase):
+class ProjectSummary(ProjectBase):
     id: int
+    model_config = ConfigDict(from_attributes=True)
+
+class Project(ProjectSummary):
     tasks: List[Task] = []
 
-    class Config:
-        orm_mode = True
+class ProjectPage(BaseModel):
+    projects: List[Project]
+    next_cursor: Optional[str] = None
+
+class SearchHit(BaseModel):
+    type: Literal["task", "project"]
+    id: int
+    project_id: Optional[int] = None
+    name: str
+    # lower is better; only meaningful for ordering within one query
+    score: float
+
+class SearchPage(BaseModel):
+    hits: List[SearchHit]
+    next_cursor: Optional[str] = None
 
 class HomeWidgetMetrics(BaseModel):
     total_tasks: int
@@ -62,5 +107,5 @@ class HomeWidgetMetrics(BaseModel):
 
 class HomeResponse(BaseModel):
     widgets: HomeWidgetMetrics
-    recent_projects: List[Project]
+    recent_projects: List[ProjectSummary]
     my_tasks: List[Task]
@@ -0,0 +1,194 @@
+# backend/app/search.py
+"""
+Full-text search over task and project names, labels and descriptions.
+
+On SQLite each searchable table gets an external-content FTS5 index
+(`tasks_fts`, `projects_fts`), kept in sync by AFTER INSERT/UPDATE/DELETE
+triggers. Every write therefore updates the index in the same transaction,
+whether it comes from a handler, a bulk endpoint or a seeding script. Hits
+are ranked with bm25, weighting name over label over description.
+
+On PostgreSQL the same columns feed a weighted tsvector expression with a
+GIN index on it. The index keeps itself up to date, and hits are ranked
+with ts_rank.
+
+User input never reaches the query syntax as-is: `q` is split into word
+tokens that must all match, and the last one also matches as a prefix,
+for search-as-you-type.
+"""
+import re
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import event, literal_column, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from . import models, schemas
+from .pagination import decode_cursor, encode_cursor
+
+# table -> (hit type, {column: rank weight}); SQLite bm25 takes the
+# weights positionally, PostgreSQL maps the heaviest to setweight 'A'.
+SEARCHABLE = {
+    "tasks": ("task", {"name": 10.0, "label": 5.0, "description": 1.0}),
+    "projects": ("project", {"name": 10.0, "description": 1.0}),
+}
+
+PG_WEIGHT_CLASSES = {10.0: "A", 5.0: "B", 1.0: "D"}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def query_tokens(q: str) -> List[str]:
+    return TOKEN_RE.findall(q.lower())
+
+
+def fts5_query(tokens: List[str]) -> str:
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def tsquery(tokens: List[str]) -> str:
+    return " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"])
+
+
+def _pg_document(table: str) -> str:
+    _, weights = SEARCHABLE[table]
+    return " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{PG_WEIGHT_CLASSES[weight]}')"
+        for column, weight in weights.items()
+    )
+
+
+def _sqlite_ddl(table: str) -> List[str]:
+    _, weights = SEARCHABLE[table]
+    columns = ", ".join(weights)
+    new_values = ", ".join(f"new.{column}" for column in weights)
+    old_values = ", ".join(f"old.{column}" for column in weights)
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def ensure_search_index(conn: Connection, table: str) -> None:
+    """Create the search index of `table` if missing, filling it from existing rows."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)
+        ).first()
+        for statement in _sqlite_ddl(table):
+            conn.exec_driver_sql(statement)
+        if not exists:
+            conn.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin (({_pg_document(table)}))"
+        )
+
+
+def drop_search_index(conn: Connection, table: str) -> None:
+    """
+    Drop the search index of `table`. Bulk loads do this first and call
+    ensure_search_index afterwards: one rebuild is far cheaper than the
+    per-row triggers.
+    """
+    if conn.dialect.name == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}_fts")
+    elif conn.dialect.name == "postgresql":
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{table}_search")
+
+
+for _table in SEARCHABLE:
+    _sa_table = models.Base.metadata.tables[_table]
+    event.listen(_sa_table, "after_create", lambda target, conn, **kw: ensure_search_index(conn, target.name))
+    event.listen(_sa_table, "before_drop", lambda target, conn, **kw: drop_search_index(conn, target.name))
+
+
+def _hits_sql(dialect: str, table: str, keyset: bool) -> str:
+    """
+    SELECT of the best :limit (type, id, project_id, name, score) hits in
+    one table, after the cursor when `keyset`; lower score ranks first.
+    Every match is scored, but only the page is joined back to its row.
+    """
+    hit_type, weights = SEARCHABLE[table]
+    project_id = "t.project_id" if table == "tasks" else "NULL"
+    if dialect == "sqlite":
+        score = f"bm25({table}_fts, {', '.join(str(weight) for weight in weights.values())})"
+        matches = f"SELECT rowid AS id, {score} AS score FROM {table}_fts WHERE {table}_fts MATCH :fts_query"
+        row_key = f"({score}, '{hit_type}', rowid)"
+    else:
+        document = _pg_document(table)
+        score = f"-ts_rank({document}, to_tsquery('simple', :fts_query))"
+        matches = f"SELECT id, {score} AS score FROM {table} WHERE {document} @@ to_tsquery('simple', :fts_query)"
+        row_key = f"({score}, '{hit_type}', id)"
+    if keyset:
+        matches += f" AND {row_key} > (:after_score, :after_type, :after_id)"
+    return (
+        f"SELECT '{hit_type}' AS type, t.id AS id, {project_id} AS project_id, t.name AS name, m.score AS score "
+        f"FROM ({matches} ORDER BY score, id LIMIT :limit) m JOIN {table} t ON t.id = m.id"
+    )
+
+
+def _dialect_query(db: Session, tokens: List[str]) -> Tuple[str, str]:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return dialect, fts5_query(tokens)
+    if dialect == "postgresql":
+        return dialect, tsquery(tokens)
+    raise HTTPException(501, f"Search is not supported on {dialect}")
+
+
+def search(db: Session, q: str, hit_type: Optional[str], limit: int, after: Optional[str]) -> schemas.SearchPage:
+    """One page of hits for `q`, best first, ordered by (score, type, id)."""
+    tokens = query_tokens(q)
+    if not tokens:
+        return schemas.SearchPage(hits=[], next_cursor=None)
+    dialect, fts_query = _dialect_query(db, tokens)
+    tables = [table for table, (type_, _) in SEARCHABLE.items() if hit_type in (None, type_)]
+    params = {"fts_query": fts_query, "limit": limit + 1}
+    if after is not None:
+        key, last_id = decode_cursor(after, "rank")
+        if not (isinstance(key, list) and len(key) == 2 and isinstance(key[0], (int, float))
+                and key[1] in ("task", "project")):
+            raise HTTPException(400, "Invalid cursor")
+        params.update(after_score=key[0], after_type=key[1], after_id=last_id)
+    union = " UNION ALL ".join(
+        f"SELECT * FROM ({_hits_sql(dialect, table, after is not None)})" for table in tables
+    )
+    rows = db.execute(text(f"SELECT * FROM ({union}) hits ORDER BY score, type, id LIMIT :limit"), params).all()
+
+    hits = [schemas.SearchHit(**row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = hits[-1]
+        next_cursor = encode_cursor("rank", [last.score, last.type], last.id)
+    return schemas.SearchPage(hits=hits, next_cursor=next_cursor)
+
+
+def project_match(db: Session, q: str):
+    """Filter criterion on Project for `q`, for list_projects; None when `q` has no words."""
+    tokens = query_tokens(q)
+    if not tokens:
+        return None
+    dialect, fts_query = _dialect_query(db, tokens)
+    if dialect == "sqlite":
+        matching = (
+            select(literal_column("rowid"))
+            .select_from(text("projects_fts"))
+            .where(text("projects_fts MATCH :fts_query").bindparams(fts_query=fts_query))
+        )
+        return models.Project.id.in_(matching)
+    document = _pg_document("projects").replace("coalesce(", "coalesce(projects.")
+    return text(f"{document} @@ to_tsquery('simple', :fts_query)").bindparams(fts_query=fts_query)
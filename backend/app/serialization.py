@@ -0,0 +1,55 @@
+# backend/app/serialization.py
+"""
+Fast path for large list responses.
+
+The list endpoints select exactly the columns of their response schema
+as plain row tuples and encode them with orjson. No ORM objects are
+built and no Pydantic models are validated. The bytes are identical to
+what FastAPI would produce from `response_model`. Keys follow the
+schema's field order, the JSON is compact, non-ASCII stays UTF-8, and
+naive datetimes use ISO 8601. test_serialization pins this contract.
+
+The stdlib json module, configured the way FastAPI's JSONResponse is,
+stands in when orjson is not installed.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_columns(schema: Type[BaseModel], model) -> Tuple[Tuple[str, ...], List[Any]]:
+    """(field names, model columns) for `schema`, in the schema's field order."""
+    fields = tuple(schema.model_fields)
+    return fields, [getattr(model, name) for name in fields]
+
+
+def rows_as_dicts(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,233 @@
+# backend/app/task_stats.py
+"""
+Incrementally maintained counters for the /home widgets.
+
+`task_stats` holds the running total / completed counts and
+`task_due_buckets` holds per-day counts of tasks by due date, split into
+complete and not-complete. Write handlers report each task change through
+`record_task_change` inside their own transaction, with the before-state
+read from the row they locked (SELECT ... FOR UPDATE), so concurrent
+writes to one task never count the same transition twice; the "overdue" and
+"completed this week" figures are then summed from the day buckets, with
+only the partial boundary day read from `tasks` through a range query.
+
+Counters are created at startup by `ensure_task_stats` (and by
+`scripts/rebuild_task_stats.py`). Until then writes leave them alone, so
+a fresh or externally seeded database never ends up half counted, and
+`read_widget_metrics` falls back to one aggregate scan. Reads never write,
+so /home can run on a read-only connection.
+"""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, NamedTuple, Optional, Tuple
+from sqlalchemy import Date, Integer, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from . import models, schemas
+from .widgets import compute_widget_metrics
+
+STATS_ROW_ID = 1
+
+
+class TaskState(NamedTuple):
+    status: Optional[str]
+    due_date: Optional[datetime]
+
+
+def task_state(task: models.Task) -> TaskState:
+    return TaskState(task.status, task.due_date)
+
+
+def _bucket(state: Optional[TaskState]):
+    # Tasks without a due date or a status never count as overdue or
+    # completed-this-week, so they have no bucket.
+    if state is None or state.due_date is None or state.status is None:
+        return None
+    return state.due_date.date(), state.status == "complete"
+
+
+def _bump_bucket(db: Session, due_day: date, complete: bool, delta: int) -> None:
+    table = models.TaskDueBucket.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values(due_day=due_day, complete=complete, task_count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.due_day, table.c.complete],
+            set_={"task_count": table.c.task_count + delta},
+        )
+        db.execute(stmt)
+        return
+
+    updated = db.execute(
+        table.update()
+        .where(table.c.due_day == due_day, table.c.complete == complete)
+        .values(task_count=table.c.task_count + delta)
+    ).rowcount
+    if not updated:
+        db.execute(table.insert().values(due_day=due_day, complete=complete, task_count=delta))
+
+
+def _bump_totals(db: Session, total: int, completed: int) -> bool:
+    """Apply deltas to the stats row; False if counters are not initialised yet."""
+    table = models.TaskStats.__table__
+    result = db.execute(
+        table.update()
+        .where(table.c.id == STATS_ROW_ID)
+        .values(
+            total_tasks=table.c.total_tasks + total,
+            completed_tasks=table.c.completed_tasks + completed,
+        )
+    )
+    return result.rowcount > 0
+
+
+def record_task_change(db: Session, before: Optional[TaskState], after: Optional[TaskState]) -> None:
+    """
+    Adjust counters for one task going from `before` to `after`.
+    Pass None for `before` on create and for `after` on delete.
+    """
+    record_task_changes(db, [(before, after)])
+
+
+def record_task_changes(db: Session, changes: Iterable[Tuple[Optional[TaskState], Optional[TaskState]]]) -> None:
+    """
+    Adjust counters for many (before, after) changes at once, issuing one
+    statement per touched day bucket rather than per task.
+    """
+    total = completed = 0
+    bucket_deltas = Counter()
+    for before, after in changes:
+        total += (after is not None) - (before is not None)
+        completed += (after is not None and after.status == "complete") - (
+            before is not None and before.status == "complete"
+        )
+        old_bucket, new_bucket = _bucket(before), _bucket(after)
+        if old_bucket != new_bucket:
+            if old_bucket is not None:
+                bucket_deltas[old_bucket] -= 1
+            if new_bucket is not None:
+                bucket_deltas[new_bucket] += 1
+    bucket_deltas = {bucket: delta for bucket, delta in bucket_deltas.items() if delta}
+    if not total and not completed and not bucket_deltas:
+        return
+    if not _bump_totals(db, total, completed):
+        return
+    for (due_day, complete), delta in sorted(bucket_deltas.items()):
+        _bump_bucket(db, due_day, complete, delta)
+
+
+def record_project_tasks_removed(db: Session, project_id: int) -> None:
+    """Subtract every task of `project_id` before they are bulk deleted."""
+    Task = models.Task
+    is_complete = Task.status == "complete"
+    total, completed = db.query(
+        func.count(Task.id),
+        func.coalesce(func.sum(is_complete.cast(Integer)), 0),
+    ).filter(Task.project_id == project_id).one()
+    if not total or not _bump_totals(db, -total, -completed):
+        return
+    for due_day, complete, count in _bucket_counts(db, Task.project_id == project_id):
+        _bump_bucket(db, due_day, complete, -count)
+
+
+def _bucket_counts(db: Session, *criteria):
+    Task = models.Task
+    due_day = func.date(Task.due_date, type_=Date)
+    is_complete = Task.status == "complete"
+    return (
+        db.query(due_day, is_complete, func.count(Task.id))
+        .filter(Task.due_date != None, Task.status != None, *criteria)
+        .group_by(due_day, is_complete)
+        .all()
+    )
+
+
+def rebuild_task_stats(db: Session) -> None:
+    """Recompute every counter from scratch. The caller commits."""
+    Task = models.Task
+    total, completed = db.query(
+        func.count(Task.id),
+        func.coalesce(func.sum((Task.status == "complete").cast(Integer)), 0),
+    ).one()
+
+    db.query(models.TaskDueBucket).delete(synchronize_session=False)
+    stats = db.get(models.TaskStats, STATS_ROW_ID)
+    if stats is None:
+        stats = models.TaskStats(id=STATS_ROW_ID)
+        db.add(stats)
+    stats.total_tasks = total
+    stats.completed_tasks = completed
+    db.add_all(
+        models.TaskDueBucket(due_day=due_day, complete=bool(complete), task_count=count)
+        for due_day, complete, count in _bucket_counts(db)
+    )
+    db.flush()
+
+
+def check_task_stats(db: Session) -> dict:
+    """
+    Compare the stored counters with a fresh count over `tasks`.
+    Returns {name: (stored, actual)} for every mismatch; empty when consistent.
+    """
+    stats = db.get(models.TaskStats, STATS_ROW_ID)
+    if stats is None:
+        return {}
+    mismatches = {}
+    actual = compute_widget_metrics(db)
+    for name in ("total_tasks", "completed_tasks"):
+        stored = getattr(stats, name)
+        if stored != getattr(actual, name):
+            mismatches[name] = (stored, getattr(actual, name))
+
+    stored_buckets = {
+        (b.due_day, b.complete): b.task_count
+        for b in db.query(models.TaskDueBucket).filter(models.TaskDueBucket.task_count != 0)
+    }
+    actual_buckets = {(d, bool(c)): n for d, c, n in _bucket_counts(db)}
+    for key in stored_buckets.keys() | actual_buckets.keys():
+        stored, expected = stored_buckets.get(key, 0), actual_buckets.get(key, 0)
+        if stored != expected:
+            mismatches[f"due_bucket[{key[0].isoformat()},{'complete' if key[1] else 'open'}]"] = (stored, expected)
+    return mismatches
+
+
+def ensure_task_stats(db: Session) -> None:
+    """Build the counters if they do not exist yet."""
+    if db.get(models.TaskStats, STATS_ROW_ID) is None:
+        rebuild_task_stats(db)
+        db.commit()
+
+
+def read_widget_metrics(db: Session, now: Optional[datetime] = None) -> schemas.HomeWidgetMetrics:
+    """HomeWidgetMetrics from the maintained counters, or a full scan before they exist."""
+    now = now or datetime.utcnow()
+    stats = db.get(models.TaskStats, STATS_ROW_ID)
+    if stats is None:
+        return compute_widget_metrics(db, now)
+
+    Task, Bucket = models.Task, models.TaskDueBucket
+    today_start = datetime.combine(now.date(), time.min)
+    week_ago = now - timedelta(days=7)
+    week_ago_next_day = datetime.combine(week_ago.date() + timedelta(days=1), time.min)
+
+    overdue_whole_days = db.query(func.coalesce(func.sum(Bucket.task_count), 0)).filter(
+        Bucket.complete == False, Bucket.due_day < now.date()
+    ).scalar()
+    overdue_today = db.query(func.count(Task.id)).filter(
+        Task.status != "complete", Task.due_date >= today_start, Task.due_date < now
+    ).scalar()
+
+    week_whole_days = db.query(func.coalesce(func.sum(Bucket.task_count), 0)).filter(
+        Bucket.complete == True, Bucket.due_day > week_ago.date()
+    ).scalar()
+    week_first_day = db.query(func.count(Task.id)).filter(
+        Task.status == "complete", Task.due_date >= week_ago, Task.due_date < week_ago_next_day
+    ).scalar()
+
+    return schemas.HomeWidgetMetrics(
+        total_tasks=stats.total_tasks,
+        completed_tasks=stats.completed_tasks,
+        overdue_tasks=overdue_whole_days + overdue_today,
+        this_week_completed=week_whole_days + week_first_day,
+    )
@@ -0,0 +1,167 @@
+# backend/app/tests/conftest.py
+"""
+Shared database fixtures.
+
+Each test module seeds its own small dataset with a `seed(db)` function
+and loads it before every test through the session-scoped `database`
+fixture:
+
+    @pytest.fixture(autouse=True)
+    def setup_db(database):
+        database.load(seed)
+
+Rebuilding the schema (tables, indexes, FTS triggers) and reseeding
+before every test used to take most of the suite's time. `database`
+avoids that with templates:
+- It builds the empty schema once per session.
+- On the first use of a seed function, it runs the seed and keeps the
+  result as an in-memory SQLite template.
+- Before every test, it copies the template over the test database with
+  the SQLite backup API, a page-level copy of a few hundred KB.
+
+Every test starts from exactly its module's rows, whatever earlier tests
+wrote. Isolation happens at the file, not through a SAVEPOINT around one
+connection. The app reaches the database through several engines (read
+pool, async engine, export threads), and their connections would not
+share an outer transaction.
+
+Under pytest-xdist each worker gets its own database file derived from
+DATABASE_URL (test.db -> test-gw0.db), so workers never interfere. Other
+databases fall back to drop_all/create_all plus the seed before each
+test.
+
+Tests reach the app through the `client` fixture, an httpx AsyncClient
+on the ASGI app.
+
+Tests marked `slow` (e.g. the million-row export) are skipped unless
+they are selected with `-m slow` or RUN_SLOW_TESTS=1 is set.
+"""
+import os
+import sqlite3
+from typing import Callable, Dict, Optional
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.engine import make_url
+
+
+def worker_database_url(url: str, worker: str) -> str:
+    """`url` with the SQLite file name suffixed by the xdist worker id."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return url
+    stem, ext = os.path.splitext(parsed.database)
+    return parsed.set(database=f"{stem}-{worker}{ext}").render_as_string(hide_password=False)
+
+
+# before any app module reads the settings
+if os.environ.get("PYTEST_XDIST_WORKER") and os.environ.get("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = worker_database_url(os.environ["DATABASE_URL"], os.environ["PYTEST_XDIST_WORKER"])
+
+from sqlalchemy.orm import Session
+from app.cache import response_cache
+from app.db import Base, SessionLocal, engine, is_sqlite_file
+from app.instrumentation import instrumentation
+from app.main import app
+
+Seed = Callable[[Session], None]
+
+
+class TemplateDatabase:
+    def __init__(self, db_engine):
+        self.engine = db_engine
+        url = db_engine.url.render_as_string(hide_password=False)
+        self.path = db_engine.url.database if is_sqlite_file(url) else None
+        self._templates: Dict[Optional[Seed], sqlite3.Connection] = {}
+
+    def load(self, seed: Optional[Seed] = None) -> None:
+        """Reset the database to the rows `seed` writes into an empty schema."""
+        if self.path is None:
+            Base.metadata.drop_all(bind=self.engine)
+            Base.metadata.create_all(bind=self.engine)
+            self._run(seed)
+            return
+        template = self._templates.get(seed)
+        if template is not None:
+            self._restore(template)
+            return
+        if None not in self._templates:
+            Base.metadata.drop_all(bind=self.engine)
+            Base.metadata.create_all(bind=self.engine)
+            # drop the free pages of earlier runs; the backup copies them too
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql("VACUUM")
+            self._templates[None] = self._snapshot()
+        else:
+            self._restore(self._templates[None])
+        self._run(seed)
+        self._templates[seed] = self._snapshot()
+
+    def close(self) -> None:
+        for template in self._templates.values():
+            template.close()
+        self._templates.clear()
+
+    @staticmethod
+    def _run(seed: Optional[Seed]) -> None:
+        if seed is None:
+            return
+        with SessionLocal() as db:
+            seed(db)
+            db.commit()
+
+    def _snapshot(self) -> sqlite3.Connection:
+        template = sqlite3.connect(":memory:", check_same_thread=False)
+        source = sqlite3.connect(self.path)
+        try:
+            source.backup(template)
+        finally:
+            source.close()
+        return template
+
+    def _restore(self, template: sqlite3.Connection) -> None:
+        target = sqlite3.connect(self.path, timeout=30)
+        try:
+            template.backup(target)
+        finally:
+            target.close()
+
+
+@pytest.fixture(scope="session")
+def database():
+    templates = TemplateDatabase(engine)
+    yield templates
+    templates.close()
+
+@pytest_asyncio.fixture
+async def client():
+    """An HTTP client on the app, over ASGI (no server)."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True) as ac:
+        yield ac
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache():
+    # Tests seed through SessionLocal directly, which bypasses the write
+    # handlers' invalidation, so never carry entries across tests.
+    response_cache.clear()
+    yield
+
+@pytest.fixture
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", False)
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(instrumentation, "enabled", True)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: large datasets; run with -m slow or RUN_SLOW_TESTS=1")
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_SLOW_TESTS") or "slow" in config.getoption("markexpr"):
+        return
+    skip = pytest.mark.skip(reason="slow; run with -m slow or RUN_SLOW_TESTS=1")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
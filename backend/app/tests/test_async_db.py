@@ -0,0 +1,93 @@
+# backend/app/tests/test_async_db.py
+"""
+The async handlers are built from the sync ones by deps.async_db_endpoint.
+Mount that async variant of every router on its own app, whatever DB_ASYNC
+says, and check it answers exactly like the app under test.
+"""
+import inspect
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+from app.main import app
+from app.config import settings
+from app.db import async_database_url
+from app.deps import async_db_endpoint, get_async_db, get_async_read_db
+from app.routers import home, projects, tasks
+from app import models
+
+pytest.importorskip("aiosqlite" if settings.database_url.startswith("sqlite") else "asyncpg")
+
+def seed(db):
+    db.add_all([models.Project(name="Async"), models.Project(name="Sync")])
+    db.commit()
+    db.add_all([models.Task(project_id=1 + i % 2, name=f"Task {i}", label="bug" if i % 3 else None)
+                for i in range(7)])
+
+@pytest.fixture(autouse=True)
+def setup_db(database, no_response_cache):
+    database.load(seed)
+
+@pytest_asyncio.fixture
+async def async_app():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_database_url(settings.database_url))
+    sessions = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    async def override():
+        async with sessions() as db:
+            yield db
+
+    mirror = FastAPI()
+    for router in (home.router, projects.router, tasks.router):
+        for route in router.routes:
+            endpoint = async_db_endpoint(inspect.unwrap(route.endpoint))
+            assert inspect.iscoroutinefunction(endpoint)
+            mirror.add_api_route(
+                route.path,
+                endpoint,
+                methods=list(route.methods),
+                response_model=route.response_model,
+                status_code=route.status_code,
+                response_model_exclude_unset=route.response_model_exclude_unset,
+            )
+    mirror.dependency_overrides[get_async_db] = override
+    mirror.dependency_overrides[get_async_read_db] = override
+    yield mirror
+    await async_engine.dispose()
+
+def client(target):
+    return AsyncClient(transport=ASGITransport(app=target), base_url="http://test", follow_redirects=True)
+
+@pytest.mark.asyncio
+async def test_async_handlers_match_sync_responses(async_app):
+    requests = [
+        ("GET", "/home", {}),
+        ("GET", "/tasks", {"params": {"label": "bug", "limit": 2}}),
+        ("GET", "/projects", {"params": {"include": "tasks"}}),
+        ("GET", "/projects/2", {}),
+        ("GET", "/projects/99", {}),
+    ]
+    async with client(app) as sync_ac, client(async_app) as async_ac:
+        for method, path, kwargs in requests:
+            expected = await sync_ac.request(method, path, **kwargs)
+            actual = await async_ac.request(method, path, **kwargs)
+            assert actual.status_code == expected.status_code, path
+            assert actual.json() == expected.json(), path
+
+@pytest.mark.asyncio
+async def test_async_writes(async_app):
+    async with client(async_app) as ac:
+        created = await ac.post("/tasks", json={"project_id": 1, "name": "From the loop", "status": "complete"})
+        updated = await ac.patch(f"/tasks/{created.json()['id']}", json={"label": "x" * 300})
+        renamed = await ac.patch("/projects/1", json={"name": "Renamed"})
+        deleted = await ac.delete("/projects/2")
+        home_resp = await ac.get("/home")
+    assert created.status_code == status.HTTP_201_CREATED
+    assert len(updated.json()["label"]) == 255
+    assert renamed.json()["name"] == "Renamed"
+    assert len(renamed.json()["tasks"]) == 5
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert home_resp.json()["widgets"]["total_tasks"] == 5
+    assert home_resp.json()["widgets"]["completed_tasks"] == 1
@@ -0,0 +1,65 @@
+# backend/app/tests/test_benchmarks.py
+from collections import Counter
+import pytest
+from sqlalchemy import select
+from app.db import SessionLocal
+from app import models
+from app.search import search
+from app.task_stats import check_task_stats
+from benchmarks.data import DatasetSpec, TaskSampler, generate
+from benchmarks.results import compare, percentile, summarize
+from benchmarks.runner import asgi_client, run_all
+from benchmarks.scenarios import Context, select as select_scenarios
+
+SPEC = DatasetSpec(projects=10, tasks=2000, anchor="2025-06-01T00:00:00")
+
+def seed(db):
+    generate(db.get_bind(), SPEC)
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+def test_generated_data_is_skewed_and_reproducible():
+    with SessionLocal() as db:
+        per_project = Counter(db.scalars(select(models.Task.project_id)))
+        labels = Counter(db.scalars(select(models.Task.label)))
+        statuses = Counter(db.scalars(select(models.Task.status)))
+        assert check_task_stats(db) == {}
+        # rows written through the bulk path are searchable
+        assert search(db, "homepage", "task", 5, None).hits
+        names = list(db.scalars(select(models.Task.name).order_by(models.Task.id)))
+    assert per_project.most_common(1)[0][0] == 1
+    assert per_project[1] > 4 * per_project[10]
+    assert labels["bug"] > labels["feature"] > labels["data"]
+    assert statuses.most_common(1)[0][0] == "not_started"
+    # a chunk regenerates identically on its own
+    assert [row["name"] for row in TaskSampler(SPEC).rows(0, SPEC.tasks)] == names
+
+@pytest.mark.asyncio
+async def test_asgi_run_reports_latency_and_sql_counts():
+    scenarios = select_scenarios("home,projects,project_detail,tasks_by_label,create_task,bulk_create_tasks")
+    async with asgi_client(response_cache=False) as client:
+        results = await run_all(client, scenarios, Context(SPEC), requests=10, concurrency=4, warmup=1, seed=1)
+    assert list(results) == [s.name for s in scenarios]
+    for name, figures in results.items():
+        assert figures["errors"] == 0, name
+        assert figures["requests"] == 10 and figures["rps"] > 0
+        assert figures["p50_ms"] <= figures["p95_ms"] <= figures["p99_ms"]
+    assert results["projects"]["sql_per_request"] == 1
+    assert results["tasks_by_label"]["sql_per_request"] == 1
+
+def test_unknown_scenario_rejected():
+    with pytest.raises(ValueError, match="Unknown scenario: nope"):
+        select_scenarios("home,nope")
+
+def test_compare_flags_regressions():
+    fast = summarize([0.010] * 100, elapsed=1.0, errors=0, statements=[1] * 100)
+    slow = summarize([0.013] * 100, elapsed=1.3, errors=0, statements=[2] * 100)
+    assert percentile(sorted(range(1, 101)), 95) == 95
+    before = {"meta": {}, "scenarios": {"tasks": fast}}
+    after = {"meta": {}, "scenarios": {"tasks": slow}}
+    assert compare(before, before)["tasks"]["regressions"] == []
+    reasons = compare(before, after, threshold=10)["tasks"]["regressions"]
+    assert reasons == ["req/s -23.1%", "p95 +30.0%", "sql/req 1.0 -> 2.0"]
+    assert compare(before, after, threshold=50)["tasks"]["regressions"] == ["sql/req 1.0 -> 2.0"]
@@ -0,0 +1,89 @@
+# backend/app/tests/test_bulk_tasks.py
+from datetime import datetime, timedelta
+import pytest
+from fastapi import status
+from app.db import SessionLocal
+from app import models
+from app.task_stats import check_task_stats, rebuild_task_stats
+from app.tests.test_projects import StatementCounter
+
+def seed(db):
+    db.add_all([models.Project(name="Import"), models.Project(name="Other")])
+    db.commit()
+    rebuild_task_stats(db)
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+def assert_counters_consistent():
+    db = SessionLocal()
+    try:
+        assert check_task_stats(db) == {}
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_results(client):
+    due = (datetime.utcnow() - timedelta(days=2)).isoformat()
+    items = [
+        {"project_id": 1, "name": "A", "status": "complete", "due_date": due},
+        {"project_id": 99, "name": "Orphan"},
+        {"project_id": 2, "name": "B", "due_date": due},
+    ]
+    resp = await client.post("/tasks/bulk", json={"tasks": items})
+    tasks = (await client.get("/tasks")).json()["tasks"]
+    assert resp.status_code == status.HTTP_200_OK
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == [201, 400, 201]
+    assert results[1]["error"] == "Invalid project_id" and results[1]["id"] is None
+    assert [(t["id"], t["name"]) for t in tasks] == [(results[0]["id"], "A"), (results[2]["id"], "B")]
+    assert_counters_consistent()
+
+@pytest.mark.asyncio
+async def test_bulk_create_statement_count_is_constant(client):
+    async def statements_for(size):
+        items = [{"project_id": 1 + i % 2, "name": f"T{i}", "due_date": datetime(2025, 1, 1 + i % 3).isoformat()}
+                 for i in range(size)]
+        with StatementCounter() as counter:
+            resp = await client.post("/tasks/bulk", json={"tasks": items})
+        assert all(r["status"] == 201 for r in resp.json()["results"])
+        return counter.count
+
+    # project lookup, batched insert, totals, one upsert per due day
+    assert await statements_for(10) == await statements_for(500)
+    assert_counters_consistent()
+
+@pytest.mark.asyncio
+async def test_bulk_update_and_delete(client):
+    created = await client.post("/tasks/bulk", json={"tasks": [
+        {"project_id": 1, "name": f"T{i}", "due_date": "2025-03-0%dT12:00:00" % (i + 1)} for i in range(3)
+    ]})
+    ids = [r["id"] for r in created.json()["results"]]
+
+    updated = await client.patch("/tasks/bulk", json={"tasks": [
+        {"id": ids[0], "status": "complete"},
+        {"id": 999, "name": "Missing"},
+        {"id": ids[1], "label": "x" * 300},
+        {"id": ids[0], "name": "Renamed"},  # applies after the first change
+    ]})
+    assert [r["status"] for r in updated.json()["results"]] == [200, 404, 200, 200]
+    tasks = {t["id"]: t for t in (await client.get("/tasks")).json()["tasks"]}
+    assert tasks[ids[0]]["status"] == "complete" and tasks[ids[0]]["name"] == "Renamed"
+    assert len(tasks[ids[1]]["label"]) == 255
+    assert_counters_consistent()
+
+    deleted = await client.request("DELETE", "/tasks/bulk", json={"ids": [ids[0], 999, ids[2], ids[0]]})
+    assert [r["status"] for r in deleted.json()["results"]] == [204, 404, 204, 404]
+    remaining = (await client.get("/tasks")).json()["tasks"]
+    home = (await client.get("/home")).json()
+    assert [t["id"] for t in remaining] == [ids[1]]
+    assert home["widgets"]["total_tasks"] == 1
+    assert home["widgets"]["completed_tasks"] == 0
+    assert_counters_consistent()
+
+@pytest.mark.asyncio
+async def test_bulk_size_limit(client):
+    empty = await client.post("/tasks/bulk", json={"tasks": []})
+    too_many = await client.request("DELETE", "/tasks/bulk", json={"ids": list(range(1001))})
+    assert empty.status_code == too_many.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
@@ -0,0 +1,96 @@
+# backend/app/tests/test_cache.py
+import time
+import pytest
+from fastapi import status
+from app import models
+from app.cache import ResponseCache, response_cache
+
+def seed(db):
+    db.add(models.Project(name="Cached"))
+    db.commit()
+    db.add(models.Task(project_id=1, name="Task 1"))
+
+def seed_labels(db):
+    seed(db)
+    db.add(models.Task(project_id=1, name="a-complete", label="a", status="complete"))
+    db.add(models.Task(project_id=1, name="weird", label="a&status=complete"))
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+@pytest.mark.asyncio
+async def test_repeated_reads_served_from_cache(client):
+    before = response_cache.stats()
+    first = await client.get("/tasks/", params={"status": "not_started", "limit": 10})
+    # same query, different parameter order
+    second = await client.get("/tasks/", params={"limit": 10, "status": "not_started"})
+    after = response_cache.stats()
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_separators_inside_values_get_their_own_entry(database, client):
+    database.load(seed_labels)
+    first = await client.get("/tasks/?label=a&status=complete")
+    second = await client.get("/tasks/?label=a%26status%3Dcomplete")
+    assert [t["name"] for t in first.json()["tasks"]] == ["a-complete"]
+    assert [t["name"] for t in second.json()["tasks"]] == ["weird"]
+    assert first.headers["etag"] != second.headers["etag"]
+    assert ResponseCache.key_for("/tasks/", [("label", "a&status=complete")]) != \
+        ResponseCache.key_for("/tasks/", [("label", "a"), ("status", "complete")])
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_only_dependent_routes(client):
+    await client.get("/tasks")
+    await client.get("/projects")
+    await client.get("/home")
+    assert response_cache.stats()["entries"] == 3
+
+    # a project write leaves cached task lists alone
+    await client.patch("/projects/1", json={"color": "#fc636b"})
+    assert response_cache.stats()["entries"] == 1
+    hits = response_cache.stats()["hits"]
+    await client.get("/tasks")
+    assert response_cache.stats()["hits"] == hits + 1
+
+    resp = await client.post("/tasks", json={"project_id": 1, "name": "Task 2"})
+    assert resp.status_code == status.HTTP_201_CREATED
+    tasks = (await client.get("/tasks")).json()["tasks"]
+    home = (await client.get("/home")).json()
+    assert [t["name"] for t in tasks] == ["Task 1", "Task 2"]
+    assert home["widgets"]["total_tasks"] == 2
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint(instrumented, client):
+    await client.get("/projects")
+    resp = await client.get("/admin/cache")
+    assert resp.status_code == status.HTTP_200_OK
+    assert {"hits", "misses", "evictions", "entries", "bytes"} <= set(resp.json())
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=10, ttl_seconds=60)
+    for key in ("a", "b"):
+        cache.put(key, ("tasks",), (0,), b"xxx", 200, [])
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", ("tasks",), (0,), b"xxx", 200, [])
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.put("d", ("tasks",), (0,), b"x" * 8, 200, [])
+    assert cache.stats()["bytes"] <= 10
+    assert cache.stats()["evictions"] == 3
+
+def test_ttl_expiry():
+    cache = ResponseCache(max_entries=10, max_bytes=1024, ttl_seconds=0.01)
+    cache.put("a", ("tasks",), (0,), b"{}", 200, [])
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_response_built_before_a_write_is_not_stored():
+    cache = ResponseCache(max_entries=10, max_bytes=1024, ttl_seconds=60)
+    versions = cache.versions_for(("tasks",))
+    cache.invalidate("tasks")  # a write commits while the read is in flight
+    cache.put("a", ("tasks",), versions, b"{}", 200, [])
+    assert cache.get("a") is None
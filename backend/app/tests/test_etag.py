@@ -0,0 +1,89 @@
+# backend/app/tests/test_etag.py
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.db import query_engines
+from app import cache, models
+from app.cache import response_cache
+
+def seed(db):
+    db.add(models.Project(name="Tagged"))
+    db.commit()
+    db.add(models.Task(project_id=1, name="Task 1"))
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_enabled", [True, False])
+async def test_not_modified_without_touching_the_database(cache_enabled, request, client):
+    if not cache_enabled:
+        request.getfixturevalue("no_response_cache")
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    first = await client.get("/tasks/")
+    etag = first.headers["etag"]
+    for serving in query_engines():
+        event.listen(serving, "before_cursor_execute", record)
+    try:
+        second = await client.get("/tasks/", headers={"If-None-Match": etag})
+    finally:
+        for serving in query_engines():
+            event.remove(serving, "before_cursor_execute", record)
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert statements == []
+
+@pytest.mark.asyncio
+async def test_etag_follows_table_versions(client):
+    tasks_etag = (await client.get("/tasks/")).headers["etag"]
+    projects_etag = (await client.get("/projects/")).headers["etag"]
+
+    await client.post("/projects", json={"name": "Another"})
+    # /tasks does not read projects, so its representation is unchanged
+    unchanged = await client.get("/tasks/", headers={"If-None-Match": tasks_etag})
+    changed = await client.get("/projects/", headers={"If-None-Match": projects_etag})
+
+    await client.patch("/tasks/1", json={"status": "complete"})
+    after_task_write = await client.get("/tasks/", headers={"If-None-Match": tasks_etag})
+    assert unchanged.status_code == status.HTTP_304_NOT_MODIFIED
+    assert changed.status_code == status.HTTP_200_OK
+    assert len(changed.json()["projects"]) == 2
+    assert after_task_write.status_code == status.HTTP_200_OK
+    assert after_task_write.headers["etag"] != tasks_etag
+
+@pytest.mark.asyncio
+async def test_etag_depends_on_query_and_clock_sensitive_routes_are_weak(client):
+    plain = await client.get("/tasks/")
+    filtered = await client.get("/tasks/", params={"status": "complete"})
+    home = await client.get("/home/")
+    mismatch = await client.get("/tasks/", headers={"If-None-Match": filtered.headers["etag"]})
+    assert plain.headers["etag"] != filtered.headers["etag"]
+    assert not plain.headers["etag"].startswith("W/")
+    assert home.headers["etag"].startswith("W/")
+    assert home.headers["cache-control"] == "no-cache"
+    assert mismatch.status_code == status.HTTP_200_OK
+
+@pytest.mark.asyncio
+async def test_not_modified_only_within_the_time_bucket(monkeypatch, client):
+    # a write by another worker or a script never bumps this process's versions
+    monkeypatch.setattr(cache, "etag_time_bucket", lambda: 100)
+    etag = (await client.get("/tasks/")).headers["etag"]
+    same_bucket = await client.get("/tasks/", headers={"If-None-Match": etag})
+    monkeypatch.setattr(cache, "etag_time_bucket", lambda: 101)
+    next_bucket = await client.get("/tasks/", headers={"If-None-Match": etag})
+    assert same_bucket.status_code == status.HTTP_304_NOT_MODIFIED
+    assert next_bucket.status_code == status.HTTP_200_OK
+    assert next_bucket.headers["etag"] != etag
+
+@pytest.mark.asyncio
+async def test_etags_disabled(monkeypatch, client):
+    etag = (await client.get("/tasks/")).headers["etag"]
+    monkeypatch.setattr(response_cache, "etags", False)
+    response = await client.get("/tasks/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert "etag" not in response.headers
+    assert response.json()["tasks"]
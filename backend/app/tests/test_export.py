@@ -0,0 +1,137 @@
+# backend/app/tests/test_export.py
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from fastapi import status
+from sqlalchemy import insert
+from app.main import app
+from app.config import settings
+from app.db import engine
+from app.export import EXPORT_BATCH_SIZE
+from app import models
+
+def seed(db):
+    db.add_all([models.Project(name="Reports", color="#3be8b0"), models.Project(name="Old", archived=True)])
+    db.commit()
+    db.add_all([
+        models.Task(project_id=1, name=f"Task {i}", label="bug" if i % 2 else None,
+                    due_date=datetime(2025, 5, 1, 9, 30) + timedelta(days=i), description='quote " and, comma')
+        for i in range(5)
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+@pytest.mark.asyncio
+async def test_ndjson_export_matches_list_endpoint(client):
+    listed = (await client.get("/tasks", params={"label": "bug"})).json()["tasks"]
+    resp = await client.get("/tasks/export", params={"label": "bug"})
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="tasks.ndjson"' in resp.headers["content-disposition"]
+    assert [json.loads(line) for line in resp.text.splitlines()] == listed
+
+@pytest.mark.asyncio
+async def test_csv_export(client):
+    tasks = await client.get("/tasks/export", params={"format": "csv"})
+    projects = await client.get("/projects/export", params={"format": "csv"})
+    all_projects = await client.get("/projects/export", params={"include_archived": True})
+    assert tasks.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(tasks.text)))
+    assert len(rows) == 5
+    assert rows[0]["description"] == 'quote " and, comma'
+    assert rows[0]["due_date"] == "2025-05-01T09:30:00"
+    assert [r["name"] for r in csv.DictReader(io.StringIO(projects.text))] == ["Reports"]
+    assert [json.loads(line)["name"] for line in all_projects.text.splitlines()] == ["Reports", "Old"]
+
+@pytest.mark.asyncio
+async def test_empty_csv_export_has_header(client):
+    resp = await client.get("/tasks/export", params={"format": "csv", "status": "complete"})
+    assert resp.text.splitlines() == ["name,description,status,due_date,assignee,priority,label,id,project_id"]
+
+def anon_rss() -> int:
+    # anonymous memory only: SQLite's mmap of the database file is file-backed
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("RssAnon:"):
+            return int(line.split()[1]) * 1024
+    raise AssertionError("RssAnon missing")
+
+async def stream_get(path: str, on_chunk) -> int:
+    """Drive the ASGI app directly; httpx's ASGITransport buffers whole bodies."""
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [], "http_version": "1.1", "scheme": "http", "root_path": "",
+        "server": ("test", 80), "client": ("test", 1234),
+    }
+    received = False
+    status_code = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            on_chunk(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code
+
+def insert_tasks(total: int, batch: int = 100_000):
+    with engine.begin() as conn:
+        for start in range(0, total, batch):
+            conn.execute(insert(models.Task), [
+                {"project_id": 1, "name": f"Bulk task {i}", "status": "not_started",
+                 "description": "x" * 40, "due_date": datetime(2025, 1, 1) + timedelta(minutes=i)}
+                for i in range(start, min(start + batch, total))
+            ])
+
+@pytest.mark.asyncio
+async def test_export_streams_in_batches():
+    total = 5 * EXPORT_BATCH_SIZE
+    insert_tasks(total)
+    lines, chunks = 0, 0
+
+    def on_chunk(body: bytes):
+        nonlocal lines, chunks
+        lines += body.count(b"\n")
+        chunks += bool(body)
+
+    assert await stream_get("/tasks/export", on_chunk) == status.HTTP_200_OK
+    assert lines == total + 5
+    assert chunks >= 5
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.skipif(not Path("/proc/self/status").exists(), reason="needs /proc to read RSS")
+async def test_million_row_export_memory_is_flat():
+    total = 1_000_000
+    insert_tasks(total)
+    # the SQLite page cache may legitimately fill up to its configured size
+    ceiling = 64 * 1024 * 1024 + (settings.sqlite_cache_size_kib * 1024 if settings.sqlite_tuning else 0)
+    baseline = anon_rss()
+    peak, lines, chunks = baseline, 0, 0
+
+    def on_chunk(body: bytes):
+        nonlocal peak, lines, chunks
+        lines += body.count(b"\n")
+        chunks += 1
+        if chunks % 20 == 0:
+            peak = max(peak, anon_rss())
+
+    assert await stream_get("/tasks/export", on_chunk) == status.HTTP_200_OK
+    peak = max(peak, anon_rss())
+    assert lines == total + 5
+    assert chunks > 100  # actually streamed, not sent as one body
+    assert peak - baseline < ceiling
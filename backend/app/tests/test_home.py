@@ -0,0 +1,66 @@
+# backend/app/tests/test_home.py
+from datetime import datetime, timedelta
+import pytest
+from fastapi import status
+from app.db import SessionLocal
+from app import models
+from app.widgets import compute_widget_metrics
+
+NOW = datetime(2025, 6, 15, 12, 0, 0)
+
+def seed(db):
+    project = models.Project(name="Home Project")
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    db.add_all([
+        # overdue
+        models.Task(project_id=project.id, name="late", status="in_progress", due_date=NOW - timedelta(days=2)),
+        # completed this week
+        models.Task(project_id=project.id, name="done", status="complete", due_date=NOW - timedelta(days=1)),
+        # completed long ago: neither overdue nor this week
+        models.Task(project_id=project.id, name="old", status="complete", due_date=NOW - timedelta(days=30)),
+        # no due date
+        models.Task(project_id=project.id, name="someday", status="not_started"),
+        # due in the future
+        models.Task(project_id=project.id, name="soon", status="not_started", due_date=NOW + timedelta(days=3)),
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+def test_widget_metrics_single_scan():
+    db = SessionLocal()
+    try:
+        metrics = compute_widget_metrics(db, now=NOW)
+    finally:
+        db.close()
+    assert metrics.total_tasks == 5
+    assert metrics.completed_tasks == 2
+    assert metrics.overdue_tasks == 1
+    assert metrics.this_week_completed == 1
+
+def test_widget_metrics_empty_table():
+    db = SessionLocal()
+    try:
+        db.query(models.Task).delete()
+        db.commit()
+        metrics = compute_widget_metrics(db, now=NOW)
+    finally:
+        db.close()
+    assert metrics.model_dump() == {
+        "total_tasks": 0,
+        "completed_tasks": 0,
+        "overdue_tasks": 0,
+        "this_week_completed": 0,
+    }
+
+@pytest.mark.asyncio
+async def test_home_endpoint(client):
+    resp = await client.get("/home")
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert data["widgets"]["total_tasks"] == 5
+    assert len(data["recent_projects"]) == 1
+    assert len(data["my_tasks"]) == 5
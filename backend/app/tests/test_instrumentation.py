@@ -0,0 +1,92 @@
+# backend/app/tests/test_instrumentation.py
+import re
+import time
+import pytest
+from fastapi import status
+from app import models
+from app.instrumentation import Histogram, instrumentation
+from app.tests.test_projects import StatementCounter
+
+def seed(db):
+    db.add(models.Project(name="Timed"))
+    db.commit()
+    db.add_all([models.Task(project_id=1, name=f"Task {i}", description="text " * 40) for i in range(1500)])
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+    instrumentation.metrics.reset()
+    yield
+    instrumentation.profiler.stop()
+
+SERVER_TIMING = re.compile(r'^app;dur=([\d.]+), db;dur=([\d.]+);desc="(\d+) queries"$')
+
+@pytest.mark.asyncio
+async def test_disabled_adds_nothing(monkeypatch, client):
+    monkeypatch.setattr(instrumentation, "enabled", False)
+    resp = await client.get("/tasks")
+    metrics = await client.get("/metrics")
+    profiler = await client.post("/admin/profiler", params={"route": "/tasks/", "interval_ms": 1})
+    cache = await client.get("/admin/cache")
+    assert "server-timing" not in resp.headers
+    # the endpoints are not there at all, so nobody can start a profiler
+    assert metrics.status_code == profiler.status_code == cache.status_code == status.HTTP_404_NOT_FOUND
+    assert instrumentation.profiler.stats()["route"] is None
+
+@pytest.mark.asyncio
+async def test_server_timing_counts_request_statements(instrumented, no_response_cache, client):
+    with StatementCounter() as counter:
+        resp = await client.get("/projects/1")
+    match = SERVER_TIMING.match(resp.headers["server-timing"])
+    assert match, resp.headers["server-timing"]
+    app_ms, db_ms, statements = float(match[1]), float(match[2]), int(match[3])
+    assert statements == counter.count > 0
+    assert 0 < db_ms <= app_ms
+
+@pytest.mark.asyncio
+async def test_metrics_histograms_per_route_template(instrumented, client):
+    for _ in range(3):
+        await client.get("/projects/1")  # served from the response cache after the first
+    await client.get("/projects/999")
+    await client.get("/tasks", params={"limit": 5})
+    resp = await client.get("/metrics")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert 'http_requests_total{method="GET",route="/projects/{project_id}",status="200"} 3' in text
+    assert 'http_requests_total{method="GET",route="/projects/{project_id}",status="404"} 1' in text
+    # the /tasks -> /tasks/ redirect and the request it leads to
+    assert 'http_requests_total{method="GET",route="/tasks/",status="307"} 1' in text
+    assert 'http_requests_total{method="GET",route="/tasks/",status="200"} 1' in text
+    labels = 'method="GET",route="/projects/{project_id}"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+    assert f"http_request_duration_seconds_count{{{labels}}} 4" in text
+    assert f"http_request_db_duration_seconds_count{{{labels}}} 4" in text
+    statements = re.search(rf"http_request_db_statements_total{{{re.escape(labels)}}} (\d+)", text)
+    assert statements and int(statements[1]) > 0
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+@pytest.mark.asyncio
+async def test_profiler_collects_stacks_for_the_chosen_route(instrumented, no_response_cache, client):
+    resp = await client.post("/admin/profiler", params={"route": "/tasks/", "interval_ms": 1})
+    assert resp.json()["route"] == "/tasks"
+    deadline = time.monotonic() + 10
+    profile = ""
+    while "list_tasks" not in profile and time.monotonic() < deadline:
+        await client.get("/tasks/", params={"limit": 500})
+        profile = (await client.get("/admin/profiler")).text
+    # requests to other routes are not sampled on their own
+    for _ in range(3):
+        await client.get("/projects/1")
+    stats = (await client.delete("/admin/profiler")).json()
+    assert stats["route"] is None and stats["samples"] > 0
+    lines = profile.splitlines()
+    assert all(re.match(r"^\S.* \d+$", line) for line in lines)
+    assert any("list_tasks (tasks.py:" in line for line in lines)
+    assert not any("get_project (projects.py:" in line for line in instrumentation.profiler.collapsed().splitlines())
@@ -0,0 +1,81 @@
+# backend/app/tests/test_pagination.py
+from datetime import datetime, timedelta
+import pytest
+from fastapi import status
+from app.db import SessionLocal
+from app import models
+
+BASE = datetime(2025, 1, 1)
+
+def seed(db):
+    db.add_all([models.Project(name=name) for name in ["delta", "alpha", "charlie", "bravo", "echo"]])
+    db.commit()
+    # due dates repeat (ties broken by id) and every third task has none
+    db.add_all([
+        models.Task(
+            project_id=1,
+            name=f"Task {i}",
+            due_date=None if i % 3 == 0 else BASE + timedelta(days=i % 4),
+        )
+        for i in range(1, 23)
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+async def collect(client, path, key, **params):
+    items, after, pages = [], None, 0
+    while True:
+        query = dict(params, **({"after": after} if after else {}))
+        resp = await client.get(path, params=query)
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.json()
+        items += data[key]
+        pages += 1
+        after = data["next_cursor"]
+        if after is None:
+            return items, pages
+
+@pytest.mark.asyncio
+async def test_tasks_paged_by_id(client):
+    tasks, pages = await collect(client, "/tasks", "tasks", limit=5)
+    assert [t["id"] for t in tasks] == list(range(1, 23))
+    assert pages == 5
+
+@pytest.mark.asyncio
+async def test_tasks_paged_by_due_date_nulls_last(client):
+    tasks, _ = await collect(client, "/tasks", "tasks", limit=4, sort="due_date")
+    dated = [t for t in tasks if t["due_date"] is not None]
+    undated = [t for t in tasks if t["due_date"] is None]
+    assert tasks == dated + undated
+    assert [(t["due_date"], t["id"]) for t in dated] == sorted((t["due_date"], t["id"]) for t in dated)
+    assert [t["id"] for t in undated] == [3, 6, 9, 12, 15, 18, 21]
+
+@pytest.mark.asyncio
+async def test_pages_stable_under_concurrent_inserts(client):
+    first = (await client.get("/tasks", params={"limit": 10})).json()
+    # a writer adds rows between page fetches
+    db = SessionLocal()
+    db.add_all([models.Task(project_id=1, name=f"Late {i}") for i in range(3)])
+    db.commit()
+    db.close()
+    everything, _ = await collect(client, "/tasks", "tasks", limit=10)
+    second = (await client.get("/tasks", params={"limit": 10, "after": first["next_cursor"]})).json()
+    ids = [t["id"] for t in first["tasks"] + second["tasks"]]
+    assert ids == list(range(1, 21))
+    assert [t["id"] for t in everything] == list(range(1, 26))
+
+@pytest.mark.asyncio
+async def test_projects_paged_by_name(client):
+    projects, pages = await collect(client, "/projects", "projects", limit=2, sort="name")
+    assert [p["name"] for p in projects] == ["alpha", "bravo", "charlie", "delta", "echo"]
+    assert pages == 3
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(client):
+    page = (await client.get("/tasks", params={"limit": 2, "sort": "due_date"})).json()
+    garbage = await client.get("/tasks", params={"after": "not-a-cursor"})
+    wrong_sort = await client.get("/tasks", params={"after": page["next_cursor"]})
+    assert garbage.status_code == status.HTTP_400_BAD_REQUEST
+    assert wrong_sort.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,94 @@
+# backend/app/tests/test_projection.py
+from datetime import datetime, timedelta
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.db import query_engines
+from app import models
+
+def seed(db):
+    db.add_all([models.Project(name="Alpha", description="first"), models.Project(name="Beta")])
+    db.commit()
+    db.add_all([
+        models.Task(project_id=1 + i % 2, name=f"Task {i}", description="long text " * 20, status="not_started",
+                    due_date=datetime(2025, 1, 1) + timedelta(days=i % 3) if i % 4 else None)
+        for i in range(9)
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database, no_response_cache):
+    database.load(seed)
+
+class SelectCapture:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for serving in query_engines():
+            event.listen(serving, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        for serving in query_engines():
+            event.remove(serving, "before_cursor_execute", self)
+
+@pytest.mark.asyncio
+async def test_task_fields_narrow_select_and_payload(client):
+    with SelectCapture() as capture:
+        resp = await client.get("/tasks", params={"fields": "status,name"})
+    tasks = resp.json()["tasks"]
+    assert len(tasks) == 9
+    # schema order, id always kept
+    assert all(list(t) == ["name", "status", "id"] for t in tasks)
+    select_sql = [s for s in capture.statements if "FROM tasks" in s]
+    assert select_sql and all("description" not in s and "assignee" not in s for s in select_sql)
+
+@pytest.mark.asyncio
+async def test_fields_page_through_a_sort_key_they_leave_out(client):
+    full = (await client.get("/tasks", params={"sort": "due_date"})).json()["tasks"]
+    seen, after = [], None
+    while True:
+        params = {"sort": "due_date", "limit": 2, "fields": "name", **({"after": after} if after else {})}
+        page = (await client.get("/tasks", params=params)).json()
+        seen += page["tasks"]
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert seen == [{"name": t["name"], "id": t["id"]} for t in full]
+
+@pytest.mark.asyncio
+async def test_project_fields_and_embedded_task_fields(client):
+    plain = (await client.get("/projects", params={"fields": "name"})).json()["projects"]
+    nested = (await client.get("/projects", params={"fields": "name,tasks.name"})).json()["projects"]
+    whole_tasks = (await client.get("/projects", params={"fields": "tasks"})).json()["projects"]
+    assert plain == [{"name": "Alpha", "id": 1}, {"name": "Beta", "id": 2}]
+    assert list(nested[0]) == ["name", "id", "tasks"]
+    assert nested[0]["tasks"][0] == {"name": "Task 0", "id": 1}
+    assert len(nested[0]["tasks"]) == 5 and len(nested[1]["tasks"]) == 4
+    assert list(whole_tasks[0]) == ["id", "tasks"] and "description" in whole_tasks[0]["tasks"][0]
+
+@pytest.mark.asyncio
+async def test_home_sections_and_fields(client):
+    with SelectCapture() as capture:
+        resp = await client.get("/home", params={"fields": "my_tasks.name,my_tasks.status"})
+    widgets_only = (await client.get("/home", params={"fields": "widgets.total_tasks"})).json()
+    home = resp.json()
+    assert list(home) == ["my_tasks"]
+    assert all(list(t) == ["name", "status", "id"] for t in home["my_tasks"])
+    # no widget or project queries for sections left out
+    assert len(capture.statements) == 1
+    assert widgets_only == {"widgets": {"total_tasks": 9}}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path,fields", [
+    ("/tasks", "name,secret"),
+    ("/projects", "tasks.bogus"),
+    ("/home", "my_tasks.name,widgets.nope"),
+])
+async def test_unknown_fields_rejected(path, fields, client):
+    resp = await client.get(path, params={"fields": fields})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Unknown field" in resp.json()["detail"]
@@ -0,0 +1,72 @@
+# backend/app/tests/test_projects.py
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.db import SessionLocal, query_engines
+from app import models
+
+# cached responses would hide the statements being counted
+pytestmark = pytest.mark.usefixtures("no_response_cache")
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load()
+
+def seed_projects(count: int, tasks_each: int = 2):
+    db = SessionLocal()
+    for i in range(count):
+        project = models.Project(name=f"Project {i}")
+        project.tasks = [models.Task(name=f"Task {i}.{j}") for j in range(tasks_each)]
+        db.add(project)
+    db.commit()
+    db.close()
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        for serving in query_engines():
+            event.listen(serving, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        for serving in query_engines():
+            event.remove(serving, "before_cursor_execute", self)
+
+async def count_statements(client, path, params=None):
+    with StatementCounter() as counter:
+        resp = await client.get(path, params=params)
+    assert resp.status_code == status.HTTP_200_OK
+    return counter.count, resp.json()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path,params", [
+    ("/projects", None),
+    ("/projects", {"include": "tasks"}),
+    ("/home", None),
+])
+async def test_statement_count_constant_in_project_count(path, params, client):
+    seed_projects(3)
+    await count_statements(client, path, params)  # first /home call builds the widget counters
+    small, _ = await count_statements(client, path, params)
+    seed_projects(30)
+    large, _ = await count_statements(client, path, params)
+    assert small == large
+
+@pytest.mark.asyncio
+async def test_tasks_embedded_only_on_request(client):
+    seed_projects(2, tasks_each=3)
+    _, plain = await count_statements(client, "/projects")
+    _, embedded = await count_statements(client, "/projects", {"include": "tasks"})
+    assert all("tasks" not in p for p in plain["projects"])
+    assert [len(p["tasks"]) for p in embedded["projects"]] == [3, 3]
+    assert {t["name"] for t in embedded["projects"][0]["tasks"]} == {"Task 0.0", "Task 0.1", "Task 0.2"}
+
+@pytest.mark.asyncio
+async def test_unknown_include_rejected(client):
+    resp = await client.get("/projects", params={"include": "owners"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
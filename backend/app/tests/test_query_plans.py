@@ -0,0 +1,148 @@
+# backend/app/tests/test_query_plans.py
+"""
+Run every statement the routers issue through EXPLAIN QUERY PLAN against a
+seeded SQLite database and fail if one of them falls back to a full table
+scan.
+
+The only scans accepted are unfiltered walks in primary-key order that stop
+early: the statement has a LIMIT, SQLite needs no temp B-tree to sort, and
+no WHERE condition touches the scanned table. A filtered scan may read the
+whole table before it fills one page, so it must be a SEARCH on an index.
+"""
+import re
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app.db import engine, query_engines
+from app import models
+from app.task_stats import rebuild_task_stats
+
+pytestmark = [
+    pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite syntax"),
+    # cached responses would hide the statements behind them
+    pytest.mark.usefixtures("no_response_cache"),
+]
+
+READS = [
+    ("/home", {}),
+    ("/tasks", {}),
+    ("/tasks", {"project_id": 1}),
+    ("/tasks", {"project_id": 1, "status": "complete"}),
+    ("/tasks", {"status": "in_progress"}),
+    ("/tasks", {"label": "bug"}),
+    ("/tasks", {"sort": "due_date", "limit": 5}),
+    ("/projects", {}),
+    ("/projects", {"sort": "name", "limit": 2}),
+    ("/projects", {"include": "tasks"}),
+    ("/projects", {"include_archived": True}),
+    ("/projects/1", {}),
+]
+
+def seed(db):
+    db.add_all([models.Project(name=f"Project {i}", archived=i == 3) for i in range(1, 5)])
+    db.commit()
+    now = datetime.utcnow()
+    db.add_all([
+        models.Task(
+            project_id=1 + i % 4,
+            name=f"Task {i}",
+            status=("not_started", "in_progress", "complete")[i % 3],
+            label=("bug", "feature", None)[i % 3],
+            due_date=None if i % 5 == 0 else now + timedelta(days=i % 20 - 10),
+        )
+        for i in range(60)
+    ])
+    db.commit()
+    rebuild_task_stats(db)
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+class StatementRecorder:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        for serving in query_engines():
+            event.listen(serving, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        for serving in query_engines():
+            event.remove(serving, "before_cursor_execute", self)
+
+def full_scans(statement, parameters):
+    raw = engine.raw_connection()
+    try:
+        plan = [row[3] for row in raw.cursor().execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+    finally:
+        raw.close()
+    scans = [
+        step for step in plan
+        if step.startswith("SCAN ") and "INDEX" not in step and step != "SCAN CONSTANT ROW"
+    ]
+    early_exit = " LIMIT " in statement.upper() and not any("TEMP B-TREE" in step for step in plan)
+    return [step for step in scans if not (early_exit and unfiltered(step.split()[1], statement))]
+
+def unfiltered(table, statement):
+    """No WHERE clause of `statement` refers to `table`'s columns."""
+    return not any(
+        re.search(rf"\b{re.escape(table)}\.", re.split(r"\b(?:ORDER BY|GROUP BY|LIMIT)\b", clause, flags=re.I)[0])
+        for clause in re.split(r"\bWHERE\b", statement, flags=re.I)[1:]
+    )
+
+async def record(client, requests):
+    with StatementRecorder() as recorder:
+        for method, path, kwargs in requests:
+            resp = await client.request(method, path, **kwargs)
+            assert resp.status_code < 400, (method, path, resp.text)
+            body = resp.json() if resp.content else {}
+            # follow cursors so later pages (and the NULL due-date tail) are covered too
+            while isinstance(body, dict) and body.get("next_cursor"):
+                params = dict(kwargs.get("params", {}), after=body["next_cursor"])
+                resp = await client.request(method, path, params=params)
+                body = resp.json()
+    assert recorder.statements
+    return recorder.statements
+
+def assert_no_full_scans(statements):
+    offenders = {
+        statement: scans
+        for statement, parameters in statements
+        if (scans := full_scans(statement, parameters))
+    }
+    assert not offenders, "full table scans:\n" + "\n\n".join(
+        f"{', '.join(scans)}\n{statement}" for statement, scans in offenders.items()
+    )
+
+@pytest.mark.asyncio
+async def test_read_queries_use_indexes(client):
+    statements = await record(client, [("GET", path, {"params": params}) for path, params in READS])
+    assert_no_full_scans(statements)
+
+@pytest.mark.asyncio
+async def test_write_queries_use_indexes(client):
+    statements = await record(client, [
+        ("POST", "/tasks", {"json": {"project_id": 1, "name": "new", "status": "complete",
+                                     "due_date": datetime.utcnow().isoformat()}}),
+        ("PATCH", "/tasks/2", {"json": {"status": "complete", "label": "bug"}}),
+        ("POST", "/projects", {"json": {"name": "Another"}}),
+        ("PATCH", "/projects/1", {"json": {"color": "#3be8b0"}}),
+        ("DELETE", "/projects/2", {}),
+    ])
+    assert_no_full_scans(statements)
+
+def test_only_unfiltered_primary_key_walks_are_exempt():
+    page = "SELECT tasks.id FROM tasks{} ORDER BY tasks.id LIMIT ?"
+    assert full_scans(page.format(""), (5,)) == []
+    assert full_scans(page.format(" WHERE tasks.description = ?"), ("x", 5)) == ["SCAN tasks"]
+    assert full_scans(page.format(" WHERE tasks.project_id = ?"), (1, 5)) == []  # SEARCH on an index
+
+def test_models_declare_access_path_indexes():
+    task_indexes = {tuple(c.name for c in ix.columns) for ix in models.Task.__table__.indexes}
+    assert {("project_id", "status"), ("status", "due_date"), ("label",), ("due_date",)} <= task_indexes
@@ -0,0 +1,82 @@
+# backend/app/tests/test_search.py
+import pytest
+from fastapi import status
+from app import models
+from app.search import fts5_query, query_tokens, tsquery
+
+def seed(db):
+    db.add_all([
+        models.Project(name="Website relaunch", description="New marketing site"),
+        models.Project(name="Billing", description="Invoices for the website"),
+        models.Project(name="Website archive", archived=True),
+    ])
+    db.commit()
+    db.add_all([
+        models.Task(project_id=1, name="Design website header"),
+        models.Task(project_id=1, name="Copy review", description="Proofread the website copy"),
+        models.Task(project_id=2, name="Send invoices", label="website"),
+        models.Task(project_id=2, name="Café menu", description="Crème brûlée"),
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+async def hits(client, **params):
+    resp = await client.get("/search", params=params)
+    assert resp.status_code == status.HTTP_200_OK
+    return [(h["type"], h["name"]) for h in resp.json()["hits"]]
+
+def test_query_syntax_is_never_user_controlled():
+    tokens = query_tokens('web* "OR" NEAR(x')
+    assert tokens == ["web", "or", "near", "x"]
+    assert fts5_query(tokens) == '"web" "or" "near" "x"*'
+    assert tsquery(tokens) == "web & or & near & x:*"
+
+@pytest.mark.asyncio
+async def test_ranking_name_before_label_before_description(client):
+    tasks = await hits(client, q="website", type="task")
+    everything = await hits(client, q="website")
+    assert tasks == [("task", "Design website header"), ("task", "Send invoices"), ("task", "Copy review")]
+    assert {("project", "Website relaunch"), ("project", "Billing"), ("project", "Website archive")} <= set(everything)
+    assert len(everything) == 6
+
+@pytest.mark.asyncio
+async def test_every_word_must_match_and_last_is_a_prefix(client):
+    assert await hits(client, q="website head") == [("task", "Design website header")]
+    assert await hits(client, q="creme brulee") == [("task", "Café menu")]
+    assert await hits(client, q='"))(*') == []
+
+@pytest.mark.asyncio
+async def test_pagination_walks_the_ranking(client):
+    full = (await client.get("/search", params={"q": "website"})).json()["hits"]
+    seen, after = [], None
+    while True:
+        params = {"q": "website", "limit": 2, **({"after": after} if after else {})}
+        page = (await client.get("/search", params=params)).json()
+        seen += page["hits"]
+        after = page["next_cursor"]
+        if after is None:
+            break
+    bad = await client.get("/search", params={"q": "website", "after": "garbage"})
+    assert seen == full
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.asyncio
+async def test_index_follows_writes(client):
+    await client.patch("/tasks/1", json={"name": "Design landing hero"})
+    await client.post("/tasks/bulk", json={"tasks": [{"project_id": 2, "name": "Hero image"}]})
+    await client.patch("/projects/2", json={"description": "Invoices"})
+    await client.delete("/projects/1")
+    assert await hits(client, q="hero") == [("task", "Hero image")]
+    assert await hits(client, q="website", type="project") == [("project", "Website archive")]
+    assert await hits(client, q="website", type="task") == [("task", "Send invoices")]
+
+@pytest.mark.asyncio
+async def test_projects_q_filter(client):
+    resp = await client.get("/projects", params={"q": "website"})
+    archived = await client.get("/projects", params={"q": "website", "include_archived": True, "sort": "name"})
+    blank = await client.get("/projects", params={"q": "  "})
+    assert [p["name"] for p in resp.json()["projects"]] == ["Website relaunch", "Billing"]
+    assert [p["name"] for p in archived.json()["projects"]] == ["Billing", "Website archive", "Website relaunch"]
+    assert len(blank.json()["projects"]) == 2
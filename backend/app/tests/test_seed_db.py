@@ -0,0 +1,50 @@
+# backend/app/tests/test_seed_db.py
+import sqlite3
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+from app import models
+from app.search import search
+from app.task_stats import check_task_stats
+from benchmarks import data
+from benchmarks.data import DatasetSpec, TaskSampler
+from scripts import seed_db
+
+SPEC = DatasetSpec(projects=20, tasks=1200, anchor="2025-06-01T00:00:00")
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # several chunks and shards without generating millions of rows
+    monkeypatch.setattr(data, "CHUNK_SIZE", 100)
+    monkeypatch.setattr(seed_db, "SHARD_ROWS", 500)
+
+def seeded(path, workers):
+    seed_db.seed_sqlite(str(path), SPEC, workers=workers, transaction_rows=300, search_index=True)
+    return create_engine(f"sqlite:///{path}", future=True)
+
+def test_bulk_load_reads_back_like_orm_rows(tmp_path):
+    engine = seeded(tmp_path / "seed.db", workers=1)
+    expected = [row for start, stop in data.chunks(SPEC.tasks) for row in TaskSampler(SPEC).rows(start, stop)]
+    with Session(engine) as db:
+        tasks = db.scalars(select(models.Task).order_by(models.Task.id)).all()
+        assert [{c: getattr(t, c) for c in data.TASK_COLUMNS} for t in tasks] == expected
+        assert db.query(models.Project).count() == SPEC.projects
+        assert check_task_stats(db) == {}
+        assert search(db, "homepage", "task", 5, None).hits
+        # datetimes are stored in the ORM's format, so range filters still work
+        due = [t.due_date for t in tasks if t.due_date is not None]
+        cutoff = sorted(due)[len(due) // 2]
+        assert db.query(models.Task).filter(models.Task.due_date < cutoff).count() == sum(d < cutoff for d in due)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("tasks")}
+    assert {index.name for index in models.Task.__table__.indexes} <= indexes
+    engine.dispose()
+
+def test_parallel_shards_write_the_same_rows(tmp_path):
+    dumps = []
+    for workers in (1, 2):
+        seeded(tmp_path / f"w{workers}.db", workers).dispose()
+        conn = sqlite3.connect(tmp_path / f"w{workers}.db")
+        dumps.append(conn.execute("SELECT * FROM tasks ORDER BY id").fetchall())
+        conn.close()
+    assert len(dumps[0]) == SPEC.tasks
+    assert dumps[0] == dumps[1]
@@ -0,0 +1,117 @@
+# backend/app/tests/test_serialization.py
+"""
+Contract for the list endpoints' fast path: the bytes must equal what
+FastAPI produces by validating ORM objects through the response schemas.
+"""
+from datetime import datetime
+import pytest
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import selectinload
+from app.db import SessionLocal
+from app import models, schemas
+from app import serialization
+
+def seed(db):
+    db.add_all([
+        models.Project(name="Ünïcode ✓ 😀", description='quotes " and \\ backslash', color="#3be8b0"),
+        models.Project(name="Control \x01\x1f chars", description=None, color=None),
+        models.Project(name="Archived", archived=True),
+        models.Project(name="Empty project"),
+    ])
+    db.commit()
+    db.add_all([
+        models.Task(project_id=1 + i % 2, name=f"Task {i}   «ok»", description="line\nbreak\ttab" if i % 3 else None,
+                    status=["not_started", "in_progress", "complete", None][i % 4],
+                    due_date=datetime(2025, 1, 1 + i % 28, 9, 30, 0, 123456 * (i % 2)) if i % 5 else None,
+                    assignee="ana@example.com" if i % 2 else None, priority="high" if i % 4 else None,
+                    label="" if i % 7 == 0 else "bug")
+        for i in range(40)
+    ])
+
+@pytest.fixture(autouse=True)
+def setup_db(database, no_response_cache):
+    database.load(seed)
+
+def reference_body(model, exclude_unset=False) -> bytes:
+    """What FastAPI renders for a response_model: validated, dumped in JSON mode, JSONResponse."""
+    return JSONResponse(model.model_dump(mode="json", exclude_unset=exclude_unset)).body
+
+def reference_tasks(rows, next_cursor) -> bytes:
+    return reference_body(schemas.TaskPage(tasks=rows, next_cursor=next_cursor))
+
+def reference_projects(ids, include_tasks, next_cursor) -> bytes:
+    db = SessionLocal()
+    try:
+        projects = db.query(models.Project).options(selectinload(models.Project.tasks)) \
+            .filter(models.Project.id.in_(ids)).all()
+        by_id = {p.id: p for p in projects}
+        out = []
+        for project_id in ids:
+            if include_tasks:
+                out.append(schemas.Project.model_validate(by_id[project_id]))
+            else:
+                summary = schemas.ProjectSummary.model_validate(by_id[project_id])
+                out.append(schemas.Project.model_construct(**summary.model_dump()))
+        return reference_body(schemas.ProjectPage(projects=out, next_cursor=next_cursor), exclude_unset=True)
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {},
+    {"limit": 7},
+    {"sort": "due_date", "limit": 9},
+    {"label": "bug", "status": "complete"},
+])
+async def test_task_list_bytes_match_schema_path(params, client):
+    db = SessionLocal()
+    after = None
+    while True:
+        resp = await client.get("/tasks", params={**params, **({"after": after} if after else {})})
+        page = resp.json()
+        rows = [db.get(models.Task, t["id"]) for t in page["tasks"]]
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.content == reference_tasks(rows, page["next_cursor"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    db.close()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {},
+    {"include": "tasks"},
+    {"include": "tasks", "include_archived": True, "sort": "name", "limit": 2},
+])
+async def test_project_list_bytes_match_schema_path(params, client):
+    after = None
+    while True:
+        resp = await client.get("/projects", params={**params, **({"after": after} if after else {})})
+        page = resp.json()
+        ids = [p["id"] for p in page["projects"]]
+        assert resp.content == reference_projects(ids, "include" in params, page["next_cursor"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    content = {"name": "é \x01   😀", "due_date": datetime(2025, 1, 2, 3, 4, 5, 120), "n": None, "ok": True}
+    fast = serialization.dumps(content)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert serialization.dumps(content) == fast
+
+@pytest.mark.asyncio
+async def test_home_bytes_match_schema_path(client):
+    resp = await client.get("/home")
+    page = resp.json()
+    db = SessionLocal()
+    try:
+        expected = schemas.HomeResponse(
+            widgets=page["widgets"],
+            recent_projects=[db.get(models.Project, p["id"]) for p in page["recent_projects"]],
+            my_tasks=[db.get(models.Task, t["id"]) for t in page["my_tasks"]],
+        )
+    finally:
+        db.close()
+    assert [p["id"] for p in page["recent_projects"]] == [4, 3, 2, 1]
+    assert resp.content == reference_body(expected)
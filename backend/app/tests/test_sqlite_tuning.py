@@ -0,0 +1,80 @@
+# backend/app/tests/test_sqlite_tuning.py
+"""
+The production SQLite profile on a scratch database file: pragmas land on
+every connection, the read pool cannot write, and in WAL mode GET-style
+reads keep completing while a bulk write transaction holds the write lock.
+"""
+import threading
+import time
+import pytest
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.db import Base, create_db_engine
+from app import models
+
+@pytest.fixture
+def tuned_engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sqlite_tuning", True)
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    write_engine = create_db_engine(url)
+    read_engine = create_db_engine(url, read_only=True, pool_size=4)
+    Base.metadata.create_all(bind=write_engine)
+    with write_engine.begin() as conn:
+        conn.execute(insert(models.Project), [{"name": "Load"}])
+        conn.execute(insert(models.Task), [{"project_id": 1, "name": f"Seed {i}"} for i in range(1000)])
+    yield write_engine, read_engine
+    read_engine.dispose()
+    write_engine.dispose()
+
+def test_pragmas_applied(tuned_engines):
+    write_engine, read_engine = tuned_engines
+    with write_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.sqlite_busy_timeout_ms
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -settings.sqlite_cache_size_kib
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 0
+    with read_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM tasks"))
+
+def test_reads_progress_during_bulk_write(tuned_engines):
+    write_engine, read_engine = tuned_engines
+    writing, done = threading.Event(), threading.Event()
+    reads = []  # (latency, count seen) for reads that ran while the write was open
+
+    def bulk_write():
+        with write_engine.begin() as conn:
+            for chunk in range(20):
+                conn.execute(insert(models.Task), [
+                    {"project_id": 1, "name": f"Bulk {chunk}-{i}", "status": "complete"} for i in range(2000)
+                ])
+                writing.set()
+                time.sleep(0.02)
+        done.set()
+
+    def read_loop():
+        writing.wait()
+        while not done.is_set():
+            start = time.perf_counter()
+            with read_engine.connect() as conn:
+                count = conn.execute(select(func.count(models.Task.id))).scalar()
+            if not done.is_set():
+                reads.append((time.perf_counter() - start, count))
+
+    readers = [threading.Thread(target=read_loop) for _ in range(4)]
+    writer = threading.Thread(target=bulk_write)
+    for thread in readers + [writer]:
+        thread.start()
+    for thread in readers + [writer]:
+        thread.join(timeout=60)
+
+    # readers see the last committed snapshot (or, right at the end, the new
+    # one) and never block behind the open write transaction
+    assert {count for _, count in reads} <= {1000, 41000}
+    assert sum(count == 1000 for _, count in reads) >= 20
+    assert max(latency for latency, _ in reads) < 1.0
+    with read_engine.connect() as conn:
+        assert conn.execute(select(func.count(models.Task.id))).scalar() == 41000
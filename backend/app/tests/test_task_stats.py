@@ -0,0 +1,108 @@
+# backend/app/tests/test_task_stats.py
+from datetime import datetime, timedelta
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app.db import SessionLocal
+from app import models
+from app.task_stats import check_task_stats, read_widget_metrics, rebuild_task_stats
+from app.widgets import compute_widget_metrics
+
+def seed(db):
+    db.add_all([models.Project(name="Alpha"), models.Project(name="Beta")])
+    db.commit()
+    rebuild_task_stats(db)
+
+@pytest.fixture(autouse=True)
+def setup_db(database):
+    database.load(seed)
+
+def assert_consistent():
+    db = SessionLocal()
+    try:
+        assert check_task_stats(db) == {}
+        now = datetime.utcnow()
+        assert read_widget_metrics(db, now=now) == compute_widget_metrics(db, now=now)
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_counters_follow_task_writes(client):
+    now = datetime.utcnow()
+    for i, (status_, days) in enumerate([
+        ("not_started", -3),
+        ("in_progress", -1),
+        ("complete", -2),
+        ("complete", -10),
+        ("not_started", 4),
+        ("not_started", None),
+    ]):
+        due = None if days is None else (now + timedelta(days=days)).isoformat()
+        resp = await client.post("/tasks", json={
+            "project_id": 1 + i % 2, "name": f"t{i}", "status": status_, "due_date": due,
+        })
+        assert resp.status_code == status.HTTP_201_CREATED
+    assert_consistent()
+
+    # status transition, due-date move, and both at once
+    await client.patch("/tasks/1", json={"status": "complete"})
+    await client.patch("/tasks/3", json={"due_date": (now - timedelta(days=30)).isoformat()})
+    await client.patch("/tasks/5", json={"status": "complete", "due_date": None})
+    await client.patch("/tasks/6", json={"due_date": (now - timedelta(hours=1)).isoformat()})
+    assert_consistent()
+
+    resp = await client.delete("/projects/2")
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+    assert_consistent()
+
+@pytest.mark.asyncio
+async def test_writes_lock_the_rows_they_count_from(client):
+    # SQLite drops FOR UPDATE, so look at the statements as Postgres would run them
+    selects = []
+    record = lambda state: state.is_select and selects.append(str(state.statement.compile(dialect=postgresql.dialect())))
+    for i in range(2):
+        await client.post("/tasks", json={"project_id": 1, "name": f"t{i}"})
+    event.listen(Session, "do_orm_execute", record)
+    try:
+        await client.patch("/tasks/1", json={"status": "complete"})
+        await client.patch("/tasks/bulk", json={"tasks": [{"id": 2, "status": "complete"}]})
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+    # the before-state reads of the PATCH and of the bulk PATCH (not the refresh after commit)
+    locked = [sql for sql in selects if sql.endswith("FOR UPDATE")]
+    assert len(locked) == 2 and all("FROM tasks" in sql for sql in locked)
+    assert_consistent()
+
+def test_widgets_roll_forward_without_writes():
+    db = SessionLocal()
+    base = datetime(2025, 3, 10, 9, 30)
+    db.add_all([
+        models.Task(project_id=1, name=f"t{h}", status=s, due_date=base + timedelta(hours=h))
+        for h in range(-24 * 9, 24 * 2, 5)
+        for s in ("complete", "in_progress")
+    ])
+    db.commit()
+    rebuild_task_stats(db)
+    db.commit()
+    try:
+        # move "now" across day boundaries; counters are never touched
+        for hours in range(0, 24 * 8, 7):
+            now = base + timedelta(hours=hours)
+            assert read_widget_metrics(db, now=now) == compute_widget_metrics(db, now=now)
+    finally:
+        db.close()
+
+def test_rebuild_repairs_drift():
+    db = SessionLocal()
+    try:
+        db.add(models.Task(project_id=1, name="behind the counters' back", status="complete",
+                           due_date=datetime.utcnow()))
+        db.commit()
+        assert set(check_task_stats(db)) >= {"total_tasks", "completed_tasks"}
+        rebuild_task_stats(db)
+        db.commit()
+        assert check_task_stats(db) == {}
+    finally:
+        db.close()
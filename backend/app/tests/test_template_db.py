@@ -0,0 +1,27 @@
+# backend/app/tests/test_template_db.py
+from app.db import SessionLocal
+from app import models
+from app.tests.conftest import worker_database_url
+
+def seed(db):
+    db.add(models.Project(name="Seeded"))
+
+def project_names():
+    with SessionLocal() as db:
+        return [p.name for p in db.query(models.Project).order_by(models.Project.id)]
+
+def test_load_discards_earlier_writes(database):
+    database.load(seed)
+    with SessionLocal() as db:
+        db.add(models.Project(name="Written by a test"))
+        db.commit()
+    assert project_names() == ["Seeded", "Written by a test"]
+    database.load(seed)
+    assert project_names() == ["Seeded"]
+    database.load()
+    assert project_names() == []
+
+def test_worker_database_url():
+    assert worker_database_url("sqlite:////tmp/test.db", "gw1") == "sqlite:////tmp/test-gw1.db"
+    assert worker_database_url("sqlite:///:memory:", "gw1") == "sqlite:///:memory:"
+    assert worker_database_url("postgresql://u:p@db/app", "gw1") == "postgresql://u:p@db/app"
@@ -0,0 +1,58 @@
+# backend/app/versions.py
+"""
+Per-table data versions.
+
+Every committed write through the routers bumps the version of the
+tables it touched (via `response_cache.invalidate`). A GET response is
+fully determined by its path, its query string and the versions of the
+tables it reads, so those inputs make a strong ETag. The process epoch
+keeps a restarted process, or another worker, from reusing an ETag it
+never issued.
+
+The versions only count writes made by this process. Writes by another
+worker or by a script are invisible to them, so every ETag also carries
+a time bucket (see app.cache), which bounds how long such a write can go
+unnoticed.
+"""
+import hashlib
+import secrets
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class DataVersions:
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def etag(self, key: str, versions: Tuple[int, ...], time_bucket: Optional[int] = None,
+             weak: bool = False) -> str:
+        """
+        ETag for the representation at `key` built from `versions` during
+        `time_bucket`. Responses that also depend on the clock are `weak`,
+        since the same bucket can still differ byte for byte.
+        """
+        raw = f"{key}|{versions}|{time_bucket}".encode()
+        tag = f'"{self.epoch}-{hashlib.blake2b(raw, digest_size=8).hexdigest()}"'
+        return f"W/{tag}" if weak else tag
+
+
+data_versions = DataVersions()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    if not if_none_match:
+        return False
+    ours = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == ours for candidate in if_none_match.split(","))
@@ -0,0 +1,37 @@
+# backend/app/widgets.py
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from . import models, schemas
+
+
+def _count_if(condition):
+    # SUM(CASE WHEN ... THEN 1 ELSE 0 END); NULL on an empty table, hence COALESCE.
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_widget_metrics(db: Session, now: Optional[datetime] = None) -> schemas.HomeWidgetMetrics:
+    """
+    Compute every HomeWidgetMetrics figure in a single conditional-aggregate
+    scan over tasks instead of one COUNT(*) round trip per widget.
+    """
+    now = now or datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+
+    Task = models.Task
+    is_complete = Task.status == "complete"
+    row = db.query(
+        func.count(Task.id),
+        _count_if(is_complete),
+        _count_if((Task.due_date < now) & (Task.status != "complete") & (Task.due_date != None)),
+        _count_if(is_complete & (Task.due_date >= week_ago)),
+    ).one()
+
+    total_tasks, completed_tasks, overdue_tasks, this_week_completed = row
+    return schemas.HomeWidgetMetrics(
+        total_tasks=total_tasks,
+        completed_tasks=completed_tasks,
+        overdue_tasks=overdue_tasks,
+        this_week_completed=this_week_completed,
+    )
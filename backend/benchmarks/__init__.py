@@ -0,0 +1,18 @@
+# backend/benchmarks/__init__.py
+"""
+Throughput benchmarks for the API.
+
+    cd backend
+    python -m benchmarks seed --db /tmp/bench.db --projects 200 --tasks 200000
+    python -m benchmarks run --db /tmp/bench.db --target asgi --out before.json
+    python -m benchmarks run --db /tmp/bench.db --target uvicorn --out after.json
+    python -m benchmarks compare before.json after.json
+
+`data` builds a synthetic database with skewed distributions. `scenarios`
+scripts the requests. `runner` drives the requests through an in-process
+ASGI client or a real uvicorn process. `results` summarizes them as JSON
+(req/s, p50/p95/p99, SQL statements per request) and compares two runs.
+
+For millions of rows, build the database with `python -m scripts.seed_db`
+instead; `run --db` accepts its output directly.
+"""
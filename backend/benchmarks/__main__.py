@@ -0,0 +1,162 @@
+# backend/benchmarks/__main__.py
+"""
+Command line for the benchmark package.
+
+    python -m benchmarks seed --db PATH [--projects N] [--tasks N] [--seed N]
+    python -m benchmarks run --db PATH --target asgi|uvicorn [--out FILE]
+    python -m benchmarks compare BEFORE.json AFTER.json [--threshold PCT]
+
+`seed` writes the database and a PATH.spec.json file next to it. `run`
+seeds PATH first if it does not exist yet. It works on a scratch copy,
+so the write scenarios never change the seeded file, and every run
+(and every commit compared) starts from the same rows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import fields
+
+
+def sqlite_url(path: str) -> str:
+    return f"sqlite:///{os.path.abspath(path)}"
+
+
+def spec_path(db_path: str) -> str:
+    return f"{db_path}.spec.json"
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--project-skew", type=float, default=1.1)
+    parser.add_argument("--label-skew", type=float, default=1.2)
+
+
+def seed_database(args) -> dict:
+    # app modules read DATABASE_URL on import
+    os.environ.setdefault("DATABASE_URL", sqlite_url(args.db))
+    from sqlalchemy import create_engine
+    from app.db import Base
+    from .data import DatasetSpec, generate
+
+    spec = DatasetSpec(projects=args.projects, tasks=args.tasks, seed=args.seed,
+                       project_skew=args.project_skew, label_skew=args.label_skew)
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    started = time.perf_counter()
+    engine = create_engine(sqlite_url(args.db), future=True)
+    Base.metadata.create_all(bind=engine)
+    generate(engine, spec)
+    engine.dispose()
+    with open(spec_path(args.db), "w") as f:
+        json.dump(spec.as_dict(), f, indent=2)
+    print(f"seeded {args.db}: {spec.projects:,} projects, {spec.tasks:,} tasks "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return spec.as_dict()
+
+
+def cmd_seed(args) -> int:
+    seed_database(args)
+    return 0
+
+
+def cmd_run(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        work_db = os.path.join(tmp, "bench.db")
+        os.environ["DATABASE_URL"] = sqlite_url(work_db)
+        if not os.path.exists(args.db):
+            seed_database(args)
+        with open(spec_path(args.db)) as f:
+            spec_values = json.load(f)
+        shutil.copyfile(args.db, work_db)
+
+        from . import results
+        from .data import DatasetSpec
+        from .runner import asgi_client, http_client, run_all, uvicorn_server
+        from .scenarios import Context, select
+
+        spec = DatasetSpec(**{f.name: spec_values[f.name] for f in fields(DatasetSpec) if f.name in spec_values})
+        context = Context(spec)
+        scenarios = select(args.scenarios)
+        options = dict(requests=args.requests, concurrency=args.concurrency, warmup=args.warmup, seed=args.seed)
+
+        async def run_asgi():
+            async with asgi_client(args.response_cache) as client:
+                return await run_all(client, scenarios, context, **options)
+
+        async def run_http(base_url):
+            async with http_client(base_url, args.concurrency) as client:
+                return await run_all(client, scenarios, context, **options)
+
+        if args.target == "asgi":
+            scenario_results = asyncio.run(run_asgi())
+        else:
+            with uvicorn_server(sqlite_url(work_db), args.response_cache, args.workers) as base_url:
+                scenario_results = asyncio.run(run_http(base_url))
+
+    result = {
+        "meta": results.run_meta(
+            target=args.target,
+            dataset=spec.as_dict(),
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            workers=args.workers if args.target == "uvicorn" else None,
+            response_cache=args.response_cache,
+            env={name: os.environ[name] for name in ("DB_ASYNC", "SQLITE_TUNING") if name in os.environ},
+        ),
+        "scenarios": scenario_results,
+    }
+    print(results.table(result))
+    if args.out:
+        results.write(args.out, result)
+        print(f"wrote {args.out}", file=sys.stderr)
+    return 1 if any(s["errors"] for s in scenario_results.values()) else 0
+
+
+def cmd_compare(args) -> int:
+    from .results import main_compare
+
+    return main_compare(args.before, args.after, args.threshold)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="generate a synthetic database")
+    seed.add_argument("--db", required=True)
+    add_spec_arguments(seed)
+    seed.set_defaults(func=cmd_seed)
+
+    run = commands.add_parser("run", help="run the scenarios and report req/s, latency percentiles and SQL counts")
+    run.add_argument("--db", required=True, help="seeded database (created with the spec options if missing)")
+    add_spec_arguments(run)
+    run.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    run.add_argument("--scenarios", help="comma-separated subset, in run order")
+    run.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    run.add_argument("--warmup", type=int, default=20)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    run.add_argument("--response-cache", action="store_true", help="leave the response cache on")
+    run.add_argument("--out", help="write the results as JSON")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="compare two result files; exit 1 on regressions")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
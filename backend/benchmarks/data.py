@@ -0,0 +1,172 @@
+# backend/benchmarks/data.py
+"""
+Synthetic projects and tasks with skewed distributions.
+
+Real workspaces are lopsided: a few projects hold most of the tasks, a
+handful of labels and assignees cover most of the rows, and most tasks
+are still open. Uniform data hides the plans and page sizes that matter,
+so every choice here is drawn from a Zipf-like or weighted distribution.
+
+Rows are generated in chunks of CHUNK_SIZE ids. Each chunk's random
+stream is seeded from `(spec.seed, chunk start)`, so chunks can be
+produced independently and in any order, and the same spec always yields
+the same database.
+"""
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app import models
+from app.search import SEARCHABLE, drop_search_index, ensure_search_index
+from app.task_stats import rebuild_task_stats
+
+LABELS = [
+    "bug", "feature", "design", "marketing", "backend", "frontend", "research",
+    "ops", "legal", "finance", "hiring", "docs", "security", "mobile", "data",
+]
+PRIORITIES = ["low", "medium", "high"]
+COLORS = ["#3be8b0", "#fc636b", "#6a67ce", "#ffb900", "#1aafd0", "#aa71ff"]
+VERBS = ["Draft", "Review", "Ship", "Fix", "Plan", "Design", "Migrate", "Test", "Write", "Audit"]
+NOUNS = ["homepage", "onboarding", "invoice flow", "API docs", "launch plan", "dashboard",
+         "billing", "search", "roadmap", "release notes", "signup form", "analytics"]
+
+CHUNK_SIZE = 20_000
+
+
+@dataclass
+class DatasetSpec:
+    projects: int = 200
+    tasks: int = 100_000
+    seed: int = 1
+    # Zipf exponents: larger means more rows on the first few values
+    project_skew: float = 1.1
+    label_skew: float = 1.2
+    assignee_skew: float = 1.0
+    assignees: int = 50
+    status_weights: Dict[str, float] = field(
+        default_factory=lambda: {"not_started": 0.5, "in_progress": 0.2, "complete": 0.3}
+    )
+    unlabeled_share: float = 0.2
+    no_due_date_share: float = 0.2
+    archived_share: float = 0.05
+    # due dates spread around this day; defaults to today at generation time
+    anchor: str = ""
+
+    def __post_init__(self):
+        if not self.anchor:
+            self.anchor = datetime.combine(datetime.utcnow().date(), time.min).isoformat()
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def zipf_cum_weights(n: int, skew: float) -> List[float]:
+    return list(accumulate(1 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def project_rows(spec: DatasetSpec) -> List[dict]:
+    rng = random.Random(f"{spec.seed}:projects")
+    return [
+        {
+            "id": i,
+            "name": f"{rng.choice(NOUNS).title()} {i}",
+            "description": f"{rng.choice(VERBS)} the {rng.choice(NOUNS)}" if rng.random() < 0.7 else None,
+            "color": rng.choice(COLORS),
+            "archived": rng.random() < spec.archived_share,
+        }
+        for i in range(1, spec.projects + 1)
+    ]
+
+
+# column order of TaskSampler.tuples
+TASK_COLUMNS = ("id", "project_id", "name", "description", "status", "due_date", "assignee", "priority", "label")
+
+
+def _with_none(values: List, weights: List[float], none_share: float) -> Tuple[List, List[float]]:
+    """`values` plus None, weighted so that None is drawn `none_share` of the time."""
+    total = sum(weights)
+    scaled = [w / total * (1 - none_share) for w in weights]
+    return values + [None], list(accumulate(scaled + [none_share]))
+
+
+class TaskSampler:
+    """
+    Draws task column values from a spec's distributions. Every column of
+    a chunk is drawn in one `choices` call from a precomputed table, which
+    keeps generation at a few microseconds per row.
+    """
+
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        anchor = datetime.fromisoformat(spec.anchor)
+        self.project_ids = list(range(1, spec.projects + 1))
+        self.project_weights = zipf_cum_weights(spec.projects, spec.project_skew)
+        self.statuses = list(spec.status_weights)
+        self.status_weights = list(accumulate(spec.status_weights.values()))
+        self.labels = _with_none(LABELS, [1 / r ** spec.label_skew for r in range(1, len(LABELS) + 1)],
+                                 spec.unlabeled_share)
+        assignees = [f"user{i}@example.com" for i in range(spec.assignees)]
+        self.assignees = _with_none(assignees, [1 / r ** spec.assignee_skew for r in range(1, spec.assignees + 1)], 0.2)
+        self.priorities = _with_none(PRIORITIES, [1, 1, 1], 0.4)
+        notes = [f"Notes on {noun}" for noun in NOUNS]
+        self.descriptions = _with_none(notes, [1] * len(notes), 0.6)
+        # due dates: roughly normal around the anchor, finished work mostly
+        # in the past and open work mostly ahead, at one of three times of day
+        days = range(-60, 61)
+        self.due_dates = {}
+        for status in self.statuses:
+            center = -14 if status == "complete" else 10
+            values = [anchor + timedelta(days=d, hours=h) for d in days for h in (9, 12, 17)]
+            weights = [math.exp(-((d - center) / 20) ** 2 / 2) for d in days for _ in range(3)]
+            self.due_dates[status] = _with_none(values, weights, spec.no_due_date_share)
+
+    def tuples(self, start: int, stop: int) -> List[tuple]:
+        """Tasks with ids start+1 .. stop, as tuples in TASK_COLUMNS order."""
+        rng = random.Random(f"{self.spec.seed}:tasks:{start}")
+        n = stop - start
+        draw = lambda table: rng.choices(table[0], cum_weights=table[1], k=n)
+        statuses = rng.choices(self.statuses, cum_weights=self.status_weights, k=n)
+        due_by_status = {status: iter(draw(table)) for status, table in self.due_dates.items()}
+        names = zip(rng.choices(VERBS, k=n), rng.choices(NOUNS, k=n))
+        return [
+            (task_id, project_id, f"{verb} {noun} #{task_id}", description, status,
+             next(due_by_status[status]), assignee, priority, label)
+            for task_id, project_id, (verb, noun), description, status, assignee, priority, label in zip(
+                range(start + 1, stop + 1),
+                rng.choices(self.project_ids, cum_weights=self.project_weights, k=n),
+                names,
+                draw(self.descriptions),
+                statuses,
+                draw(self.assignees),
+                draw(self.priorities),
+                draw(self.labels),
+            )
+        ]
+
+    def rows(self, start: int, stop: int) -> List[dict]:
+        return [dict(zip(TASK_COLUMNS, row)) for row in self.tuples(start, stop)]
+
+
+def chunks(total: int, size: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    size = size or CHUNK_SIZE
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def generate(engine, spec: DatasetSpec) -> None:
+    """Fill `engine`'s (empty, created) schema with `spec`'s data and build the /home counters."""
+    sampler = TaskSampler(spec)
+    with engine.begin() as conn:
+        for table in SEARCHABLE:
+            drop_search_index(conn, table)
+        conn.execute(models.Project.__table__.insert(), project_rows(spec))
+        for start, stop in chunks(spec.tasks):
+            conn.execute(models.Task.__table__.insert(), list(sampler.rows(start, stop)))
+        for table in SEARCHABLE:
+            ensure_search_index(conn, table)
+    with Session(engine) as db:
+        rebuild_task_stats(db)
+        db.commit()
@@ -0,0 +1,150 @@
+# backend/benchmarks/results.py
+"""
+Machine-readable benchmark results and the comparison between two runs.
+
+A result file looks like this:
+
+    {"meta": {"commit": "1ba4c88", "target": "asgi", "dataset": {...}, ...},
+     "scenarios": {"home": {"requests": 500, "errors": 0, "rps": 812.4,
+                            "p50_ms": 9.1, "p95_ms": 14.0, "p99_ms": 18.7,
+                            "mean_ms": 9.6, "sql_per_request": 3.0}, ...}}
+"""
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+# a scenario regresses when it gets slower than this, in percent
+DEFAULT_THRESHOLD = 10.0
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int, statements: List[int]) -> dict:
+    """Figures for one scenario from per-request latencies (seconds) and SQL counts."""
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+        "sql_per_request": round(sum(statements) / len(statements), 2) if statements else None,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def run_meta(**extra) -> dict:
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write(path: str, result: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+        f.write("\n")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def table(result: dict) -> str:
+    lines = [f"{'scenario':<26} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql/req':>8} {'errors':>7}"]
+    for name, s in result["scenarios"].items():
+        sql = "-" if s["sql_per_request"] is None else f"{s['sql_per_request']:.1f}"
+        lines.append(
+            f"{name:<26} {s['rps']:>9.1f} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} "
+            f"{sql:>8} {s['errors']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(before: dict, after: dict, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, dict]:
+    """
+    Per-scenario changes from `before` to `after`. A scenario regresses when
+    req/s drops, or p95 rises, by more than `threshold` percent, when it
+    issues more SQL statements per request, or when it starts failing.
+    """
+    changes = {}
+    for name, old in before["scenarios"].items():
+        new = after["scenarios"].get(name)
+        if new is None:
+            continue
+        rps = _change(old["rps"], new["rps"])
+        p95 = _change(old["p95_ms"], new["p95_ms"])
+        more_sql = (
+            old["sql_per_request"] is not None and new["sql_per_request"] is not None
+            and new["sql_per_request"] > old["sql_per_request"]
+        )
+        reasons = []
+        if rps < -threshold:
+            reasons.append(f"req/s {rps:+.1f}%")
+        if p95 > threshold:
+            reasons.append(f"p95 {p95:+.1f}%")
+        if more_sql:
+            reasons.append(f"sql/req {old['sql_per_request']} -> {new['sql_per_request']}")
+        if new["errors"] > old["errors"]:
+            reasons.append(f"errors {old['errors']} -> {new['errors']}")
+        changes[name] = {"rps_change": round(rps, 1), "p95_change": round(p95, 1), "regressions": reasons}
+    return changes
+
+
+def comparison_table(before: dict, after: dict, changes: Dict[str, dict]) -> str:
+    header = (f"{'scenario':<26} {'req/s':>20} {'change':>8} {'p95 ms':>20} {'change':>8}  "
+              f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    lines = [header]
+    for name, change in changes.items():
+        old, new = before["scenarios"][name], after["scenarios"][name]
+        flag = "  REGRESSION: " + ", ".join(change["regressions"]) if change["regressions"] else ""
+        lines.append(
+            f"{name:<26} {old['rps']:>8.1f} -> {new['rps']:<8.1f} {change['rps_change']:>+7.1f}% "
+            f"{old['p95_ms']:>8.2f} -> {new['p95_ms']:<8.2f} {change['p95_change']:>+7.1f}%{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main_compare(before_path: str, after_path: str, threshold: float) -> int:
+    before, after = load(before_path), load(after_path)
+    changes = compare(before, after, threshold)
+    print(comparison_table(before, after, changes))
+    regressed = [name for name, change in changes.items() if change["regressions"]]
+    if regressed:
+        print(f"{len(regressed)} scenario(s) regressed beyond {threshold}%", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,145 @@
+# backend/benchmarks/runner.py
+"""
+Drive scenarios against the app in-process or over a real socket.
+
+`asgi` sends requests through httpx's ASGITransport into the app object in
+this process. It has no network or server overhead, so it shows
+handler, SQL and serialization cost. `uvicorn` starts the app in a
+separate uvicorn process and sends requests over loopback HTTP, which
+adds the HTTP parser, the event loop and connection handling.
+
+Both targets turn on the instrumentation middleware. The SQL statement
+count of every request comes from its Server-Timing header. The response
+cache is off unless asked for, so every request reaches the database.
+"""
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Iterator, List, Optional
+import httpx
+from .results import summarize
+from .scenarios import Context, Scenario
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def statement_count(response: httpx.Response) -> Optional[int]:
+    match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match[1]) if match else None
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, context: Context,
+                       requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    planned = [scenario.build(rng, context) for _ in range(warmup + requests)]
+    latencies: List[float] = []
+    statements: List[int] = []
+    errors = 0
+
+    async def send(request, record: bool):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            resp = await client.request(request.method, request.url, json=request.json)
+            ok = resp.status_code == scenario.expected_status
+        except httpx.HTTPError:
+            resp, ok = None, False
+        if not record:
+            return
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            errors += 1
+        elif (count := statement_count(resp)) is not None:
+            statements.append(count)
+
+    for request in planned[:warmup]:
+        await send(request, record=False)
+
+    queue = iter(planned[warmup:])
+
+    async def worker():
+        for request in queue:
+            await send(request, record=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors, statements)
+
+
+async def run_all(client: httpx.AsyncClient, scenarios: List[Scenario], context: Context,
+                  requests: int, concurrency: int, warmup: int, seed: int) -> Dict[str, dict]:
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = await run_scenario(client, scenario, context, requests, concurrency, warmup, seed)
+    return results
+
+
+@asynccontextmanager
+async def asgi_client(response_cache: bool):
+    """Client bound to app.main.app in this process (DATABASE_URL must be set before the import)."""
+    from app.cache import response_cache as cache
+    from app.instrumentation import instrumentation
+    from app.main import app
+
+    previous = cache.enabled, instrumentation.enabled
+    cache.enabled, instrumentation.enabled = response_cache, True
+    cache.clear()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+    finally:
+        cache.enabled, instrumentation.enabled = previous
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def uvicorn_server(database_url: str, response_cache: bool, workers: int = 1,
+                   env: Optional[dict] = None) -> Iterator[str]:
+    """Run the app under uvicorn on a free port; yields its base URL."""
+    port = free_port()
+    server_env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        INSTRUMENTATION_ENABLED="true",
+        RESPONSE_CACHE_ENABLED=str(response_cache).lower(),
+        **(env or {}),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=server_env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                httpx.get(f"{base_url}/metrics", timeout=1)
+                break
+            except httpx.TransportError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+@asynccontextmanager
+async def http_client(base_url: str, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        yield client
@@ -0,0 +1,87 @@
+# backend/benchmarks/scenarios.py
+"""
+Scripted requests, one scenario per endpoint shape.
+
+A scenario builds each request from a seeded random stream and the
+dataset spec. Project and task ids therefore follow the same skew as the
+data, and two runs over the same dataset send the same requests. Read
+scenarios come first. The write scenarios come last, so the rows they
+add or change do not shift the numbers of the reads.
+"""
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, List, NamedTuple, Optional
+from .data import LABELS, NOUNS, VERBS, DatasetSpec, zipf_cum_weights
+
+
+class Request(NamedTuple):
+    method: str
+    url: str
+    json: Optional[Any] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[random.Random, "Context"], Request]
+    expected_status: int = 200
+    writes: bool = False
+
+
+class Context:
+    """Ids and values the request builders pick from, skewed like the data."""
+
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        self._project_ids = list(range(1, spec.projects + 1))
+        self._project_weights = zipf_cum_weights(spec.projects, spec.project_skew)
+        self._label_weights = zipf_cum_weights(len(LABELS), spec.label_skew)
+
+    def project_id(self, rng: random.Random) -> int:
+        return rng.choices(self._project_ids, cum_weights=self._project_weights)[0]
+
+    def task_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.spec.tasks)
+
+    def label(self, rng: random.Random) -> str:
+        return rng.choices(LABELS, cum_weights=self._label_weights)[0]
+
+    def status(self, rng: random.Random) -> str:
+        return rng.choice(list(self.spec.status_weights))
+
+    def new_task(self, rng: random.Random) -> dict:
+        return {
+            "project_id": self.project_id(rng),
+            "name": f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+            "status": self.status(rng),
+            "label": self.label(rng),
+        }
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("home", lambda rng, ctx: Request("GET", "/home/")),
+    Scenario("projects", lambda rng, ctx: Request("GET", "/projects/?limit=50")),
+    Scenario("projects_with_tasks", lambda rng, ctx: Request("GET", "/projects/?include=tasks&limit=10")),
+    Scenario("project_detail", lambda rng, ctx: Request("GET", f"/projects/{ctx.project_id(rng)}")),
+    Scenario("tasks", lambda rng, ctx: Request("GET", "/tasks/?limit=50")),
+    Scenario("tasks_by_project_status", lambda rng, ctx: Request(
+        "GET", f"/tasks/?project_id={ctx.project_id(rng)}&status={ctx.status(rng)}&limit=50")),
+    Scenario("tasks_by_label", lambda rng, ctx: Request("GET", f"/tasks/?label={ctx.label(rng)}&limit=50")),
+    Scenario("tasks_by_due_date", lambda rng, ctx: Request("GET", "/tasks/?sort=due_date&limit=50")),
+    Scenario("create_task", lambda rng, ctx: Request("POST", "/tasks/", ctx.new_task(rng)), 201, True),
+    Scenario("update_task", lambda rng, ctx: Request(
+        "PATCH", f"/tasks/{ctx.task_id(rng)}", {"status": ctx.status(rng), "label": ctx.label(rng)}), 200, True),
+    Scenario("bulk_create_tasks", lambda rng, ctx: Request(
+        "POST", "/tasks/bulk", {"tasks": [ctx.new_task(rng) for _ in range(50)]}), 200, True),
+]
+
+
+def select(names: Optional[str]) -> List[Scenario]:
+    """Scenarios named in the comma-separated `names`, in run order; all when empty."""
+    if not names:
+        return list(SCENARIOS)
+    wanted = {name.strip() for name in names.split(",") if name.strip()}
+    unknown = wanted - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown scenario: {', '.join(sorted(unknown))}")
+    return [scenario for scenario in SCENARIOS if scenario.name in wanted]
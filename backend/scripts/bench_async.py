@@ -0,0 +1,127 @@
+# backend/scripts/bench_async.py
+"""
+Load benchmark of the sync (threadpool) and async (DB_ASYNC) database
+paths: requests/sec and tail latency at increasing client concurrency.
+
+Each mode runs in its own uvicorn process over the same seeded SQLite
+file, with the response cache off so every request reaches the database.
+
+    cd backend
+    python -m scripts.bench_async --concurrency 50,100,250,500 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.db import Base
+from scripts.bench_home import seed
+
+PATHS = ["/home/", "/tasks/?limit=50", "/tasks/?status=complete&limit=20", "/projects/?limit=20"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str, db_async: bool, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DB_ASYNC=str(db_async).lower(),
+        RESPONSE_CACHE_ENABLED="false",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/home/", timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def drive(base_url: str, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(PATHS[i % len(PATHS)])
+                    if resp.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--concurrency", default="50,100,250,500")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{db_path}", future=True)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.tasks, datetime.utcnow())
+        engine.dispose()
+
+        print(f"{'mode':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for db_async in (False, True):
+            port = free_port()
+            server = start_server(db_path, db_async, port)
+            try:
+                for concurrency in (int(c) for c in args.concurrency.split(",")):
+                    r = asyncio.run(drive(f"http://127.0.0.1:{port}", concurrency, args.duration))
+                    print(
+                        f"{'async' if db_async else 'sync':<6} {concurrency:>7} {r['rps']:>9.1f} "
+                        f"{r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f} {r['errors']:>7}"
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# backend/scripts/bench_bulk.py
+"""
+Throughput of the bulk task endpoints against one request per task.
+
+Drives the app in-process over ASGI against a scratch SQLite file, so
+every commit is a real fsync-backed transaction.
+
+    cd backend
+    python -m scripts.bench_bulk --tasks 10000 --batch 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'bulk.db')}")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db import Base, SessionLocal, engine
+from app.main import app
+from app import models
+from app.task_stats import check_task_stats, rebuild_task_stats
+
+
+def reset_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add_all([models.Project(name=f"Import {i}") for i in range(10)])
+        db.commit()
+        rebuild_task_stats(db)
+        db.commit()
+
+
+def task_payload(i: int) -> dict:
+    return {
+        "project_id": 1 + i % 10,
+        "name": f"Imported task {i}",
+        "status": "complete" if i % 3 == 0 else "not_started",
+        "due_date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00",
+        "label": "import",
+    }
+
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def single_path(ac: AsyncClient, n: int) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    ids = []
+    for i in range(n):
+        resp = await ac.post("/tasks/", json=task_payload(i))
+        ids.append(resp.json()["id"])
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id in ids:
+        await ac.patch(f"/tasks/{task_id}", json={"status": "in_progress"})
+    timings["update"] = time.perf_counter() - start
+    return timings
+
+
+async def bulk_path(ac: AsyncClient, n: int, batch: int) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    ids = []
+    for chunk in batches([task_payload(i) for i in range(n)], batch):
+        resp = await ac.post("/tasks/bulk", json={"tasks": chunk})
+        ids.extend(r["id"] for r in resp.json()["results"])
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chunk in batches(ids, batch):
+        await ac.patch("/tasks/bulk", json={"tasks": [{"id": i, "status": "in_progress"} for i in chunk]})
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chunk in batches(ids, batch):
+        await ac.request("DELETE", "/tasks/bulk", json={"ids": chunk})
+    timings["delete"] = time.perf_counter() - start
+    return timings
+
+
+async def run(n: int, batch: int):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        reset_db()
+        single = await single_path(ac, n)
+        reset_db()
+        bulk = await bulk_path(ac, n, batch)
+    with SessionLocal() as db:
+        assert check_task_stats(db) == {}, "widget counters drifted"
+
+    print(f"{n} tasks, bulk batches of {batch}")
+    print(f"{'operation':<10} {'single tasks/s':>15} {'bulk tasks/s':>13} {'speedup':>8}")
+    for op in ("create", "update", "delete"):
+        single_rate = f"{n / single[op]:>15.0f}" if op in single else f"{'-':>15}"
+        speedup = f"{single[op] / bulk[op]:>7.1f}x" if op in single else f"{'-':>8}"
+        print(f"{op:<10} {single_rate} {n / bulk[op]:>13.0f} {speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.batch))
+
+
+if __name__ == "__main__":
+    main()
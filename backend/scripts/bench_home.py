@@ -0,0 +1,113 @@
+# backend/scripts/bench_home.py
+"""
+Per-request latency of the /home widget metrics, before (one COUNT(*) per
+widget) and after (single conditional-aggregate scan).
+
+    cd backend
+    python -m scripts.bench_home --sizes 10000,1000000,10000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db import Base
+from app.widgets import compute_widget_metrics
+
+STATUSES = ["not_started", "in_progress", "complete"]
+CHUNK = 100_000
+
+
+def legacy_widget_metrics(db, now):
+    # The pre-aggregation implementation of get_home, kept for comparison.
+    week_ago = now - timedelta(days=7)
+    tasks_q = db.query(models.Task)
+    return (
+        tasks_q.count(),
+        tasks_q.filter(models.Task.status == "complete").count(),
+        tasks_q.filter(
+            models.Task.due_date < now,
+            models.Task.status != "complete",
+            models.Task.due_date != None,
+        ).count(),
+        tasks_q.filter(
+            models.Task.status == "complete",
+            models.Task.due_date >= week_ago,
+        ).count(),
+    )
+
+
+def seed(engine, n_tasks: int, now: datetime) -> None:
+    rng = random.Random(n_tasks)
+    with engine.begin() as conn:
+        conn.execute(models.Project.__table__.insert(), [{"name": "Bench"}])
+        for start in range(0, n_tasks, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, n_tasks)):
+                due = None if i % 5 == 0 else now + timedelta(days=rng.randint(-60, 60))
+                rows.append({
+                    "project_id": 1,
+                    "name": f"task {i}",
+                    "status": rng.choice(STATUSES),
+                    "due_date": due,
+                })
+            conn.execute(models.Task.__table__.insert(), rows)
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_size(n_tasks: int, repeat: int) -> None:
+    now = datetime.utcnow()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", future=True)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, n_tasks, now)
+        Session = sessionmaker(bind=engine, future=True)
+        with Session() as db:
+            before = legacy_widget_metrics(db, now)
+            after = compute_widget_metrics(db, now=now)
+            assert before == (
+                after.total_tasks,
+                after.completed_tasks,
+                after.overdue_tasks,
+                after.this_week_completed,
+            ), "aggregate query disagrees with legacy counts"
+
+            legacy = timed(lambda: legacy_widget_metrics(db, now), repeat)
+            single = timed(lambda: compute_widget_metrics(db, now=now), repeat)
+        engine.dispose()
+
+    for label, samples in (("before (4 x COUNT)", legacy), ("after (1 scan)", single)):
+        print(
+            f"{n_tasks:>10,}  {label:<20} "
+            f"median {statistics.median(samples):9.2f} ms   max {max(samples):9.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,1000000,10000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        bench_size(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
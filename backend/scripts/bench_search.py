@@ -0,0 +1,110 @@
+# backend/scripts/bench_search.py
+"""
+Latency of /search against a LIKE '%term%' scan on a large task corpus.
+
+Seeds a scratch SQLite file with `--tasks` tasks whose names and
+descriptions are drawn from a Zipf-like vocabulary, so the queries cover
+common, rare and multi-word terms. The FTS index is maintained by its
+triggers while seeding.
+
+    cd backend
+    python -m scripts.bench_search --tasks 1000000
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'search.db')}")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+from sqlalchemy import or_
+
+from app.db import Base, SessionLocal, engine
+from app.main import app  # noqa: F401  (registers the search index DDL)
+from app import models
+from app.search import search
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+COMMON = ["design", "review", "invoice", "launch", "website", "billing", "report", "sprint"]
+
+QUERIES = {
+    "common word": "design",
+    "rare word": "word4321",
+    "two words": "review website",
+    "prefix": "laun",
+}
+
+
+def seed(n_tasks: int, batch: int = 50_000) -> float:
+    rng = random.Random(7)
+    # Zipf-ish: low word numbers are far more frequent than high ones
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(models.Project.__table__.insert(), [{"name": f"Project {i}"} for i in range(100)])
+        for offset in range(0, n_tasks, batch):
+            rows = []
+            for i in range(offset, min(offset + batch, n_tasks)):
+                words = rng.choices(VOCABULARY, cum_weights=cum_weights, k=6)
+                rows.append({
+                    "project_id": 1 + i % 100,
+                    "name": f"{rng.choice(COMMON)} {words[0]} {words[1]}",
+                    "description": " ".join(words[2:] + [rng.choice(COMMON)]),
+                    "label": rng.choice([None, "bug", "feature", "chore"]),
+                    "status": "not_started",
+                })
+            conn.execute(models.Task.__table__.insert(), rows)
+    return time.perf_counter() - start
+
+
+def like_scan(db, q: str, limit: int):
+    criteria = [
+        or_(models.Task.name.like(f"%{word}%"), models.Task.description.like(f"%{word}%"),
+            models.Task.label.like(f"%{word}%"))
+        for word in q.split()
+    ]
+    return db.query(models.Task.id).filter(*criteria).order_by(models.Task.id).limit(limit).all()
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seconds = seed(args.tasks)
+    print(f"seeded {args.tasks} tasks (with FTS triggers) in {seconds:.1f}s")
+
+    print(f"{'query':<12} {'hits':>8} {'fts ms':>9} {'page 2 ms':>10} {'like ms':>9}")
+    with SessionLocal() as db:
+        for label, q in QUERIES.items():
+            first = search(db, q, "task", args.limit, None)
+            total = len(search(db, q, "task", args.tasks, None).hits)
+            fts_ms = timed(lambda: search(db, q, "task", args.limit, None), args.repeat)
+            page2_ms = (
+                timed(lambda: search(db, q, "task", args.limit, first.next_cursor), args.repeat)
+                if first.next_cursor else float("nan")
+            )
+            like_ms = timed(lambda: like_scan(db, q, args.limit), args.repeat)
+            print(f"{label:<12} {total:>8} {fts_ms:>9.1f} {page2_ms:>10.1f} {like_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# backend/scripts/bench_serialization.py
+"""
+Microbenchmark of the list endpoints' response path: ORM objects validated
+through the response schemas (the previous path) against column tuples
+encoded straight to JSON (the current fast path).
+
+Both sides run the same query and produce the same bytes; the timing
+covers fetching the page and rendering the body.
+
+    cd backend
+    python -m scripts.bench_serialization --tasks 20000 --limits 50,500
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import selectinload
+
+from app.db import Base, SessionLocal, engine
+from app import models, schemas
+from app.routers.projects import PROJECT_COLUMNS, PROJECT_FIELDS, TASK_COLUMNS, TASK_FIELDS
+from app.serialization import FastJSONResponse, orjson, rows_as_dicts
+from scripts.bench_home import seed
+
+
+def schema_tasks(db, limit):
+    tasks = db.query(models.Task).order_by(models.Task.id).limit(limit).all()
+    page = schemas.TaskPage(tasks=tasks, next_cursor=None)
+    return JSONResponse(page.model_dump(mode="json")).body
+
+
+def fast_tasks(db, limit):
+    rows = db.query(*TASK_COLUMNS).order_by(models.Task.id).limit(limit).all()
+    return FastJSONResponse({"tasks": rows_as_dicts(TASK_FIELDS, rows), "next_cursor": None}).body
+
+
+def schema_projects(db, limit):
+    projects = (
+        db.query(models.Project).options(selectinload(models.Project.tasks))
+        .order_by(models.Project.id).limit(limit).all()
+    )
+    page = schemas.ProjectPage(projects=[schemas.Project.model_validate(p) for p in projects], next_cursor=None)
+    return JSONResponse(page.model_dump(mode="json", exclude_unset=True)).body
+
+
+def fast_projects(db, limit):
+    projects = rows_as_dicts(PROJECT_FIELDS, db.query(*PROJECT_COLUMNS).order_by(models.Project.id).limit(limit))
+    by_id = {project["id"]: project for project in projects}
+    for project in projects:
+        project["tasks"] = []
+    rows = db.query(*TASK_COLUMNS).filter(models.Task.project_id.in_(by_id)).order_by(models.Task.id)
+    for task in rows_as_dicts(TASK_FIELDS, rows):
+        by_id[task["project_id"]]["tasks"].append(task)
+    return FastJSONResponse({"projects": projects, "next_cursor": None}).body
+
+
+def timed(fn, db, limit, repeat):
+    samples = []
+    for _ in range(repeat):
+        db.expunge_all()  # no identity-map reuse between runs
+        start = time.perf_counter()
+        fn(db, limit)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--limits", default="50,500")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed(engine, args.tasks, datetime.utcnow())
+    with engine.begin() as conn:
+        # spread the tasks over 100 projects
+        conn.execute(models.Project.__table__.insert(), [{"name": f"Bench {i}"} for i in range(2, 101)])
+        conn.execute(models.Task.__table__.update().values(project_id=1 + models.Task.id % 100))
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json'}")
+    print(f"{'endpoint':<36} {'schema ms':>10} {'fast ms':>9} {'speedup':>8}")
+    with SessionLocal() as db:
+        for limit in (int(n) for n in args.limits.split(",")):
+            for name, slow, fast in (
+                (f"/tasks limit={limit}", schema_tasks, fast_tasks),
+                (f"/projects?include=tasks limit={limit}", schema_projects, fast_projects),
+            ):
+                assert slow(db, limit) == fast(db, limit), name
+                slow_ms = timed(slow, db, limit, args.repeat)
+                fast_ms = timed(fast, db, limit, args.repeat)
+                print(f"{name:<36} {slow_ms:>10.2f} {fast_ms:>9.2f} {slow_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
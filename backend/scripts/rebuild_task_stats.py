@@ -0,0 +1,39 @@
+# backend/scripts/rebuild_task_stats.py
+"""
+Rebuild the /home widget counters (task_stats, task_due_buckets) from the
+tasks table, or only report drift with --check.
+
+    cd backend
+    python -m scripts.rebuild_task_stats [--check]
+"""
+import argparse
+import sys
+
+from app.db import Base, SessionLocal, engine
+from app.task_stats import check_task_stats, rebuild_task_stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="report mismatches without rebuilding")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        mismatches = check_task_stats(db)
+        for name, (stored, actual) in sorted(mismatches.items()):
+            print(f"{name}: stored={stored} actual={actual}")
+        if args.check:
+            print("consistent" if not mismatches else f"{len(mismatches)} mismatches")
+            return 1 if mismatches else 0
+        rebuild_task_stats(db)
+        db.commit()
+        print("task_stats rebuilt")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+# backend/scripts/seed_db.py
+"""
+Build a large synthetic database: millions of projects and tasks with the
+skewed distributions of benchmarks.data (due dates, status, labels,
+assignees), fast enough for 10M tasks in minutes.
+
+    cd backend
+    python -m scripts.seed_db --db /tmp/big.db --projects 20000 --tasks 10000000 --workers 4
+    python -m scripts.seed_db --url postgresql://... --tasks 10000000 --workers 8
+
+The loader does what a careful bulk import would:
+- Secondary indexes and the search index are dropped first and rebuilt
+  once at the end.
+- Rows are written as plain tuples through executemany, committing every
+  --transaction-rows rows.
+- SQLite runs with the journal and fsyncs off during the load. A crash
+  mid-load leaves a file that is simply regenerated.
+
+With --workers N, N processes generate the rows in parallel. On SQLite
+every worker writes its share to its own shard file, because a database
+has a single writer. The main process then copies the shards into the
+target in id order with INSERT ... SELECT. Other databases take
+concurrent writers, so there the workers insert directly.
+
+The database gets a PATH.spec.json next to it, so
+`python -m benchmarks run --db PATH` can use it as is.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import Base
+from app.search import SEARCHABLE, drop_search_index, ensure_search_index
+from app.task_stats import rebuild_task_stats
+from benchmarks.data import CHUNK_SIZE, TASK_COLUMNS, DatasetSpec, TaskSampler, chunks, project_rows
+
+# rows per worker job; big enough to amortize a shard file, small enough to balance
+SHARD_ROWS = 25 * CHUNK_SIZE
+
+TASKS = models.Task.__table__
+INSERT_TASKS_SQL = (
+    f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * len(TASK_COLUMNS))})"
+)
+FAST_LOAD_PRAGMAS = [
+    "journal_mode = OFF",
+    "synchronous = OFF",
+    "locking_mode = EXCLUSIVE",
+    "temp_store = MEMORY",
+    "cache_size = -1048576",  # 1 GiB, for the index builds
+]
+
+
+def row_processor(dialect):
+    """Convert sampler tuples into the parameters `dialect` expects (SQLite stores datetimes as text)."""
+    processors = [
+        (i, processor) for i, name in enumerate(TASK_COLUMNS)
+        if (processor := TASKS.c[name].type.dialect_impl(dialect).bind_processor(dialect)) is not None
+    ]
+    if not processors:
+        return lambda row: row
+
+    def process(row):
+        row = list(row)
+        for i, processor in processors:
+            row[i] = processor(row[i])
+        return row
+
+    return process
+
+
+class Progress:
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def advance(self, rows: int) -> None:
+        self.done += rows
+        elapsed = time.perf_counter() - self.started
+        print(f"\r  {self.done:>12,} / {self.total:,} tasks  {self.done / elapsed:>10,.0f} rows/s",
+              end="", file=sys.stderr, flush=True)
+        if self.done >= self.total:
+            print(file=sys.stderr)
+
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    print(f"{name}...", file=sys.stderr)
+    yield
+    print(f"  {name} took {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+def shards(total: int):
+    return [(start, min(start + SHARD_ROWS, total)) for start in range(0, total, SHARD_ROWS)]
+
+
+def _generate(spec: DatasetSpec, start: int, stop: int, process):
+    sampler = TaskSampler(spec)
+    for chunk_start, chunk_stop in chunks(stop - start):
+        yield [process(row) for row in sampler.tuples(start + chunk_start, start + chunk_stop)]
+
+
+def _write_sqlite_shard(job) -> tuple:
+    spec_values, start, stop, directory = job
+    spec = DatasetSpec(**spec_values)
+    path = os.path.join(directory, f"shard-{start}.db")
+    process = row_processor(sqlite_dialect.dialect())
+    conn = sqlite3.connect(path, isolation_level=None)
+    for pragma in FAST_LOAD_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    conn.execute(f"CREATE TABLE tasks ({', '.join(TASK_COLUMNS)})")
+    conn.execute("BEGIN")
+    for rows in _generate(spec, start, stop, process):
+        conn.executemany(INSERT_TASKS_SQL, rows)
+    conn.execute("COMMIT")
+    conn.close()
+    return path, stop - start
+
+
+def _insert_shard(job) -> int:
+    spec_values, start, stop, url, transaction_rows = job
+    spec = DatasetSpec(**spec_values)
+    engine = create_engine(url, future=True)
+    process = row_processor(engine.dialect)
+    pending = 0
+    conn = engine.connect()
+    try:
+        for rows in _generate(spec, start, stop, process):
+            conn.execute(TASKS.insert(), [dict(zip(TASK_COLUMNS, row)) for row in rows])
+            pending += len(rows)
+            if pending >= transaction_rows:
+                conn.commit()
+                pending = 0
+        conn.commit()
+    finally:
+        conn.close()
+        engine.dispose()
+    return stop - start
+
+
+def prepare_schema(engine) -> list:
+    """Create the schema without the secondary indexes; returns them for later."""
+    Base.metadata.create_all(bind=engine)
+    deferred = [index for table in (models.Project.__table__, TASKS) for index in table.indexes]
+    with engine.begin() as conn:
+        for table in SEARCHABLE:
+            drop_search_index(conn, table)
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+    return deferred
+
+
+def finish_schema(engine, deferred: list, search_index: bool) -> None:
+    with phase("building indexes"), engine.begin() as conn:
+        for index in deferred:
+            index.create(conn, checkfirst=True)
+    if search_index:
+        with phase("building the search index"), engine.begin() as conn:
+            for table in SEARCHABLE:
+                ensure_search_index(conn, table)
+    with phase("building the /home counters"), Session(engine) as db:
+        rebuild_task_stats(db)
+        db.commit()
+
+
+def seed_sqlite(path: str, spec: DatasetSpec, workers: int, transaction_rows: int, search_index: bool) -> None:
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    deferred = prepare_schema(engine)
+    process = row_processor(engine.dialect)
+
+    raw = sqlite3.connect(path, isolation_level=None)
+    for pragma in FAST_LOAD_PRAGMAS:
+        raw.execute(f"PRAGMA {pragma}")
+    raw.execute("BEGIN")
+    raw.executemany(
+        "INSERT INTO projects (id, name, description, color, archived) VALUES (?, ?, ?, ?, ?)",
+        [(p["id"], p["name"], p["description"], p["color"], p["archived"]) for p in project_rows(spec)],
+    )
+    progress = Progress(spec.tasks)
+    with phase(f"writing {spec.tasks:,} tasks with {workers} worker(s)"):
+        if workers <= 1:
+            pending = 0
+            for rows in _generate(spec, 0, spec.tasks, process):
+                raw.executemany(INSERT_TASKS_SQL, rows)
+                pending += len(rows)
+                if pending >= transaction_rows:
+                    raw.execute("COMMIT")
+                    raw.execute("BEGIN")
+                    pending = 0
+                progress.advance(len(rows))
+            raw.execute("COMMIT")
+        else:
+            raw.execute("COMMIT")
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as tmp, \
+                    multiprocessing.Pool(workers) as pool:
+                jobs = [(spec.as_dict(), start, stop, tmp) for start, stop in shards(spec.tasks)]
+                # imap keeps shard order, so rows are appended in id order
+                for shard_path, written in pool.imap(_write_sqlite_shard, jobs):
+                    raw.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+                    raw.execute(f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                                f"SELECT {', '.join(TASK_COLUMNS)} FROM shard.tasks")
+                    raw.execute("DETACH DATABASE shard")
+                    os.remove(shard_path)
+                    progress.advance(written)
+    raw.close()
+
+    finish_schema(engine, deferred, search_index)
+    engine.dispose()
+
+
+def seed_url(url: str, spec: DatasetSpec, workers: int, transaction_rows: int, search_index: bool) -> None:
+    engine = create_engine(url, future=True)
+    deferred = prepare_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(models.Project.__table__.insert(), project_rows(spec))
+    progress = Progress(spec.tasks)
+    jobs = [(spec.as_dict(), start, stop, url, transaction_rows) for start, stop in shards(spec.tasks)]
+    with phase(f"writing {spec.tasks:,} tasks with {workers} worker(s)"):
+        if workers <= 1:
+            for written in map(_insert_shard, jobs):
+                progress.advance(written)
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                for written in pool.imap_unordered(_insert_shard, jobs):
+                    progress.advance(written)
+    if engine.dialect.name == "postgresql":
+        # ids were given explicitly, so move the sequences past them
+        with engine.begin() as conn:
+            for table in ("projects", "tasks"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+    finish_schema(engine, deferred, search_index)
+    engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", help="SQLite file to create")
+    target.add_argument("--url", help="database URL with an empty schema (e.g. PostgreSQL)")
+    parser.add_argument("--projects", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="generator processes")
+    parser.add_argument("--transaction-rows", type=int, default=1_000_000, help="rows per commit")
+    parser.add_argument("--skip-search-index", action="store_true",
+                        help="leave the full-text index to the app's first start")
+    parser.add_argument("--force", action="store_true", help="replace an existing --db file")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(projects=args.projects, tasks=args.tasks, seed=args.seed)
+    started = time.perf_counter()
+    if args.db:
+        if os.path.exists(args.db):
+            if not args.force:
+                parser.error(f"{args.db} exists; pass --force to replace it")
+            os.remove(args.db)
+        seed_sqlite(args.db, spec, args.workers, args.transaction_rows, not args.skip_search_index)
+        with open(f"{args.db}.spec.json", "w") as f:
+            json.dump(spec.as_dict(), f, indent=2)
+    else:
+        seed_url(args.url, spec, args.workers, args.transaction_rows, not args.skip_search_index)
+    print(f"seeded {spec.projects:,} projects and {spec.tasks:,} tasks in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,7 +31,7 @@ export default function HomePage() {
   const [data, setData] = useState<HomeResponse | null>(null);
 
   useEffect(() => {
-    fetch(`${BACKEND_URL}/home`)
+    fetch(`${BACKEND_URL}/home`, { cache: "no-cache" })
       .then((r) => r.json())
       .then(setData)
       .catch(() => {});
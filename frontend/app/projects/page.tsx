@@ -12,14 +12,32 @@ type Project = {
   archived: boolean;
 };
 
+type ProjectPage = {
+  projects: Project[];
+  next_cursor: string | null;
+};
+
+const PAGE_SIZE = 30;
+
 export default function ProjectsPage() {
   const [projects, setProjects] = useState<Project[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-  useEffect(() => {
-    fetch(`${BACKEND_URL}/projects`)
+  const loadProjects = (after?: string) => {
+    const params = new URLSearchParams();
+    params.set("limit", String(PAGE_SIZE));
+    if (after) params.set("after", after);
+    fetch(`${BACKEND_URL}/projects?` + params.toString(), { cache: "no-cache" })
       .then((r) => r.json())
-      .then(setProjects)
+      .then((page: ProjectPage) => {
+        setProjects((prev) => (after ? [...prev, ...page.projects] : page.projects));
+        setNextCursor(page.next_cursor);
+      })
       .catch(() => {});
+  };
+
+  useEffect(() => {
+    loadProjects();
   }, []);
 
   return (
@@ -42,6 +60,15 @@ export default function ProjectsPage() {
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <button
+          onClick={() => loadProjects(nextCursor)}
+          className="rounded-md px-3 py-1 text-sm border border-gray-200 bg-white text-gray-700 hover:bg-gray-100"
+        >
+          Load more
+        </button>
+      )}
     </div>
   );
 }
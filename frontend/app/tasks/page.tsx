@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 
 const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000";
 
@@ -12,18 +12,38 @@ type Task = {
   project_id: number;
 };
 
+type TaskPage = {
+  tasks: Task[];
+  next_cursor: string | null;
+};
+
+const PAGE_SIZE = 50;
+
 export default function TasksPage() {
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [labelFilter, setLabelFilter] = useState("");
   const [statusFilter, setStatusFilter] = useState("");
+  // the filters of the list on screen: a cursor is only valid with them,
+  // not with whatever the inputs hold since the last Apply
+  const applied = useRef(new URLSearchParams());
 
-  const loadTasks = () => {
-    const params = new URLSearchParams();
-    if (labelFilter.trim() !== "") params.set("label", labelFilter);
-    if (statusFilter.trim() !== "") params.set("status", statusFilter);
-    fetch(`${BACKEND_URL}/tasks?` + params.toString())
+  const loadTasks = (after?: string) => {
+    if (!after) {
+      const filters = new URLSearchParams();
+      if (labelFilter.trim() !== "") filters.set("label", labelFilter);
+      if (statusFilter.trim() !== "") filters.set("status", statusFilter);
+      applied.current = filters;
+    }
+    const params = new URLSearchParams(applied.current);
+    params.set("limit", String(PAGE_SIZE));
+    if (after) params.set("after", after);
+    fetch(`${BACKEND_URL}/tasks?` + params.toString(), { cache: "no-cache" })
       .then((r) => r.json())
-      .then(setTasks)
+      .then((page: TaskPage) => {
+        setTasks((prev) => (after ? [...prev, ...page.tasks] : page.tasks));
+        setNextCursor(page.next_cursor);
+      })
       .catch(() => {});
   };
 
@@ -58,7 +78,7 @@ export default function TasksPage() {
           </select>
         </div>
         <button
-          onClick={loadTasks}
+          onClick={() => loadTasks()}
           className="rounded-md px-3 py-1 text-sm bg-[#1aafd0] text-white hover:bg-[#6a67ce]"
         >
           Apply
@@ -90,6 +110,15 @@ export default function TasksPage() {
           ))}
         </tbody>
       </table>
+
+      {nextCursor && (
+        <button
+          onClick={() => loadTasks(nextCursor)}
+          className="rounded-md px-3 py-1 text-sm border border-gray-200 bg-white text-gray-700 hover:bg-gray-100"
+        >
+          Load more
+        </button>
+      )}
     </div>
   );
 }